@@ -101,6 +101,29 @@ if not exist "%ASSETSDIR%" (
   goto :END_FAIL
 )
 
+rem Vragencorpus compileren (snelle tellingen + laden per bank)
+echo [INFO] Vragencorpus compileren...
+%PYCMD% itil_corpus.py build >>"%LOG%" 2>&1
+if errorlevel 1 (
+  echo [WAARSCHUWING] Corpus compileren mislukt; de app valt terug op de JSON-banken.
+  echo [WAARSCHUWING] Corpus compileren mislukt.>>"%LOG%"
+)
+
+rem Afbeeldingen voorschalen (banner, iconen, vraagafbeeldingen)
+echo [INFO] Afbeeldingen voorschalen...
+%PYCMD% itil_images.py >>"%LOG%" 2>&1
+if errorlevel 1 (
+  echo [WAARSCHUWING] Voorschalen mislukt; de app schaalt dan bij het eerste gebruik.
+  echo [WAARSCHUWING] Voorschalen mislukt.>>"%LOG%"
+)
+
+rem Pagina-index lesmateriaal (optioneel, alleen als pypdf aanwezig is)
+%PYCMD% -c "import pypdf" >nul 2>&1
+if not errorlevel 1 (
+  echo [INFO] Pagina-index lesmateriaal bouwen...
+  %PYCMD% itil_pdfindex.py >>"%LOG%" 2>&1
+)
+
 rem Score-map garanderen
 if not exist "%ASSETSDIR%\score" mkdir "%ASSETSDIR%\score" 2>nul
 
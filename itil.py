@@ -1,18 +1,39 @@
 
 
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
+from tkinter import messagebox, simpledialog, filedialog
+from PIL import ImageTk
 import json
+import logging
 import os
 import sys
-import random
+import subprocess
 import traceback
 import webbrowser
 import re
+import math
+import shutil
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from itil_core import (resource_dir, project_dir, cache_dir, atomic_write_text, file_sha1,
+                       grade_answer, normalized_options, load_bank_chapter, shuffle_session,
+                       option_order, restore_session, session_percentage, score_entry, ScoreStore, QuestionTelemetry, list_profiles,
+                       PASS_THRESHOLD, TIMER_START_SECS, WRAP_W, ICON_SIZE)
+import itil_corpus
+import itil_pdfindex
+import itil_diag
+import itil_adaptive
+import itil_images
+import itil_journal
+import itil_export
+import itil_render
+from itil_render import named_font
+from itil_items import ItemStats
+
 # ------------------------------------------------------------
 # DPI awareness (Windows) + consistente Tk-scaling
 # ------------------------------------------------------------
@@ -22,22 +43,35 @@ try:
 except Exception:
     pass
 
+# Meldingen gaan naar de app-log van itil_diag.setup_log (naast de exe)
+log = logging.getLogger("itil.app")
+
 # ---------- UI constants ----------
-WRAP_W = 1000
+# WRAP_W en ICON_SIZE staan in itil_core: itil_images schaalt vooraf naar dezelfde maten
 CONTENT_MAX_W = 1100
 OPTIONS_LEFT_PAD = 70
 
-F_BANNER     = ("Helvetica", 44, "bold")
-F_MENU       = ("Helvetica", 28, "bold")
-F_MENU_ITEM  = ("Helvetica", 20)
-F_HEADER     = ("Helvetica", 26, "bold")
-F_COUNTER    = ("Helvetica", 20)
-F_QUESTION   = ("Helvetica", 20)
-F_OPTION     = ("Helvetica", 20)
-F_BUTTON     = ("Helvetica", 18)
-
-# ---- Slaaggrens voor de score (%)
-PASS_THRESHOLD = 65.0
+# Named fonts (zie itil_render): widgets delen één tkfont.Font per naam
+F_BANNER     = named_font("ItilBanner", "Helvetica", 44, "bold")
+F_MENU       = named_font("ItilMenu", "Helvetica", 28, "bold")
+F_MENU_ITEM  = named_font("ItilMenuItem", "Helvetica", 20)
+F_HEADER     = named_font("ItilHeader", "Helvetica", 26, "bold")
+F_COUNTER    = named_font("ItilCounter", "Helvetica", 20)
+F_QUESTION   = named_font("ItilQuestion", "Helvetica", 20)
+F_OPTION     = named_font("ItilOption", "Helvetica", 20)
+F_BUTTON     = named_font("ItilButton", "Helvetica", 18)
+F_EMOJI      = named_font("ItilEmoji", "Helvetica", 18)
+F_ICON_BTN   = named_font("ItilIconButton", "Helvetica", 28, "bold")
+F_ICON_BTN_S = named_font("ItilIconButtonSmall", "Helvetica", 26, "bold")
+F_STAT_TITLE = named_font("ItilStatTitle", "Helvetica", 24)
+F_STAT       = named_font("ItilStat", "Helvetica", 20)
+F_STAT_NOTE  = named_font("ItilStatNote", "Helvetica", 16)
+F_STAT_SCORE = named_font("ItilStatScore", "Helvetica", 22, "bold")
+F_REVIEW_OPT = named_font("ItilReviewOption", "Helvetica", 18)
+F_REVIEW_SEL = named_font("ItilReviewSelected", "Helvetica", 18, "bold")
+F_EXPLAIN    = named_font("ItilExplanation", "Helvetica", 16)
+F_NOTE       = named_font("ItilNote", "Helvetica", 14)
+F_LINK       = named_font("ItilLink", "Helvetica", 14, "underline")
 
 # ---- Dropdown look-and-feel ----
 MENU_BG   = "#f0f0f0"
@@ -46,10 +80,9 @@ HOVER_BG  = "#3875d6"
 HOVER_FG  = "white"
 TEXT_FG   = "black"
 
-# ---- Timer settings ----
-TIMER_START_SECS = 60 * 60
+# ---- Timer settings (TIMER_START_SECS en PASS_THRESHOLD staan in itil_core) ----
 TIMER_WARN_SECS  = 5 * 60
-TIMER_FONT       = ("Helvetica", 35, "bold")
+TIMER_FONT       = named_font("ItilTimer", "Helvetica", 35, "bold")
 TIMER_COLOR_OK   = "black"
 TIMER_COLOR_WARN = "#ff8c00"
 TIMER_COLOR_END  = "#d11d1d"
@@ -60,9 +93,23 @@ TIMER_OFFSET_Y = 30
 
 # Scrollbar zichtbaar?
 SHOW_SCROLLBAR = False
+SCROLL_FRAME_MS = 16   # wielbewegingen binnen één frame worden samen één yview-update
+
+# Vraag/opties/uitleg als Canvas-items tekenen i.p.v. widgets (zie itil_render.CanvasPage)
+CANVAS_RENDER = itil_diag.flag_enabled("--canvas-render", "ITIL_CANVAS_RENDER")
+
+# ---- Live reload vraagbanken (polling-interval in ms) ----
+BANK_POLL_MS = 2000
+
+# ---- Externe programma's (PDF-viewer, browser) ----
+LAUNCH_WORKERS   = 2
+LAUNCH_TIMEOUT_S = 15
+LAUNCH_POLL_MS   = 100
+
+# ---- Speculatief voorladen van banken bij hover in de dropdown ----
+PRELOAD_CACHE_SIZE = 4
 
 # ---- Icons lesmateriaal dropdown ----
-ICON_SIZE = 22
 ROW_PAD_X = 6
 ICON_PAD_LEFT = 2
 ICON_TEXT_GAP = 2
@@ -71,32 +118,26 @@ _ICON_TEXT_GAP = max(0, ICON_TEXT_GAP)
 _MAX_NUDGE = max([0] + list(ICON_NUDGE.values()))
 ICON_COL_W = ICON_SIZE + _MAX_NUDGE + _ICON_TEXT_GAP
 
-# ------------------------------------------------------------
-# Pad helpers
-# ------------------------------------------------------------
-def resource_dir() -> str:
-    """Map met de (read-only) resources. Bij PyInstaller is dit _MEIPASS."""
-    if getattr(sys, "frozen", False):
-        return getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
-    return os.path.dirname(os.path.abspath(__file__))
-
-def project_dir() -> Path:
-    """Schrijfbare projectmap naast de .py of .exe (hier bewaren we scores)."""
-    if getattr(sys, "frozen", False):
-        return Path(os.path.dirname(sys.executable))
-    return Path(os.path.dirname(os.path.abspath(__file__)))
-
-def score_file_path() -> Path:
-    """Scores ALLEEN hier opslaan: <project>/assets/score/scores.json."""
-    base = project_dir() / "assets" / "score"
-    base.mkdir(parents=True, exist_ok=True)
-    return base / "scores.json"
-
-def atomic_write_text(path: Path, text: str, encoding: str = "utf-8"):
-    """Schrijf veilig naar bestand (voorkomt 0 kB bij crash)."""
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(text, encoding=encoding)
-    os.replace(tmp, path)
+# ---- Lesmateriaal ----
+# Titel, pad/URL, (optioneel) icoonbestand in assets/afbeeldingen, emoji fallback.
+# Trainers kunnen dit aanvullen met assets/lesmateriaal/lesmateriaal.json:
+#   {"materials": [{"label": "...", "path": "bestand.pdf of https://...", "icon": "book.png", "emoji": "📄"}]}
+# Een item met hetzelfde label vervangt het standaarditem.
+MATERIALS_DEFS = [
+    ("ITIL 4 foundation boek (NE)",      "itil_4_boek.pdf",                   "book.png",    "📘"),
+    ("Presentatie Deel 1",               "ITIL4_presentatie_deel1.pdf",       "slides.png",  "🖥️"),
+    ("Presentatie Deel 2",               "ITIL4_presentatie_deel2.pdf",       "slides.png",  "🖥️"),
+    ("Examen objectives",                "itil4_exam_objectives.pdf",         "target.png",  "🎯"),
+    ("Examen objectives samenvatting",   "itil4_samenvatting_objectives.pdf", "summary.png", "📝"),
+
+    # --- NIEUW: TIA YouTube links ---
+    ("TIA: ITIL 4 Foundation Full Cram Course",
+        "https://www.youtube.com/watch?v=uI0n0kmoYy0&t=3367s", "video.png", "▶️"),
+    ("TIA: ITIL 4 Mock Exam Review",
+        "https://www.youtube.com/watch?v=SuSC7qHbaqE", "video.png", "▶️"),
+]
+MATERIALS_CONFIG = "lesmateriaal.json"
+MATERIALS_CACHE  = "materials_catalog.json"
 
 def load_questions_from_json(filename: str):
     base = resource_dir()
@@ -113,19 +154,85 @@ def load_questions_from_json(filename: str):
                 return {}
     return {}
 
+def _launch_external(target: str) -> bool:
+    """
+    Opent een URL of bestand met het standaardprogramma. Draait in de launch-pool,
+    nooit op de Tk-thread. Er wordt nergens op het programma gewacht: open/xdg-open
+    worden losgestart met Popen, en ShellExecute (os.startfile) keert terug zodra het
+    programma gestart is. Zo blijft een pool-worker niet hangen op een viewer die
+    niet reageert en blijven latere klikken niet achter hem in de wachtrij staan.
+    URL's met een fragment (file:///boek.pdf#page=12) gaan naar de browser:
+    xdg-open maakt van een file-URL weer een pad en laat #page vallen.
+    """
+    is_url = target.startswith(("http://", "https://", "file:"))
+    if is_url and "#" in target:
+        return webbrowser.open(target)
+    if sys.platform.startswith("win"):
+        os.startfile(target)  # Windows: ook voor URL's
+        return True
+    opener = "open" if sys.platform == "darwin" else shutil.which("xdg-open")
+    if opener:
+        subprocess.Popen([opener, target], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        return True
+    return webbrowser.open(target if is_url else Path(target).resolve().as_uri())  # zonder xdg-open
+
 def _count_questions_in_loaded_data(data: dict) -> int:
     try:
         return len(data["chapters"][0]["questions"])
     except Exception:
         return 0
 
+# ------------------------------------------------------------
+# Muiswiel: één dispatcher per venster
+# ------------------------------------------------------------
+class WheelScroller:
+    """
+    Gebonden op de Toplevel zelf: elke widget in het venster heeft die als bindtag,
+    dus één wielevent komt precies één keer binnen, waar de muis ook staat. Een
+    burst events wordt opgeteld en per frame als één yview_scroll uitgevoerd.
+    De bindingen verdwijnen met het venster; er hoeft niets ontbonden te worden.
+    """
+
+    def __init__(self, toplevel: tk.Misc, canvas: tk.Canvas):
+        self.canvas = canvas
+        self._units = 0.0
+        self._job = None
+        toplevel.bind("<MouseWheel>", self._on_wheel)
+        toplevel.bind("<Button-4>", self._on_wheel)   # Linux/X11: wiel omhoog
+        toplevel.bind("<Button-5>", self._on_wheel)   # Linux/X11: wiel omlaag
+
+    def _on_wheel(self, event: tk.Event):
+        if event.num == 4:
+            self._units -= 1
+        elif event.num == 5:
+            self._units += 1
+        elif sys.platform == "darwin":
+            self._units -= event.delta
+        else:
+            self._units -= event.delta / 120
+        if self._job is None:
+            # Via de root plannen: die overleeft het venster, dus geen "invalid command name"
+            self._job = self.canvas._root().after(SCROLL_FRAME_MS, self._flush)
+
+    def _flush(self):
+        self._job = None
+        steps = int(self._units)
+        self._units -= steps  # restje van touchpads met kleine delta's bewaren
+        if not steps:
+            return
+        try:
+            self.canvas.yview_scroll(steps, "units")
+        except tk.TclError:
+            pass
+
 # ------------------------------------------------------------
 # Custom button: ÉÉN afgeronde buitenrand + icoon (geen inner border)
 # ------------------------------------------------------------
 class OuterBorderIconButton(tk.Canvas):
     def __init__(self, master, icon_text: str, command,
                  w=56, h=48, radius=12, border=3, pad=3,
-                 font=("Helvetica", 28, "bold"),
+                 font=F_ICON_BTN,
                  fg="black", outline="black", bg=MENU_BG, **kwargs):
         super().__init__(master, width=w, height=h, bg=bg, highlightthickness=0, **kwargs)
         self.w, self.h, self.r, self.border, self.pad = w, h, radius, border, pad
@@ -177,6 +284,15 @@ class QuizApp:
             self.master.tk.call("tk", "scaling", 1.0)
         except Exception:
             pass
+        # Named fonts vóór het eerste widget; ITIL_FONT_SCALE (bijv. 1.5 op 4K) schaalt ze allemaal
+        try:
+            font_scale = float(os.environ.get("ITIL_FONT_SCALE") or 1.0)
+        except ValueError:
+            font_scale = 1.0
+        itil_render.install_fonts(self.master, font_scale)
+        self.canvas_render = CANVAS_RENDER
+        self.question_page = None   # itil_render.CanvasPage van het vraagvenster (canvas-modus)
+        self.review_page = None
 
         # State
         self.current_chapter_data = None
@@ -186,6 +302,7 @@ class QuizApp:
         self.correct_answers = []
         self.user_answers = []
         self.session_active = False
+        self._session_recorded = False   # uitslag van deze sessie al opgeslagen (zie show_stats)
         self.assessment_mode = False
         self.current_session_title = ""
         self.info_images = {}
@@ -193,22 +310,63 @@ class QuizApp:
 
         # Timer state
         self.timer_total_secs = TIMER_START_SECS
-        self.timer_remaining = TIMER_START_SECS
+        self.timer_remaining = TIMER_START_SECS   # alleen leidend als de timer gepauzeerd is
+        self.timer_deadline  = None               # time.monotonic() waarop de tijd op is
         self.timer_running   = True
         self.timer_job       = None
+        self._timer_shown    = None               # laatst getekende label-tekst
+        self.question_time_used = []              # examentijd (s) per vraag-index
+        self._q_clock_idx    = None
+        self._q_clock_mark   = 0.0
+        self.telemetry       = QuestionTelemetry(0)
+        self.question_src    = []                 # positie in de bank per sessievraag
+        self._expl_source    = None               # ("corpus", eerste index) of ("json", pad)
+        self._session_expl   = None               # uitleg per sessievraag, pas bij review geladen
+        self.adaptive        = None               # itil_adaptive.AdaptiveTest tijdens een readiness-check
+        self.adaptive_lang   = None
         self.timer_label     = None
         self.timer_btn       = None
         self.timer_reset_btn = None
         self.timer_right_frame = None
 
-        # Scores
-        self.scores = self._load_scores()
+        # Scores (per profiel, zie itil_core.ScoreStore)
+        self.score_store = ScoreStore()
+        self.scores = self.score_store.data
+        self._show_profile_in_title()
+        # Journaal van de lopende sessie (zie itil_journal); alleen voor toetsen uit een bank
+        self.journal = itil_journal.SessionJournal(itil_journal.journal_path(self.score_store.profile))
+        self._journal_live = False
+        self.item_stats = None      # itil_items.ItemStats, pas geladen bij de eerste afgeronde sessie
         self.toets_menu_by_group = {}
         self.active_dropdown = None
         self._release_ignore_until = 0.0
+        self._dropdown_cache = {}   # {tab-widget: (itemmodel-key, Toplevel)}
+        self._tab_items = {}        # {tab-widget: actuele items}
 
-        # Icon cache
+        # Icon cache + lesmateriaal-catalogus: (signatuur, items)
         self._icon_cache = {}
+        self._materials_cat = None
+
+        # Pagina-index van het lesmateriaal (wordt op de achtergrond geladen/gebouwd)
+        self.pdf_index = None
+        self._pdf_index_loading = False
+
+        # Externe programma's openen via een kleine worker-pool: {doel: (future, starttijd)}
+        self._launch_pool = ThreadPoolExecutor(max_workers=LAUNCH_WORKERS, thread_name_prefix="launch")
+        self._launches = {}
+
+        # Voorladen bij hover: {pad: ((mtime_ns, size), future)}, alleen vanaf de Tk-thread aangeraakt
+        self._preload_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preload")
+        self._preloads = OrderedDict()
+        self._export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        self._refs_job = None
+
+        # Vraagbanken: {pad: ((mtime_ns, size), aantal)} + momentopname voor live reload
+        self._bank_counts = {}
+        # Optioneel gecompileerd corpus (mmap); alleen gebruikt voor banken die niet gewijzigd zijn
+        self.corpus = itil_corpus.open_default()
+        self._bank_snapshot = self._snapshot_banks()
+        self._bank_poll_job = None
 
         # UI
         self.center_window_main(self.master, 1500, 900)
@@ -222,6 +380,7 @@ class QuizApp:
                                               relief="raised", borderwidth=1, cursor="hand2")
         self.materials_button.pack(side="left", padx=10)
         self.materials_button.bind("<Button-1>", self._on_materials_click)
+        self.master.after_idle(self._prebuild_materials)
 
         # Hoofdstukken dropdown met scores
         self.hoofdstukken_menu = tk.Menubutton(self.navbar_frame, text="Hoofdstukken", font=F_MENU,
@@ -242,67 +401,204 @@ class QuizApp:
         self.mock_menu.pack(side="left", padx=10)
         self.build_mock_tab(ne_count=6, en_count=6)
 
+        # Resultaten van alle profielen exporteren (zie itil_export)
+        self.export_menu = tk.Menubutton(self.navbar_frame, text="Resultaten", font=F_MENU,
+                                         relief="raised", borderwidth=1, cursor="hand2")
+        self.export_menu.pack(side="left", padx=10)
+        export_items = tk.Menu(self.export_menu, tearoff=0, font=F_MENU)
+        export_items.add_command(label="Exporteren per sessie…", command=lambda: self._export_results(False))
+        export_items.add_command(label="Exporteren per vraag…", command=lambda: self._export_results(True))
+        self.export_menu["menu"] = export_items
+
         self.add_image()
 
         self.master.bind("<ButtonRelease-1>", self._close_dropdown_global, add="+")
         self.master.bind("<Control-b>", lambda e: self.open_book_pdf())
+        self.master.bind("<Control-p>", lambda e: self._switch_profile())
+        self.master.bind("<Control-e>", lambda e: self._export_results(False))
+        self._schedule_bank_poll()
+        self.master.after_idle(self._offer_resume)
 
     # ---------------- Scores opslag ----------------
-    def _load_scores(self) -> dict:
-        p = score_file_path()
-        try:
-            if p.exists() and p.stat().st_size > 0:
-                return json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-        return {}
-
-    def _save_scores(self):
-        try:
-            atomic_write_text(score_file_path(), json.dumps(self.scores, ensure_ascii=False, indent=2))
-        except Exception:
-            pass
-
     def _store_last_score(self, pct: float):
         if not self.current_json_path:
             return
         key = os.path.basename(self.current_json_path)
-        self.scores[key] = {"pct": round(pct, 2)}
-        self._save_scores()
+        q_keys = [str(q.get("number", i + 1)) for i, q in enumerate(self.questions)]
+        item_scores = [None if self.user_answers[i] is None else
+                       grade_answer(q.get("answer"), self.shuffled_options[i], self.user_answers[i])
+                       for i, q in enumerate(self.questions)]
+        self.score_store.put(key, score_entry(pct, self.question_time_used, q_keys, self.telemetry, item_scores))
 
         # Ververs de juiste dropdown op basis van bestandsnaam
-        m_toets = re.match(r"^toets(\d+)_", key, re.IGNORECASE)
-        if m_toets:
-            g = int(m_toets.group(1))
-            self.build_bilingual_toetsen_tab(f"Toetsen {g}", groep=g, count=6)
+        self._refresh_tabs_for({key})
+
+    def _store_adaptive_result(self):
+        """Geschatte score van een readiness-check opslaan; ook als badge in het Mock-menu."""
+        pct = self.adaptive.expected_pct()
+        self.score_store.put(f"adaptief_{self.adaptive_lang}", {
+            "pct": round(pct, 2),
+            "time_used": round(sum(self.question_time_used), 1),
+            "items": len(self.questions),
+            "prob_pass": round(self.adaptive.prob_pass(), 3),
+            "theta": round(self.adaptive.theta(), 3),
+        })
+        self.build_mock_tab(ne_count=6, en_count=6)
 
-        # NIEUW: ververs Mock-tab als het een mock-bestand is
-        if re.match(r"^mock\d+_(ne|en)\.json$", key, re.IGNORECASE):
-            self.build_mock_tab(ne_count=6, en_count=6)
+    def _record_item_stats(self):
+        """Voedt de itemanalyse met deze sessie (per vraag opnieuw beoordeeld, ook bij terugbladeren)."""
+        if not self.current_json_path or not self.questions:
+            return
+        if self.item_stats is None:
+            self.item_stats = ItemStats.load()
+        item_scores = [grade_answer(q.get("answer"), self.shuffled_options[i], self.user_answers[i])
+                       for i, q in enumerate(self.questions)]
+        self.item_stats.record_session(os.path.basename(self.current_json_path), self.questions,
+                                       self.question_src, self.shuffled_options,
+                                       self.user_answers, item_scores)
+        self.item_stats.save()
+
+    # ---------------- Profielen ----------------
+    def _show_profile_in_title(self):
+        self.master.title(f"Itil 4 Foundation – {self.score_store.profile}")
+
+    def _switch_profile(self):
+        """Ctrl-P: ander (of nieuw) profiel kiezen; de badges tonen daarna diens scores."""
+        if getattr(self, "session_active", False):
+            messagebox.showinfo("Profiel", "Rond eerst de lopende toets af.", parent=self.master)
+            return
+        known = ", ".join(list_profiles()) or "-"
+        name = simpledialog.askstring("Profiel", f"Naam van het profiel:\n(bestaand: {known})",
+                                      initialvalue=self.score_store.profile, parent=self.master)
+        if not name or not name.strip() or name.strip() == self.score_store.profile:
+            return
+        self.score_store = ScoreStore(name.strip())
+        self.scores = self.score_store.data
+        self.journal = itil_journal.SessionJournal(itil_journal.journal_path(self.score_store.profile))
+        self._show_profile_in_title()
+        self._refresh_all_tabs()
+
+    # ---------------- Resultaten exporteren ----------------
+    def _export_results(self, per_question: bool):
+        """Alle opgeslagen pogingen van alle profielen naar CSV/JSONL/Parquet, op de achtergrond."""
+        types = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        if itil_export.parquet_available():
+            types.append(("Parquet", "*.parquet"))
+        path = filedialog.asksaveasfilename(
+            parent=self.master, title="Resultaten exporteren", defaultextension=".csv", filetypes=types,
+            initialfile="resultaten_per_vraag.csv" if per_question else "resultaten.csv")
+        if not path:
+            return
+        fut = self._export_pool.submit(itil_export.export, path, None, per_question)
+        self.master.after(100, self._poll_export, fut, path)
+
+    def _poll_export(self, fut, path: str):
+        if not fut.done():
+            self.master.after(100, self._poll_export, fut, path)
+            return
+        try:
+            n = fut.result()
+        except Exception as e:
+            self.show_error_message(f"Export mislukt: {e}")
+            return
+        messagebox.showinfo("Resultaten", f"{n} rij(en) geschreven naar\n{path}", parent=self.master)
 
-        # Altijd hoofdstukken verversen (veilig)
+    def _refresh_all_tabs(self):
+        for g in sorted(self.toets_menu_by_group):
+            self.build_bilingual_toetsen_tab(f"Toetsen {g}", groep=g, count=6)
+        self.build_mock_tab(ne_count=6, en_count=6)
         self.build_hoofdstukken_tab()
 
+    # ---------------- Live reload vraagbanken ----------------
+    def _banks_dir(self) -> str:
+        return os.path.join(resource_dir(), "assets", "itil_vragen")
+
+    def _snapshot_banks(self) -> dict:
+        """Goedkope momentopname {bestandsnaam: (mtime_ns, size)}; alleen stat, niets parsen."""
+        snap = {}
+        try:
+            with os.scandir(self._banks_dir()) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(".json") and entry.is_file():
+                        st = entry.stat()
+                        snap[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return snap
+
+    def _schedule_bank_poll(self):
+        try:
+            self._bank_poll_job = self.master.after(BANK_POLL_MS, self._poll_banks)
+        except tk.TclError:
+            self._bank_poll_job = None
+
+    def _poll_banks(self):
+        """
+        Vergelijkt de map met de vorige momentopname. Alleen toegevoegde, gewijzigde
+        of verwijderde banken worden opnieuw geteld; een lopende sessie blijft ongemoeid
+        (die werkt met haar eigen, al geladen vragenlijst).
+        """
+        snap = self._snapshot_banks()
+        old = self._bank_snapshot
+        changed = {name for name in (snap.keys() | old.keys()) if snap.get(name) != old.get(name)}
+        self._bank_snapshot = snap
+        if changed:
+            dirp = self._banks_dir()
+            for name in changed:
+                self._bank_counts.pop(os.path.join(dirp, name), None)
+            self._refresh_tabs_for(changed)
+        # Scores die een andere instantie met hetzelfde profiel schreef (één stat)
+        changed_scores = self.score_store.refresh()
+        if changed_scores:
+            self._refresh_tabs_for(changed_scores)
+        self._schedule_bank_poll()
+
+    def _refresh_tabs_for(self, filenames):
+        """Bouwt alleen de dropdowns opnieuw op waar deze bestanden in thuishoren."""
+        groups, mock, hoofdstuk = set(), False, False
+        for name in filenames:
+            m_toets = re.match(r"^toets(\d+)_", name, re.IGNORECASE)
+            if m_toets:
+                groups.add(int(m_toets.group(1)))
+            elif re.match(r"^mock\s*\d+", name, re.IGNORECASE):
+                mock = True
+            elif re.match(r"^hoofdstuk\d+\.json$", name, re.IGNORECASE):
+                hoofdstuk = True
+
+        for g in sorted(groups):
+            if g in self.toets_menu_by_group:
+                self.build_bilingual_toetsen_tab(f"Toetsen {g}", groep=g, count=6)
+        if mock:
+            self.build_mock_tab(ne_count=6, en_count=6)
+        if hoofdstuk:
+            self.build_hoofdstukken_tab()
+
     # ---------------- Count helpers ----------------
     def count_questions_in_file(self, filename: str) -> int:
-        base = resource_dir()
-        path = os.path.join(base, "assets", "itil_vragen", filename)
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return _count_questions_in_loaded_data(data)
-            except Exception:
-                return 0
-        return 0
+        return self.count_questions_in_path(os.path.join(self._banks_dir(), filename))
 
     def count_questions_in_path(self, path: str) -> int:
+        """Aantal vragen, gecachet op (mtime, size) zodat alleen gewijzigde banken opnieuw geparsed worden."""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return _count_questions_in_loaded_data(data)
-        except Exception:
+            st = os.stat(path)
+        except OSError:
             return 0
+        sig = (st.st_mtime_ns, st.st_size)
+        hit = self._bank_counts.get(path)
+        if hit and hit[0] == sig:
+            return hit[1]
+        entry = self.corpus.fresh_bank(path) if self.corpus else None
+        if entry is not None:
+            cnt = entry["count"]  # uit de bank-tabel van het corpus, zonder te parsen
+        else:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                cnt = _count_questions_in_loaded_data(data)
+            except Exception:
+                cnt = 0
+        self._bank_counts[path] = (sig, cnt)
+        return cnt
 
     # ---------------- Reuse: bestand zoeken op patroon ----------------
     def _find_variant_file(self, dirp: str, groep: int, idx: int, lang: str):
@@ -387,8 +683,7 @@ class QuizApp:
                 items.append({"type": "sep"})
             items.extend(en_items)
 
-        mb.unbind("<Button-1>")
-        mb.bind("<Button-1>", lambda e, it=items, btn=mb: self._on_tab_click(e, it, btn))
+        self._bind_tab_items(mb, items)
 
     # ---------------- NIEUW: Mock dropdown ----------------
     def build_mock_tab(self, ne_count: int = 6, en_count: int = 6):
@@ -443,9 +738,15 @@ class QuizApp:
                     left = f"mock {i} (EN) ({cnt})"
                     items.append({"type": "item", "left": left, "pct": pct, "file": f_en, "title": f"ITIL 4 {left}"})
 
+            # Adaptieve readiness-check per taal (stopt zodra het verdict zeker genoeg is)
+            items.append({"type": "sep"})
+            for lang in ("ne", "en"):
+                left = f"readiness-check ({lang.upper()}, adaptief)"
+                items.append({"type": "item", "left": left, "pct": score_percent(f"adaptief_{lang}"),
+                              "file": None, "title": f"ITIL 4 {left}", "adaptive": lang})
+
         # Bind dropdown
-        self.mock_menu.unbind("<Button-1>")
-        self.mock_menu.bind("<Button-1>", lambda e, it=items, btn=self.mock_menu: self._on_tab_click(e, it, btn))
+        self._bind_tab_items(self.mock_menu, items)
 
     # ---------------- Hoofdstukken custom dropdown met score ----------------
     def build_hoofdstukken_tab(self):
@@ -478,28 +779,77 @@ class QuizApp:
                     "title": f"ITIL 4 hoofdstuk {h}"
                 })
 
-        self.hoofdstukken_menu.unbind("<Button-1>")
-        self.hoofdstukken_menu.bind(
-            "<Button-1>",
-            lambda e, it=items, btn=self.hoofdstukken_menu: self._on_tab_click(e, it, btn)
-        )
+        self._bind_tab_items(self.hoofdstukken_menu, items)
 
     def _on_tab_click(self, event, items, btn):
         self._open_dropdown(btn, items)
         self._release_ignore_until = time.time() + 0.35
         return "break"
 
-    def _open_dropdown(self, widget: tk.Widget, items: list):
-        self._close_active_dropdown()
-        x = widget.winfo_rootx()
-        y = widget.winfo_rooty() + widget.winfo_height()
+    # ---------------- Dropdown cache ----------------
+    # Per tab blijft één voorgebouwde dropdown bestaan die alleen getoond en
+    # verborgen wordt. Pas als het itemmodel verandert (nieuwe score, bank erbij)
+    # wordt hij weggegooid en opnieuw opgebouwd.
+    def _dropdown_key(self, items: list) -> tuple:
+        return tuple(tuple((k, v) for k, v in sorted(it.items()) if k != "img") for it in items)
+
+    def _bind_tab_items(self, btn: tk.Widget, items: list):
+        btn.unbind("<Button-1>")
+        btn.bind("<Button-1>", lambda e, it=items, b=btn: self._on_tab_click(e, it, b))
+        self._tab_items[btn] = items
+        cached = self._dropdown_cache.get(btn)
+        if cached and cached[0] != self._dropdown_key(items):
+            self._drop_cached_dropdown(btn)
+        if btn not in self._dropdown_cache:
+            self.master.after_idle(self._prebuild_dropdown, btn)
+
+    def _prebuild_dropdown(self, btn: tk.Widget):
+        items = self._tab_items.get(btn)
+        if items is not None:
+            self._get_dropdown(btn, self._dropdown_key(items), lambda top: self._fill_dropdown(top, items))
+
+    def _drop_cached_dropdown(self, btn: tk.Widget):
+        cached = self._dropdown_cache.pop(btn, None)
+        if not cached:
+            return
+        if cached[1] is self.active_dropdown:
+            self.active_dropdown = None
+        try:
+            cached[1].destroy()
+        except tk.TclError:
+            pass
+
+    def _get_dropdown(self, widget: tk.Widget, key: tuple, fill) -> tk.Toplevel:
+        cached = self._dropdown_cache.get(widget)
+        if cached and cached[0] == key and cached[1].winfo_exists():
+            return cached[1]
+        self._drop_cached_dropdown(widget)
 
         top = tk.Toplevel(self.master)
+        top.withdraw()
         top.overrideredirect(True)
-        top.geometry(f"+{x}+{y}")
         top.configure(bg=MENU_BG)
+        top._unhover = None   # herstelt de rij onder de muis bij verbergen
+        fill(top)
+        top.bind("<FocusOut>", lambda e: self._close_active_dropdown())
+        self._dropdown_cache[widget] = (key, top)
+        return top
+
+    def _show_dropdown(self, widget: tk.Widget, top: tk.Toplevel):
+        x = widget.winfo_rootx()
+        y = widget.winfo_rooty() + widget.winfo_height()
+        top.geometry(f"+{x}+{y}")
+        top.deiconify()
+        top.lift()
         self.active_dropdown = top
+        top.focus_set()
 
+    def _open_dropdown(self, widget: tk.Widget, items: list):
+        self._close_active_dropdown()
+        top = self._get_dropdown(widget, self._dropdown_key(items), lambda t: self._fill_dropdown(t, items))
+        self._show_dropdown(widget, top)
+
+    def _fill_dropdown(self, top: tk.Toplevel, items: list):
         frame = tk.Frame(top, bg=MENU_BG, bd=1, relief="solid")
         frame.pack(fill="both", expand=True)
 
@@ -516,7 +866,7 @@ class QuizApp:
                     except Exception:
                         pass
 
-        def add_item_row(parent, left_text, pct, file_path, title):
+        def add_item_row(parent, left_text, pct, file_path, title, adaptive=None):
             row = tk.Frame(parent, bg=MENU_BG)
             row.pack(fill="x", padx=8, pady=3)
 
@@ -532,11 +882,20 @@ class QuizApp:
                 dot.create_oval(2, 2, 14, 14, fill=color, outline=color)
                 dot.pack(side="right", padx=(6, 0))
 
-            def on_enter(e): color_row(row, HOVER_BG, HOVER_FG)
-            def on_leave(e): color_row(row, MENU_BG, TEXT_FG)
+            def on_leave(e=None):
+                color_row(row, MENU_BG, TEXT_FG)
+                top._unhover = None
+            def on_enter(e):
+                color_row(row, HOVER_BG, HOVER_FG)
+                top._unhover = on_leave
+                if file_path:
+                    self._preload_bank(file_path)
             def on_click(e):
                 self._close_active_dropdown()
-                self._start_toets_file(file_path, title)
+                if adaptive:
+                    self.start_adaptive(adaptive, title)
+                else:
+                    self._start_toets_file(file_path, title)
 
             row.bind("<Enter>", on_enter)
             row.bind("<Leave>", on_leave)
@@ -550,17 +909,17 @@ class QuizApp:
             if t == "sep":
                 tk.Frame(frame, height=1, bg=SEP_BG).pack(fill="x", pady=2)
             elif t == "item":
-                add_item_row(frame, it["left"], it.get("pct"), it["file"], it["title"])
+                add_item_row(frame, it["left"], it.get("pct"), it.get("file"), it["title"], it.get("adaptive"))
             else:
                 tk.Label(frame, text=it.get("text", ""), bg=MENU_BG, fg=TEXT_FG, font=F_MENU_ITEM).pack(padx=8, pady=4)
 
-        top.bind("<FocusOut>", lambda e: self._close_active_dropdown())
-        top.focus_set()
-
     def _close_active_dropdown(self):
-        if self.active_dropdown and self.active_dropdown.winfo_exists():
-            self.active_dropdown.destroy()
+        top = self.active_dropdown
         self.active_dropdown = None
+        if top and top.winfo_exists():
+            if top._unhover:
+                top._unhover()
+            top.withdraw()
 
     def _close_dropdown_global(self, event):
         if time.time() < self._release_ignore_until:
@@ -575,7 +934,7 @@ class QuizApp:
 
     # --------------- Lesmateriaal dropdown -------------------
     def _on_materials_click(self, event=None):
-        items = self._build_materials_items()
+        items = self._materials_catalog()
         self._open_materials_dropdown(self.materials_button, items)
         self._release_ignore_until = 0.35 + time.time()
         return "break"
@@ -609,36 +968,81 @@ class QuizApp:
         except Exception:
             return None
 
-    def _build_materials_items(self):
-        base = resource_dir()
-        lm_dir = os.path.join(base, "assets", "lesmateriaal")
-
-        # Titel, pad/URL, (optioneel) icoonbestand in assets/afbeeldingen, emoji fallback
-        defs = [
-            ("ITIL 4 foundation boek (NE)",      "itil_4_boek.pdf",                   "book.png",    "📘"),
-            ("Presentatie Deel 1",               "ITIL4_presentatie_deel1.pdf",       "slides.png",  "🖥️"),
-            ("Presentatie Deel 2",               "ITIL4_presentatie_deel2.pdf",       "slides.png",  "🖥️"),
-            ("Examen objectives",                "itil4_exam_objectives.pdf",         "target.png",  "🎯"),
-            ("Examen objectives samenvatting",   "itil4_samenvatting_objectives.pdf", "summary.png", "📝"),
-
-            # --- NIEUW: TIA YouTube links ---
-            ("TIA: ITIL 4 Foundation Full Cram Course",
-                "https://www.youtube.com/watch?v=uI0n0kmoYy0&t=3367s", "video.png", "▶️"),
-            ("TIA: ITIL 4 Mock Exam Review",
-                "https://www.youtube.com/watch?v=SuSC7qHbaqE", "video.png", "▶️"),
-        ]
+    def _prebuild_materials(self):
+        items = self._materials_catalog()
+        self._get_dropdown(self.materials_button, self._dropdown_key(items),
+                           lambda t: self._fill_materials_dropdown(t, items))
 
+    def _materials_defs(self, lm_dir: str) -> list:
+        """Standaardlijst aangevuld/overschreven met de optionele lesmateriaal.json."""
+        defs = {label: (label, path, icon, emoji) for label, path, icon, emoji in MATERIALS_DEFS}
+        cfg = os.path.join(lm_dir, MATERIALS_CONFIG)
+        if os.path.isfile(cfg):
+            try:
+                with open(cfg, "r", encoding="utf-8") as f:
+                    extra = json.load(f).get("materials", [])
+                for m in extra:
+                    if m.get("label") and m.get("path"):
+                        defs[m["label"]] = (m["label"], m["path"], m.get("icon", ""), m.get("emoji", "📄"))
+            except Exception as e:
+                log.warning("%s genegeerd: %s", cfg, e)
+        return list(defs.values())
+
+    def _materials_signature(self, lm_dir: str) -> list:
+        # Map-mtime verandert bij toevoegen/hernoemen/verwijderen; config-mtime bij bewerken
+        sig = [lm_dir]
+        for p in (lm_dir, os.path.join(lm_dir, MATERIALS_CONFIG)):
+            try:
+                sig.append(os.stat(p).st_mtime_ns)
+            except OSError:
+                sig.append(None)
+        return sig
+
+    def _materials_catalog(self) -> list:
+        """
+        Lesmateriaal-items met opgelost pad en kant-en-klaar icoon. Wordt één keer
+        opgebouwd en pas opnieuw bepaald als de map of de config gewijzigd is; de
+        opgeloste bestandsnamen worden ook op schijf bewaard voor de volgende start.
+        """
+        lm_dir = os.path.join(resource_dir(), "assets", "lesmateriaal")
+        sig = self._materials_signature(lm_dir)
+        if self._materials_cat and self._materials_cat[0] == sig:
+            return self._materials_cat[1]
+
+        cache_path = None
+        resolved_names = {}
+        try:
+            cache_path = cache_dir() / MATERIALS_CACHE
+            cached = json.loads(cache_path.read_text(encoding="utf-8")) if cache_path.exists() else {}
+            if cached.get("sig") == sig:
+                resolved_names = cached.get("resolved", {})
+        except Exception:
+            resolved_names = {}
+
+        dirty = False
         items = []
-        for label, filename_or_url, icon, emoji in defs:
+        for label, filename_or_url, icon, emoji in self._materials_defs(lm_dir):
             # Als het met http begint => directe URL. Anders is het een lokaal bestand.
             if isinstance(filename_or_url, str) and filename_or_url.startswith(("http://", "https://")):
                 resolved = filename_or_url
             else:
-                # Lokaal bestand uit lesmateriaal-map proberen te resolven
-                resolved = self._resolve_in_dir(lm_dir, filename_or_url) or os.path.join(lm_dir, filename_or_url)
-
-            img = self._load_menu_icon(icon)
+                if filename_or_url not in resolved_names:
+                    hit = self._resolve_in_dir(lm_dir, filename_or_url)
+                    resolved_names[filename_or_url] = os.path.basename(hit) if hit else None
+                    dirty = True
+                name = resolved_names[filename_or_url]
+                resolved = os.path.join(lm_dir, name or filename_or_url)
+
+            img = self._load_menu_icon(icon) if icon else None
             items.append({"label": label, "path": resolved, "img": img, "emoji": emoji, "icon_key": icon})
+
+        if dirty and cache_path is not None:
+            try:
+                atomic_write_text(cache_path, json.dumps({"sig": sig, "resolved": resolved_names},
+                                                         ensure_ascii=False, indent=2))
+            except Exception:
+                pass
+        self._materials_cat = (sig, items)
         return items
 
     def _load_menu_icon(self, filename: str, size: int = ICON_SIZE):
@@ -649,13 +1053,7 @@ class QuizApp:
         p = os.path.join(base, "assets", "afbeeldingen", filename)
         try:
             if os.path.exists(p):
-                img = Image.open(p).convert("RGBA")
-                alpha = img.getchannel("A")
-                bbox = alpha.getbbox()
-                if bbox:
-                    img = img.crop(bbox)
-                img.thumbnail((size, size), Image.LANCZOS)
-                ph = ImageTk.PhotoImage(img)
+                ph = self._scaled_photo(p, (size, size), itil_images.ICON)
                 self._icon_cache[key] = ph
                 return ph
         except Exception:
@@ -665,13 +1063,10 @@ class QuizApp:
 
     def _open_materials_dropdown(self, widget: tk.Widget, items: list):
         self._close_active_dropdown()
-        x = widget.winfo_rootx()
-        y = widget.winfo_rooty() + widget.winfo_height()
-        top = tk.Toplevel(self.master)
-        top.overrideredirect(True)
-        top.geometry(f"+{x}+{y}")
-        top.configure(bg=MENU_BG)
-        self.active_dropdown = top
+        top = self._get_dropdown(widget, self._dropdown_key(items), lambda t: self._fill_materials_dropdown(t, items))
+        self._show_dropdown(widget, top)
+
+    def _fill_materials_dropdown(self, top: tk.Toplevel, items: list):
         frame = tk.Frame(top, bg=MENU_BG, bd=1, relief="solid")
         frame.pack(fill="both", expand=True)
 
@@ -702,13 +1097,17 @@ class QuizApp:
             else:
                 right_gap = _ICON_TEXT_GAP + _MAX_NUDGE
                 tk.Label(icon_cell, text=it.get("emoji", "📄"), bg=MENU_BG, fg=TEXT_FG,
-                         font=("Helvetica", 18)).pack(anchor="w", padx=(0, right_gap))
+                         font=F_EMOJI).pack(anchor="w", padx=(0, right_gap))
 
             lbl = tk.Label(row, text=it["label"], bg=MENU_BG, fg=TEXT_FG, font=F_MENU_ITEM, anchor="w")
             lbl.pack(side="left")
 
-            def on_enter(e, r=row): color_row(r, HOVER_BG, HOVER_FG)
-            def on_leave(e, r=row): color_row(r, MENU_BG, TEXT_FG)
+            def on_leave(e=None, r=row):
+                color_row(r, MENU_BG, TEXT_FG)
+                top._unhover = None
+            def on_enter(e, r=row, leave=on_leave):
+                color_row(r, HOVER_BG, HOVER_FG)
+                top._unhover = leave
             def on_click(e, p=it["path"]):
                 self._close_active_dropdown()
                 self._open_pdf_path(p)
@@ -716,11 +1115,11 @@ class QuizApp:
             for w in (row, icon_cell, lbl):
                 w.bind("<Enter>", on_enter); w.bind("<Leave>", on_leave); w.bind("<Button-1>", on_click)
 
-        top.bind("<FocusOut>", lambda e: self._close_active_dropdown())
-        top.focus_set()
-
     # ---------------- Timer helpers ----------------
-    def _teardown_timer_ui(self):
+    # De examenklok rekent met een time.monotonic()-deadline i.p.v. een teller per
+    # after(1000): trage callbacks (afbeeldingen, score schrijven, widgets bouwen)
+    # laten de klok dan niet meer achterlopen.
+    def _cancel_timer_job(self):
         try:
             qw = getattr(self, "question_win", None)
             if self.timer_job and qw and qw.winfo_exists():
@@ -728,6 +1127,9 @@ class QuizApp:
         except Exception:
             pass
         self.timer_job = None
+
+    def _teardown_timer_ui(self):
+        self._cancel_timer_job()
         for attr in ("timer_label", "timer_btn", "timer_reset_btn", "timer_right_frame"):
             w = getattr(self, attr, None)
             try:
@@ -737,23 +1139,30 @@ class QuizApp:
                 pass
             setattr(self, attr, None)
 
+    def _timer_remaining_now(self) -> float:
+        if self.timer_running and self.timer_deadline is not None:
+            return max(0.0, self.timer_deadline - time.monotonic())
+        return max(0.0, float(self.timer_remaining))
+
+    def _timer_elapsed(self) -> float:
+        return self.timer_total_secs - self._timer_remaining_now()
+
     def _reset_timer(self, start_running: bool = True):
+        if self._q_clock_idx is not None:
+            self._switch_question_clock(self._q_clock_idx)  # tijd tot nu toe nog boeken
         self.timer_total_secs = TIMER_START_SECS
         self.timer_remaining = TIMER_START_SECS
         self.timer_running = start_running
-        try:
-            qw = getattr(self, "question_win", None)
-            if self.timer_job and qw and qw.winfo_exists():
-                qw.after_cancel(self.timer_job)
-        except Exception:
-            pass
-        self.timer_job = None
+        self.timer_deadline = time.monotonic() + TIMER_START_SECS if start_running else None
+        self._q_clock_mark = 0.0
+        self._cancel_timer_job()
         if self.timer_btn and hasattr(self.timer_btn, "winfo_exists") and self.timer_btn.winfo_exists():
             self.timer_btn.set_icon("⏸" if self.timer_running else "▶")
         self._update_timer_label()
         qw = getattr(self, "question_win", None)
         if self.timer_running and qw and qw.winfo_exists():
             self._schedule_timer_tick()
+        self._journal_note()
 
     def _ensure_timer_ui(self, parent: tk.Widget):
         exists = self.timer_right_frame and self.timer_right_frame.winfo_exists()
@@ -763,7 +1172,7 @@ class QuizApp:
 
             self.timer_reset_btn = OuterBorderIconButton(
                 self.timer_right_frame, "↺", lambda: self._reset_timer(True),
-                w=32, h=32, radius=9, border=3, font=("Helvetica", 26, "bold"),
+                w=32, h=32, radius=9, border=3, font=F_ICON_BTN_S,
                 fg="black", outline="black", bg=parent["bg"]
             )
             self.timer_reset_btn.pack(side="left", padx=(0, 10), pady=2)
@@ -771,7 +1180,7 @@ class QuizApp:
             self.timer_btn = OuterBorderIconButton(
                 self.timer_right_frame, ("⏸" if self.timer_running else "▶"),
                 self._toggle_timer,
-                w=56, h=48, radius=12, border=0, font=("Helvetica", 28, "bold"),
+                w=56, h=48, radius=12, border=0, font=F_ICON_BTN,
                 fg="black", outline=parent["bg"], bg=parent["bg"]
             )
             self.timer_btn.pack(side="left", padx=(0, 10), pady=2)
@@ -779,6 +1188,7 @@ class QuizApp:
             self.timer_label = tk.Label(self.timer_right_frame, text="", font=TIMER_FONT,
                                         fg=TIMER_COLOR_OK, bg=parent["bg"])
             self.timer_label.pack(side="left")
+            self._timer_shown = None
 
             self._update_timer_label()
             if self.timer_running:
@@ -797,55 +1207,77 @@ class QuizApp:
         lbl = self.timer_label
         if not (lbl and hasattr(lbl, "winfo_exists") and lbl.winfo_exists()):
             return
-        txt = self._seconds_to_mmss(self.timer_remaining)
+        # Naar boven afronden: 60:00 blijft staan tot er echt een seconde verstreken is
+        shown = math.ceil(self._timer_remaining_now())
+        txt = self._seconds_to_mmss(shown)
         color = TIMER_COLOR_OK
         suffix = ""
-        if self.timer_remaining <= 0:
+        if shown <= 0:
             color = TIMER_COLOR_END
             suffix = " !"
-        elif self.timer_remaining < TIMER_WARN_SECS:
+        elif shown < TIMER_WARN_SECS:
             color = TIMER_COLOR_WARN
+        if (txt + suffix, color) == self._timer_shown:
+            return  # mm:ss niet veranderd: niet opnieuw tekenen
         try:
             lbl.config(text=txt + suffix, fg=color)
+            self._timer_shown = (txt + suffix, color)
         except Exception:
             pass
 
     def _schedule_timer_tick(self):
-        try:
-            qw = getattr(self, "question_win", None)
-            if self.timer_job and qw and qw.winfo_exists():
-                qw.after_cancel(self.timer_job)
-        except Exception:
-            pass
+        self._cancel_timer_job()
         qw = getattr(self, "question_win", None)
         if qw and qw.winfo_exists():
-            self.timer_job = qw.after(1000, self._timer_tick)
-        else:
-            self.timer_job = None
+            # Wakker worden net na de volgende seconde-grens i.p.v. vast na 1000 ms
+            rem = self._timer_remaining_now()
+            delay = rem - (math.ceil(rem) - 1) if rem > 0 else 0.0
+            self.timer_job = qw.after(max(20, int(delay * 1000) + 5), self._timer_tick)
 
     def _timer_tick(self):
-        if self.timer_running and self.timer_remaining > 0:
-            self.timer_remaining -= 1
-            self._update_timer_label()
-        if self.timer_remaining <= 0:
+        self.timer_job = None
+        if self._timer_remaining_now() <= 0:
             self.timer_running = False
+            self.timer_remaining = 0
+            self.timer_deadline = None
             self._update_timer_label()
-            self.timer_job = None
+            self._journal_note()
             return
-        self._schedule_timer_tick()
+        self._update_timer_label()
+        if self.timer_running:
+            if time.monotonic() - self.journal.last_write >= itil_journal.HEARTBEAT_S:
+                self._journal_note()
+            self._schedule_timer_tick()
 
     def _toggle_timer(self):
-        self.timer_running = not self.timer_running
+        if self.timer_running:
+            self.timer_remaining = self._timer_remaining_now()
+            self.timer_deadline = None
+            self.timer_running = False
+            self._cancel_timer_job()
+        elif self._timer_remaining_now() > 0:
+            self.timer_deadline = time.monotonic() + self.timer_remaining
+            self.timer_running = True
+            self._schedule_timer_tick()
         if self.timer_btn and self.timer_btn.winfo_exists():
             self.timer_btn.set_icon("⏸" if self.timer_running else "▶")
-        if self.timer_running and self.timer_job is None and self.timer_remaining > 0:
-            self._schedule_timer_tick()
+        self._update_timer_label()
+        self._journal_note()
+
+    def _switch_question_clock(self, new_idx):
+        """Boekt de verstreken examentijd op de vraag die tot nu toe zichtbaar was."""
+        now = self._timer_elapsed()
+        idx = self._q_clock_idx
+        if idx is not None and 0 <= idx < len(self.question_time_used):
+            self.question_time_used[idx] += max(0.0, now - self._q_clock_mark)
+        self._q_clock_mark = now
+        self._q_clock_idx = new_idx
 
     # ---------------- Bestanden openen ----------------
-    def _open_pdf_path(self, path: str):
-        # Open directe web-links meteen in de browser
+    def _open_pdf_path(self, path: str, page: int = None):
+        # Open directe web-links in de browser
         if isinstance(path, str) and path.startswith(("http://", "https://")):
-            webbrowser.open(path)
+            self._launch_async(path)
             return
 
         # Lokaal pad naar lesmateriaal (PDF e.d.)
@@ -858,20 +1290,102 @@ class QuizApp:
         if not try_path or not os.path.exists(try_path):
             self.show_error_message(f"Bestand niet gevonden:\n{path}")
             return
-        try:
-            if sys.platform.startswith("win"):
-                os.startfile(try_path)  # Windows
-            elif sys.platform == "darwin":
-                os.system(f'open "{try_path}"')  # macOS
-            else:
-                webbrowser.open(f"file://{try_path}")  # Linux/overig
-        except Exception as e:
-            self.show_error_message(f"Kon bestand niet openen: {e}")
+        if page:
+            # Direct naar de pagina: PDF-viewers in de browser volgen #page=N
+            self._launch_async(Path(try_path).resolve().as_uri() + f"#page={int(page)}")
+        else:
+            self._launch_async(try_path)
+
+    def _launch_async(self, target: str):
+        if target in self._launches:
+            return  # dit item wordt al geopend: herhaalde klikken negeren
+        self._launches[target] = (self._launch_pool.submit(_launch_external, target), time.monotonic())
+        if len(self._launches) == 1:
+            self.master.after(LAUNCH_POLL_MS, self._poll_launches)
+
+    def _poll_launches(self):
+        """Resultaten van de launch-pool terugmelden op de Tk-thread."""
+        now = time.monotonic()
+        for target, (fut, started) in list(self._launches.items()):
+            if fut.done():
+                del self._launches[target]
+                err = fut.exception()
+                if err is not None:
+                    self.show_error_message(f"Kon niet openen:\n{target}\n\n{err}")
+                elif fut.result() is False:
+                    self.show_error_message(f"Geen programma gevonden om dit te openen:\n{target}")
+            elif now - started > LAUNCH_TIMEOUT_S:
+                del self._launches[target]
+                self.show_error_message(f"Openen duurt te lang (> {LAUNCH_TIMEOUT_S} s):\n{target}")
+        if self._launches:
+            self.master.after(LAUNCH_POLL_MS, self._poll_launches)
 
     def open_book_pdf(self):
         base = resource_dir()
         pdf_path = os.path.join(base, "assets", "lesmateriaal", "itil_4_boek.pdf")
-        self._open_pdf_path(pdf_path)
+        page = None
+        # In de review: meteen naar de best passende boekpagina voor deze vraag
+        rw = getattr(self, "review_win", None)
+        if self.pdf_index and rw and rw.winfo_exists() and self.questions:
+            for path, pno, _ in self._pdf_refs_for(self.questions[self.current_question_index], k=10):
+                if os.path.basename(path).lower() == "itil_4_boek.pdf":
+                    page = pno
+                    break
+        self._open_pdf_path(pdf_path, page)
+
+    # ---------------- Pagina-verwijzingen lesmateriaal ----------------
+    def _ensure_pdf_index(self):
+        if self.pdf_index is not None or self._pdf_index_loading:
+            return
+        self._pdf_index_loading = True
+
+        def work():
+            # Alleen Python-werk in deze thread; de UI pakt het resultaat op via after()
+            try:
+                self.pdf_index = itil_pdfindex.PdfPageIndex.load(
+                    build_missing=itil_pdfindex.pypdf_available())
+            except Exception:
+                self.pdf_index = itil_pdfindex.PdfPageIndex([])
+            self._pdf_index_loading = False
+
+        threading.Thread(target=work, name="pdf-index", daemon=True).start()
+
+    def _pdf_refs_for(self, q: dict, k: int = 3) -> list:
+        if not self.pdf_index:
+            return []
+        ans = q.get("answer")
+        text = " ".join([q.get("question", "")] + (ans if isinstance(ans, list) else [str(ans or "")]))
+        return self.pdf_index.search(text, k=k)
+
+    def _update_review_refs(self):
+        frame = getattr(self, "review_refs_frame", None)
+        if not (frame and frame.winfo_exists()):
+            return
+        for w in frame.winfo_children():
+            w.destroy()
+        if self._refs_job:
+            try:
+                frame.after_cancel(self._refs_job)
+            except tk.TclError:
+                pass
+            self._refs_job = None
+        if self.pdf_index is None:
+            if self._pdf_index_loading:
+                self._refs_job = frame.after(500, self._update_review_refs)
+            return
+        refs = self._pdf_refs_for(self.questions[self.current_question_index])
+        if not refs:
+            return
+        labels = {}
+        for it in self._materials_catalog():
+            labels[os.path.basename(it["path"]).lower()] = (it["label"], it["emoji"])
+        tk.Label(frame, text="Read more:", font=F_NOTE, fg="#444444").pack(side="left", padx=(0, 8))
+        for path, pno, _ in refs:
+            label, emoji = labels.get(os.path.basename(path).lower(), (os.path.basename(path), "📄"))
+            link = tk.Label(frame, text=f"{emoji} {label} p. {pno}", font=F_LINK,
+                            fg="#1a5fb4", cursor="hand2")
+            link.pack(side="left", padx=8)
+            link.bind("<Button-1>", lambda e, p=path, n=pno: self._open_pdf_path(p, n))
 
     # ---------------- Start functies ----------------
     def start_itil_hoofdstuk(self, hoofdstuk: int):
@@ -889,89 +1403,296 @@ class QuizApp:
             self.show_error_message(f"Geen vragen gevonden in {filename}.")
             return
 
-        self.questions = self.current_chapter_data["questions"]
-        random.shuffle(self.questions)
+        for q in self.current_chapter_data["questions"]:
+            q.pop("explanation", None)  # uitleg pas laden als de review erom vraagt
+        self._begin_session(self.current_chapter_data, f"ITIL 4 hoofdstuk {hoofdstuk}", ("json", full),
+                            normalized_options(self.current_chapter_data["questions"]))
 
-        self.shuffled_options = []
-        for q in self.questions:
-            opts = list(q.get("options", []))
-            ans = q.get("answer")
-            if isinstance(ans, list):
-                for a in ans:
-                    if a not in opts:
-                        opts.append(a)
-            else:
-                if ans not in opts:
-                    opts.append(ans)
-            random.shuffle(opts)
-            self.shuffled_options.append(opts)
+    def _load_bank_chapter(self, filepath: str):
+        """Zie itil_core.load_bank_chapter; raakt geen Tk aan (ook bruikbaar in de preload-thread)."""
+        return load_bank_chapter(filepath, self.corpus)
+
+    # ---------------- Voorladen bij hover ----------------
+    def _preload_bank(self, filepath: str):
+        """Start het parsen van een bank zodra de muis over de rij gaat; de klik hoeft dan alleen te schudden."""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return
+        sig = (st.st_mtime_ns, st.st_size)
+        hit = self._preloads.get(filepath)
+        if hit and hit[0] == sig:
+            self._preloads.move_to_end(filepath)
+            return
+        self._preloads[filepath] = (sig, self._preload_pool.submit(self._load_bank_chapter, filepath))
+        while len(self._preloads) > PRELOAD_CACHE_SIZE:
+            self._preloads.popitem(last=False)[1][1].cancel()
+
+    def _take_preload(self, filepath: str):
+        """Future van een (lopende) preload als die nog bij het huidige bestand hoort, anders None."""
+        hit = self._preloads.pop(filepath, None)
+        if not hit:
+            return None
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        if hit[0] != (st.st_mtime_ns, st.st_size) or hit[1].cancelled():
+            return None
+        return hit[1]
+
+    def _start_toets_file(self, filepath: str, title: str):
+        self.reset_statistics()
+        try:
+            pending = self._take_preload(filepath)
+            # Loopt de preload nog, dan daarop wachten i.p.v. dubbel werk te doen
+            loaded = pending.result() if pending is not None else self._load_bank_chapter(filepath)
+            chapter, expl_source, base_options = loaded
+            self.current_json_path = filepath
+        except Exception as e:
+            self.show_error_message(f"Fout bij laden {filepath}: {e}")
+            return
+        self._begin_session(chapter, title, expl_source, base_options)
+
+    def _begin_session(self, chapter: dict, title: str, expl_source: tuple, base_options: list):
+        """Schudt vragen en opties en opent het vraagvenster."""
+        # question_src[i] = positie in de bank van sessievraag i (voor uitleg op aanvraag)
+        self.question_src, self.questions, self.shuffled_options = shuffle_session(
+            chapter.get("questions", []), base_options)
+        self._expl_source = expl_source
+        self._session_expl = None
+        self._session_recorded = False
+        self.adaptive = None
 
         self.current_question_index = 0
         self.user_answers = [None] * len(self.questions)
         self.correct_answers = []
+        self.question_time_used = [0.0] * len(self.questions)
+        self._q_clock_idx = None
+        self.telemetry = QuestionTelemetry(len(self.questions))
 
         total = len(self.questions)
-        display_title = self.current_chapter_data.get("chapter") or self.current_chapter_data.get("description") or f"ITIL 4 hoofdstuk {hoofdstuk}"
+        display_title = chapter.get("chapter") or chapter.get("description") or title
         self.current_session_title = f"{display_title} ({total})"
 
         self._reset_timer(start_running=True)
 
         self.session_active = True
         self.assessment_mode = True
+        self._journal_start(base_options)
         self.question_window()
 
-    def _start_toets_file(self, filepath: str, title: str):
-        self.reset_statistics()
+    # ---------------- Sessiejournaal / hervatten ----------------
+    def _journal_start(self, base_options: list):
+        if not self.current_json_path or not self.questions:
+            self._journal_live = False
+            return
+        orders = [option_order(base_options[pos], opts)
+                  for pos, opts in zip(self.question_src, self.shuffled_options)]
+        self.journal.take_error()  # een fout van een vorige sessie telt niet meer
+        self.journal.start(self.current_json_path, self.current_session_title, self.question_src, orders,
+                           self._timer_remaining_now() * 1000, self.timer_running)
+        self._journal_live = True
+
+    def _journal_note(self, **rec):
+        """Deltaregel met de huidige vraag en klok (plus eventueel een antwoord of geboekte tijd)."""
+        if not self._journal_live or self.adaptive is not None:
+            return
+        err = self.journal.take_error()
+        if err:
+            # Schrijven lukt niet (share weg, schijf vol): niet stil doorgaan alsof hervatten kan
+            self._journal_live = False
+            self.show_error_message(f"De voortgang van deze toets kan niet bewaard worden;\n"
+                                    f"na een crash is hervatten niet mogelijk.\n\n{err}")
+            return
+        rec.update(i=self.current_question_index, ms=int(self._timer_remaining_now() * 1000),
+                   run=self.timer_running)
+        self.journal.note(**rec)
+
+    def _journal_end(self):
+        if self._journal_live:
+            self._journal_live = False
+            self.journal.discard()
+
+    def _offer_resume(self):
+        state = itil_journal.load(self.journal.path)
+        if state is None:
+            return
+        n = len(state["src"])
+        answered = sum(1 for a in state["answers"] if a is not None)
+        msg = (f"Er is een onderbroken toets gevonden:\n{state.get('title') or state['bank']}\n\n"
+               f"Vraag {state['i'] + 1} / {n}, {answered} beantwoord, "
+               f"nog {self._seconds_to_mmss(math.ceil(state['ms'] / 1000))} op de klok.\n\nHervatten?")
+        if not messagebox.askyesno("Toets hervatten", msg, parent=self.master):
+            self.journal.discard()
+            return
         try:
-            with open(filepath, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-            chapter = data["chapters"][0]
-            self.current_json_path = filepath
+            self._resume_session(state)
         except Exception as e:
-            self.show_error_message(f"Fout bij laden {filepath}: {e}")
-            return
+            self.journal.discard()
+            self.show_error_message(f"Toets kon niet hervat worden: {e}")
+
+    def _resume_session(self, state: dict):
+        """Zelfde vragen, optievolgorde, antwoorden en resterende tijd als bij de onderbreking."""
+        path = itil_journal.resolve_bank(state["bank"])
+        if state.get("sha1") and file_sha1(path) != state["sha1"]:
+            raise ValueError(f"{os.path.basename(path)} is intussen gewijzigd")
+        chapter, expl_source, base_options = self._load_bank_chapter(path)
+        self.questions, self.shuffled_options = restore_session(
+            chapter.get("questions", []), base_options, state["src"], state["ord"])
+        self.question_src = list(state["src"])
+        self.current_json_path = path
+        self._expl_source = expl_source
+        self._session_expl = None
+        self._session_recorded = False
+        self.adaptive = None
+
+        n = len(self.questions)
+        self.current_question_index = state["i"]
+        self.user_answers = list(state["answers"])
+        self.correct_answers = list(state["scores"])
+        self.question_time_used = list(state["used"])
+        self._q_clock_idx = None
+        self.telemetry = QuestionTelemetry(n)
+        for i, (dwell, visits, changes) in enumerate(state["tele"]):
+            self.telemetry.dwell[i], self.telemetry.visits[i], self.telemetry.changes[i] = dwell, visits, changes
+        self.current_session_title = state.get("title") or os.path.basename(path)
 
-        self.questions = chapter.get("questions", [])
-        random.shuffle(self.questions)
+        self.timer_total_secs = TIMER_START_SECS
+        self.timer_remaining = max(0.0, state["ms"] / 1000.0)
+        self.timer_running = bool(state["run"]) and self.timer_remaining > 0
+        self.timer_deadline = time.monotonic() + self.timer_remaining if self.timer_running else None
+        self._q_clock_mark = 0.0
 
-        self.shuffled_options = []
-        for q in self.questions:
-            opts = list(q.get("options", []))
-            ans = q.get("answer")
-            if isinstance(ans, list):
-                for a in ans:
-                    if a not in opts:
-                        opts.append(a)
-            else:
-                if ans not in opts:
-                    opts.append(ans)
-            random.shuffle(opts)
-            self.shuffled_options.append(opts)
+        self.session_active = True
+        self.assessment_mode = True
+        # Verder schrijven in hetzelfde journaal (een half geschreven laatste regel valt weg)
+        self.journal.resume(state["size"])
+        self._journal_live = True
+        self.question_window()
 
-        self.current_question_index = 0
-        self.user_answers = [None] * len(self.questions)
-        self.correct_answers = []
+    # ---------------- Adaptieve readiness-check ----------------
+    def start_adaptive(self, lang: str, title: str):
+        """
+        Readiness-check over alle banken van één taal: vragen komen één voor één uit
+        het corpus (de meest informatieve bij de huidige schatting) tot het
+        geslaagd/gezakt-verdict zeker genoeg is; zie itil_adaptive.
+        """
+        dirp = self._banks_dir()
+        banks = sorted(os.path.join(dirp, name) for name in self._snapshot_banks())
+        try:
+            corpus = itil_corpus.ensure_fresh(self.corpus, banks)
+            if self.item_stats is None:
+                self.item_stats = ItemStats.load()
+            pool = itil_adaptive.build_pool(corpus, banks, self.item_stats, lang)
+        except Exception as e:
+            self.show_error_message(f"Adaptieve toets kon niet starten: {e}")
+            return
+        if not pool:
+            if corpus is not self.corpus:
+                corpus.close()
+            self.show_error_message(f"Geen vragen gevonden voor taal {lang.upper()}")
+            return
+        if corpus is not self.corpus:
+            self._switch_corpus(corpus)
 
-        total = len(self.questions)
-        display_title = chapter.get("chapter") or chapter.get("description") or title
-        self.current_session_title = f"{display_title} ({total})"
+        self._journal_end()  # readiness-checks worden niet gejournaald
+        self.adaptive = itil_adaptive.AdaptiveTest(pool, PASS_THRESHOLD)
+        self.adaptive_lang = lang
+        self.current_json_path = None
+        # question_src bevat hier corpus-indexen, dus uitleg komt via ("corpus", 0)
+        self.question_src, self.questions, self.shuffled_options = [], [], []
+        self.user_answers, self.question_time_used, self.correct_answers = [], [], []
+        self._expl_source = ("corpus", 0)
+        self._session_expl = None
+        self._session_recorded = False
+        self.current_question_index = 0
+        self._q_clock_idx = None
+        self.telemetry = QuestionTelemetry(self.adaptive.max_items)
+        self._append_adaptive_question()
+        self.current_session_title = title
 
         self._reset_timer(start_running=True)
-
         self.session_active = True
         self.assessment_mode = True
         self.question_window()
 
+    def _switch_corpus(self, corpus):
+        """
+        Nieuw corpus in gebruik nemen. Preloads horen bij de indexen van het oude
+        corpus en vervallen. Het oude corpus wordt niet gesloten: een preload-thread
+        kan er nog uit lezen; de GC ruimt het op zodra niemand het meer vasthoudt.
+        """
+        for _sig, fut in self._preloads.values():
+            fut.cancel()
+        self._preloads.clear()
+        self.corpus = corpus
+
+    def _append_adaptive_question(self) -> bool:
+        """Zet de volgende vraag van de adaptieve toets achteraan; False als de toets klaar is."""
+        idx = self.adaptive.next_item()
+        if idx is None:
+            return False
+        g = self.adaptive.pool[idx][0]
+        q = self.corpus[g]
+        _src, _qs, (opts,) = shuffle_session([q], normalized_options([q]))
+        self.question_src.append(g)
+        self.questions.append(q)
+        self.shuffled_options.append(opts)
+        self.user_answers.append(None)
+        self.question_time_used.append(0.0)
+        return True
+
+    def _session_explanations(self) -> list:
+        """
+        Uitleg per sessievraag, pas opgehaald bij de eerste review. Uit het corpus per
+        offset; uit de JSON door de bank opnieuw te lezen (gecontroleerd op vraagtekst,
+        want de bank kan intussen bewerkt zijn).
+        """
+        if self._session_expl is not None:
+            return self._session_expl
+        kind, ref = self._expl_source or (None, None)
+        expl = [{} for _ in self.questions]
+        try:
+            if kind == "corpus":
+                expl = [self.corpus.explanation(ref + pos) for pos in self.question_src]
+            elif kind == "json":
+                with open(ref, "r", encoding="utf-8") as fh:
+                    src = json.load(fh)["chapters"][0].get("questions", [])
+                by_text = None
+                for i, (pos, q) in enumerate(zip(self.question_src, self.questions)):
+                    cand = src[pos] if pos < len(src) else None
+                    if not cand or cand.get("question") != q.get("question"):
+                        if by_text is None:
+                            by_text = {c.get("question"): c for c in src}
+                        cand = by_text.get(q.get("question"))
+                    expl[i] = (cand or {}).get("explanation") or {}
+        except Exception:
+            pass
+        self._session_expl = expl
+        return expl
+
     # ---------------- UI helpers ----------------
+    def _scaled_photo(self, src: str, box: tuple, mode: str):
+        """
+        PhotoImage uit de voorgeschaalde PNG-variant (itil_images); Tk leest die zelf,
+        zonder decoderen en schalen met PIL. Lukt dat niet, dan alsnog via PIL.
+        """
+        path = itil_images.variant(src, box, mode)
+        if path is not None:
+            try:
+                return tk.PhotoImage(file=str(path), master=self.master)
+            except tk.TclError:
+                pass
+        return ImageTk.PhotoImage(itil_images.render(src, box, mode))
+
     def add_image(self):
         try:
             base = resource_dir()
             image_path = os.path.join(base, 'assets', 'afbeeldingen', 'itil_4_foundation.jpg')
             if not os.path.exists(image_path):
                 return
-            img = Image.open(image_path)
-            img.thumbnail((WRAP_W, 500), Image.LANCZOS)
-            self.main_banner_img = ImageTk.PhotoImage(img)
+            self.main_banner_img = self._scaled_photo(image_path, itil_images.FIT_BOX, itil_images.FIT)
             self.main_image_label = tk.Label(self.master, image=self.main_banner_img)
             self.main_image_label.pack(pady=(50, 20))
         except Exception as e:
@@ -1008,25 +1729,29 @@ class QuizApp:
             self.question_scrollbar.pack(side="right", fill="y")
             self.question_canvas.configure(yscrollcommand=self.question_scrollbar.set)
 
-        self.page_frame = tk.Frame(self.question_canvas)
-        self.page_window = self.question_canvas.create_window((0, 0), window=self.page_frame, anchor="nw")
-        self.page_frame.grid_columnconfigure(0, weight=1)
-        self.page_frame.grid_columnconfigure(2, weight=1)
+        if self.canvas_render:
+            # Vraag, opties en afbeelding als items op de canvas zelf; geen geneste frames
+            self.question_page = itil_render.CanvasPage(self.question_canvas, WRAP_W + OPTIONS_LEFT_PAD)
+        else:
+            self.question_page = None
+            self.page_frame = tk.Frame(self.question_canvas)
+            self.page_window = self.question_canvas.create_window((0, 0), window=self.page_frame, anchor="nw")
+            self.page_frame.grid_columnconfigure(0, weight=1)
+            self.page_frame.grid_columnconfigure(2, weight=1)
 
-        self.content = tk.Frame(self.page_frame, width=CONTENT_MAX_W)
-        self.content.grid(row=0, column=1, sticky="n", pady=(10, 20))
+            self.content = tk.Frame(self.page_frame, width=CONTENT_MAX_W)
+            self.content.grid(row=0, column=1, sticky="n", pady=(10, 20))
 
-        self.question_label = tk.Label(self.content, text="", wraplength=WRAP_W, font=F_QUESTION, justify="center")
-        self.question_label.pack(pady=(5, 15))
+            self.question_label = tk.Label(self.content, text="", wraplength=WRAP_W, font=F_QUESTION, justify="center")
+            self.question_label.pack(pady=(5, 15))
 
-        self.options_frame = tk.Frame(self.content)
-        self.options_frame.pack(pady=5, fill="x")
+            self.options_frame = tk.Frame(self.content)
+            self.options_frame.pack(pady=5, fill="x")
 
-        for w in (self.question_win, self.question_canvas, self.page_frame, self.content, self.options_frame):
-            w.bind("<MouseWheel>", self._on_mousewheel_question, add="+")
+            self.image_label = tk.Label(self.content)
+            self.image_label.pack(pady=(0, 15))
 
-        self.image_label = tk.Label(self.content)
-        self.image_label.pack(pady=(0, 15))
+        WheelScroller(self.question_win, self.question_canvas)
 
         bottom_frame = tk.Frame(self.question_win)
         bottom_frame.pack(side="bottom", pady=(14, 20))
@@ -1045,8 +1770,9 @@ class QuizApp:
             messagebox.showinfo("Huidige bron", msg, parent=self.question_win)
         self.question_win.bind("<Control-i>", _show_src_info)
 
-        self.content.bind("<Configure>", self._configure_question_content)
-        self.question_canvas.bind("<Configure>", lambda e: self.question_canvas.itemconfig(self.page_window, width=e.width))
+        if self.question_page is None:
+            self.content.bind("<Configure>", self._configure_question_content)
+            self.question_canvas.bind("<Configure>", lambda e: self.question_canvas.itemconfig(self.page_window, width=e.width))
 
         self.load_question_canvas()
 
@@ -1054,29 +1780,34 @@ class QuizApp:
     def _configure_question_content(self, event):
         self.question_canvas.configure(scrollregion=self.question_canvas.bbox("all"))
 
-    def _on_mousewheel_question(self, event: tk.Event):
-        canvas = getattr(self, "question_canvas", None)
-        if not canvas or not canvas.winfo_exists():
-            return
-        if sys.platform.startswith("win"):
-            steps = int(-1 * (event.delta / 120))
-        elif sys.platform == "darwin":
-            steps = int(-1 * event.delta)
-        else:
-            steps = int(-1 * (event.delta))
-        try:
-            canvas.yview_scroll(steps, "units")
-        except tk.TclError:
-            pass
-
     def load_question_canvas(self):
+        prev = self._q_clock_idx
+        self._switch_question_clock(self.current_question_index)
+        self.telemetry.show(self.current_question_index)
+        if prev is not None and 0 <= prev < len(self.question_time_used):
+            # Alleen de zojuist verlaten vraag: geboekte tijd + telemetrie
+            tm = self.telemetry
+            self._journal_note(u=[prev, round(self.question_time_used[prev], 3), round(tm.dwell[prev], 3),
+                                  tm.visits[prev], tm.changes[prev]])
+        else:
+            self._journal_note()
         self.chapter_title_label.config(text=self.current_session_title)
-        self.question_counter.config(text=f"Question {self.current_question_index + 1} / {len(self.questions)}")
+        if self.adaptive is not None:
+            self.question_counter.config(
+                text=f"Question {self.current_question_index + 1} (max {self.adaptive.max_items})")
+        else:
+            self.question_counter.config(text=f"Question {self.current_question_index + 1} / {len(self.questions)}")
 
         if hasattr(self, "submit_button"):
             self.submit_button.config(state="normal")
 
         q = self.questions[self.current_question_index]
+        options = self.shuffled_options[self.current_question_index]
+        saved = self.user_answers[self.current_question_index]
+        if self.question_page is not None:
+            self._render_question_page(q, options, saved)
+            return
+
         self.question_label.config(text=q["question"])
 
         self.display_question_image_canvas()
@@ -1084,71 +1815,100 @@ class QuizApp:
         for w in self.options_frame.winfo_children():
             w.destroy()
 
-        options = self.shuffled_options[self.current_question_index]
-        saved = self.user_answers[self.current_question_index]
-
         self._opt_vars = []
         for idx, opt in enumerate(options):
             var = tk.BooleanVar(value=(idx in saved) if saved is not None else False)
             row = tk.Frame(self.options_frame)
             row.pack(fill="x")
             cb = tk.Checkbutton(row, text=opt, variable=var, font=F_OPTION,
-                                anchor="w", justify="left", wraplength=WRAP_W, padx=0)
+                                anchor="w", justify="left", wraplength=WRAP_W, padx=0,
+                                command=lambda i=self.current_question_index: self.telemetry.change(i))
             cb.pack(side="left", anchor="w", padx=(OPTIONS_LEFT_PAD, 0), pady=6, fill="x")
             self._opt_vars.append(var)
 
-    def display_question_image_canvas(self):
-        q = self.questions[self.current_question_index]
+    def _render_question_page(self, q: dict, options: list, saved):
+        """Canvas-modus: zelfde inhoud als de widgets (vraag, aanvinkbare opties, afbeelding) als items."""
+        self._opt_vars, self._opt_blocks = [], []
+        blocks = [itil_render.Block(q["question"], F_QUESTION, indent=OPTIONS_LEFT_PAD, pad=(15, 15))]
+        for idx, opt in enumerate(options):
+            var = tk.BooleanVar(value=(idx in saved) if saved is not None else False)
+            block = itil_render.Block(self._option_line(opt, var.get()), F_OPTION, align="w",
+                                      indent=OPTIONS_LEFT_PAD, pad=(6, 6),
+                                      on_click=lambda i=idx: self._toggle_page_option(i))
+            self._opt_vars.append(var)
+            self._opt_blocks.append(block)
+            blocks.append(block)
+        self._page_photo = self._question_photo(q)   # referentie vasthouden zolang het item bestaat
+        if self._page_photo is not None:
+            blocks.append(itil_render.Block(image=self._page_photo, pad=(20, 15)))
+        self.question_page.render(blocks)
+        self.question_canvas.yview_moveto(0)
+
+    def _option_line(self, opt: str, checked: bool) -> str:
+        return f"{itil_render.CHECK_ON if checked else itil_render.CHECK_OFF}  {opt}"
+
+    def _toggle_page_option(self, idx: int):
+        var = self._opt_vars[idx]
+        var.set(not var.get())
+        self.telemetry.change(self.current_question_index)
+        opt = self.shuffled_options[self.current_question_index][idx]
+        self.question_page.set_text(self._opt_blocks[idx], self._option_line(opt, var.get()))
+
+    def _question_photo(self, q: dict):
+        """Voorgeschaalde PhotoImage van de vraagafbeelding, of None."""
         image_path = q.get("image")
         if not image_path:
-            self.image_label.configure(image="", height=1)
-            self.image_label.image = None
-            return
+            return None
         base = resource_dir()
         full = os.path.join(base, os.path.normpath(image_path)) if not os.path.isabs(image_path) else os.path.normpath(image_path)
         if not os.path.exists(full):
-            self.image_label.configure(image="", height=1)
-            self.image_label.image = None
-            return
+            return None
         try:
-            img = Image.open(full)
-            img.thumbnail((WRAP_W, 500), Image.LANCZOS)
-            ph = ImageTk.PhotoImage(img)
-            self.image_label.configure(image=ph)
-            self.image_label.image = ph
+            return self._scaled_photo(full, itil_images.FIT_BOX, itil_images.FIT)
         except Exception:
+            return None
+
+    def display_question_image_canvas(self):
+        ph = self._question_photo(self.questions[self.current_question_index])
+        if ph is None:
             self.image_label.configure(image="", height=1)
-            self.image_label.image = None
+        else:
+            self.image_label.configure(image=ph)
+        self.image_label.image = ph
 
     def previous_question(self):
+        if self.adaptive is not None:
+            return  # adaptief: de volgende vraag hangt af van de vorige antwoorden
         if self.current_question_index > 0:
             self.current_question_index -= 1
             self.load_question_canvas()
 
     def next_question(self):
+        idx = self.current_question_index
+        if self.adaptive is not None and idx == len(self.questions) - 1 and self.user_answers[idx] is None:
+            self.submit_answer(skip=True)  # overslaan telt als fout (0); pas dan is er een volgende vraag
+            return
         if self.current_question_index < len(self.questions) - 1:
             self.current_question_index += 1
             self.load_question_canvas()
         else:
             self.show_stats()
 
-    def submit_answer(self):
-        selected = [i for i, var in enumerate(getattr(self, "_opt_vars", [])) if var.get()]
+    def submit_answer(self, skip: bool = False):
+        # skip: niets ingevuld, ongeacht wat er aangevinkt staat (adaptief overslaan)
+        selected = [] if skip else [i for i, var in enumerate(getattr(self, "_opt_vars", [])) if var.get()]
         self.user_answers[self.current_question_index] = selected
 
         correct = self.questions[self.current_question_index]["answer"]
         options = self.shuffled_options[self.current_question_index]
+        score = grade_answer(correct, options, selected)
+        self.correct_answers.append(score)
+        self._journal_note(a=[self.current_question_index, selected, score])
 
-        if isinstance(correct, list):
-            correct_indices = [options.index(ans) for ans in correct if ans in options]
-            score = len(set(correct_indices).intersection(selected)) / len(correct_indices) if correct_indices else 0.0
-            self.correct_answers.append(score)
-        else:
-            try:
-                correct_index = options.index(correct)
-                self.correct_answers.append(1.0 if selected == [correct_index] else 0.0)
-            except ValueError:
-                self.correct_answers.append(0.0)
+        if self.adaptive is not None:
+            self.adaptive.record(self.adaptive.asked[self.current_question_index], score)
+            if not self.adaptive.done():
+                self._append_adaptive_question()
 
         if hasattr(self, "submit_button"):
             self.submit_button.config(state="disabled")
@@ -1164,41 +1924,64 @@ class QuizApp:
 
     def exit_quiz(self):
         self.session_active = False
-        self._unbind_local_scroll()
+        self._journal_end()
         self._teardown_timer_ui()
         if hasattr(self, 'question_win') and self.question_win:
             self.question_win.destroy()
         messagebox.showinfo("Quiz", "Quiz is afgesloten.", parent=self.master)
 
     def show_stats(self):
-        self._unbind_local_scroll()
+        self.session_active = False  # de toets is afgelopen; review en Ctrl-P mogen weer
+        self._switch_question_clock(None)
+        self.telemetry.stop()
+        self._journal_end()
         self._teardown_timer_ui()
         if hasattr(self, 'question_win') and self.question_win:
             self.question_win.destroy()
 
         self.stats_win = tk.Toplevel(self.master)
         self.stats_win.title("Statistics")
-        self.center_toplevel(self.stats_win, 600, 400)
+        self.center_toplevel(self.stats_win, 600, 500)
 
         correct_count = sum(1 for s in self.correct_answers if s == 1.0)
         incorrect_count = sum(1 for s in self.correct_answers if s == 0.0)
         skipped_count = sum(1 for a in self.user_answers if a is None)
         total = len(self.questions)
         total_score = sum(self.correct_answers)
-        pct = (total_score / total * 100) if total > 0 else 0
-
-        self._store_last_score(pct)
+        pct = session_percentage(self.correct_answers, total)
+        passed = pct >= PASS_THRESHOLD
 
-        tk.Label(self.stats_win, text=f"You scored {total_score:.2f} out of {total} correct!", font=("Helvetica", 24)).pack(pady=10)
-        tk.Label(self.stats_win, text=f"Correct Answers: {correct_count}", font=("Helvetica", 20)).pack(pady=5)
-        tk.Label(self.stats_win, text=f"Incorrect Answers: {incorrect_count}", font=("Helvetica", 20)).pack(pady=5)
-        tk.Label(self.stats_win, text=f"Skipped Questions: {skipped_count}", font=("Helvetica", 20)).pack(pady=5)
+        if not self._session_recorded:
+            # Eén keer per sessie: de knop Statistics in de review opent dit venster opnieuw
+            self._session_recorded = True
+            self._store_last_score(pct)
+            self._record_item_stats()
+            if self.adaptive is not None:
+                self._store_adaptive_result()
+        if self.adaptive is not None:
+            pct, passed = self.adaptive.expected_pct(), self.adaptive.passed()
+
+        tk.Label(self.stats_win, text=f"You scored {total_score:.2f} out of {total} correct!", font=F_STAT_TITLE).pack(pady=10)
+        tk.Label(self.stats_win, text=f"Correct Answers: {correct_count}", font=F_STAT).pack(pady=5)
+        tk.Label(self.stats_win, text=f"Incorrect Answers: {incorrect_count}", font=F_STAT).pack(pady=5)
+        tk.Label(self.stats_win, text=f"Skipped Questions: {skipped_count}", font=F_STAT).pack(pady=5)
+        time_used = self._seconds_to_mmss(round(sum(self.question_time_used)))
+        tk.Label(self.stats_win, text=f"Time used: {time_used}", font=F_STAT).pack(pady=5)
+        slow = [i for i in self.telemetry.slowest(3) if self.telemetry.dwell[i] >= 1.0]
+        if slow:
+            slow_txt = ", ".join(f"Q{i + 1} ({self._seconds_to_mmss(round(self.telemetry.dwell[i]))})" for i in slow)
+            tk.Label(self.stats_win, text=f"Slowest: {slow_txt}", font=F_STAT_NOTE, fg="#444444").pack(pady=5)
+
+        if self.adaptive is not None:
+            tk.Label(self.stats_win, text=f"Adaptive: {total} questions, chance of passing "
+                                          f"{self.adaptive.prob_pass():.0%}",
+                     font=F_STAT_NOTE, fg="#444444").pack(pady=5)
 
-        passed = pct >= PASS_THRESHOLD
         color = "green" if passed else "red"
         tick = "✓" if passed else "✗"
-        score_text = f"Score: {pct:.2f} %  {tick}"
-        tk.Label(self.stats_win, text=score_text, font=("Helvetica", 22, "bold"), fg=color).pack(pady=10)
+        label = "Estimated score" if self.adaptive is not None else "Score"
+        score_text = f"{label}: {pct:.2f} %  {tick}"
+        tk.Label(self.stats_win, text=score_text, font=F_STAT_SCORE, fg=color).pack(pady=10)
 
         nav = tk.Frame(self.stats_win)
         nav.pack(side="bottom", pady=(20, 20))
@@ -1206,7 +1989,6 @@ class QuizApp:
         tk.Button(nav, text="Finish", font=F_BUTTON, command=self.stats_win.destroy).pack(side=tk.LEFT, padx=20)
 
     def review_answers(self):
-        self._unbind_local_scroll()
         self.stats_win.destroy()
         self.current_question_index = 0
         self.review_window()
@@ -1231,8 +2013,7 @@ class QuizApp:
         offset_x = 400
         self.review_canvas.create_window((offset_x, 0), window=self.review_content_frame, anchor="nw")
 
-        for w in (self.review_win, self.review_canvas, self.review_content_frame):
-            w.bind("<MouseWheel>", self._on_mousewheel_question, add="+")
+        WheelScroller(self.review_win, self.review_canvas)
 
         self.review_content_frame.bind("<Configure>", self._configure_review_content)
 
@@ -1246,11 +2027,24 @@ class QuizApp:
         self.question_counter_review = tk.Label(self.review_content_frame, text=f"Question {self.current_question_index + 1} / {len(self.questions)}", font=F_COUNTER, justify="center")
         self.question_counter_review.pack(pady=10)
 
+        self.review_telemetry_label = tk.Label(self.review_content_frame, text="", font=F_NOTE,
+                                               fg="#444444", justify="center")
+        self.review_telemetry_label.pack(pady=(0, 6))
+
         self.review_question_label = tk.Label(self.review_content_frame, wraplength=WRAP_W, font=F_QUESTION, justify="center")
         self.review_question_label.pack(pady=10)
 
+        self.review_refs_frame = tk.Frame(self.review_content_frame)
+        self.review_refs_frame.pack(pady=(0, 5))
+        self._ensure_pdf_index()
+
         self.options_frame_review = tk.Frame(self.review_content_frame)
         self.options_frame_review.pack(pady=15, fill="x")
+        self.review_page = None
+        if self.canvas_render:
+            page_canvas = tk.Canvas(self.options_frame_review, width=WRAP_W + 24, height=1, highlightthickness=0)
+            page_canvas.pack(anchor="w")
+            self.review_page = itil_render.CanvasPage(page_canvas, WRAP_W + 24, top=0, margin=0)
 
         btn_frame = tk.Frame(bottom_frame)
         btn_frame.pack()
@@ -1279,42 +2073,62 @@ class QuizApp:
         self.session_active = False
 
     def load_review_question(self):
-        for w in self.options_frame_review.winfo_children():
-            w.destroy()
+        if self.review_page is None:
+            for w in self.options_frame_review.winfo_children():
+                w.destroy()
 
         idx_q = self.current_question_index
         current_q = self.questions[idx_q]
         options = self.shuffled_options[idx_q]
-        explanations = current_q.get("explanation", {}) or {}
+        explanations = self._session_explanations()[idx_q] or {}
         user_selected = self.user_answers[idx_q] if self.user_answers[idx_q] is not None else []
         correct = current_q.get("answer")
         correct_set = set(correct) if isinstance(correct, list) else {correct}
 
         self.review_question_label.config(text=current_q["question"])
         self.question_counter_review.config(text=f"Question {idx_q + 1} / {len(self.questions)}")
-
+        self._update_review_refs()
+        tm = self.telemetry
+        if idx_q < len(tm.dwell):
+            self.review_telemetry_label.config(
+                text=f"Time {self._seconds_to_mmss(round(tm.dwell[idx_q]))}  ·  "
+                     f"visits {tm.visits[idx_q]}  ·  answer changes {tm.changes[idx_q]}")
+
+        blocks = []
         for i, opt in enumerate(options):
             explanation = explanations.get(opt, "")
             user_sel = (i in user_selected)
             is_correct = (opt in correct_set)
 
             if user_sel and is_correct:
-                txt, fg, font = f"[Correct ✓] {opt}", "green", ("Helvetica", 18, "bold")
+                txt, fg, font = f"[Correct ✓] {opt}", "green", F_REVIEW_SEL
             elif user_sel and not is_correct:
-                txt, fg, font = f"[Incorrect ✗] {opt}", "red", ("Helvetica", 18, "bold")
+                txt, fg, font = f"[Incorrect ✗] {opt}", "red", F_REVIEW_SEL
             elif not user_sel and is_correct:
-                txt, fg, font = f"{opt}", "green", ("Helvetica", 18)
+                txt, fg, font = f"{opt}", "green", F_REVIEW_OPT
             else:
-                txt, fg, font = f"{opt}", "red", ("Helvetica", 18)
+                txt, fg, font = f"{opt}", "red", F_REVIEW_OPT
+
+            if self.review_page is not None:
+                blocks.append(itil_render.Block(txt, font, fill=fg, align="w", pad=(10, 0)))
+                if explanation:
+                    blocks.append(itil_render.Block(explanation, F_EXPLAIN, fill="#444444", align="w",
+                                                    indent=24, pad=(0, 6)))
+                continue
 
             tk.Label(self.options_frame_review, text=txt, fg=fg, font=font)\
               .pack(anchor="w", pady=(10, 0))
 
             if explanation:
                 tk.Label(self.options_frame_review, text=explanation, fg="#444444",
-                         font=("Helvetica", 16), wraplength=WRAP_W, justify="left")\
+                         font=F_EXPLAIN, wraplength=WRAP_W, justify="left")\
                   .pack(anchor="w", padx=(24, 0), pady=(0, 6))
 
+        if self.review_page is not None:
+            # Eén canvas voor alle opties + uitleg; hoogte volgt de (gecachte) layout
+            self.review_page.render(blocks)
+            self.review_page.canvas.configure(height=self.review_page.height)
+
     # ---------------- Window helpers & errors ----------------
     def center_window_main(self, window, w, h):
         window.update_idletasks()
@@ -1329,18 +2143,14 @@ class QuizApp:
         y = (window.winfo_screenheight() // 2) - (h // 2)
         window.geometry(f"{w}x{h}+{x}+{y}")
 
-    def _unbind_local_scroll(self):
-        for attr in ("question_win", "question_canvas", "page_frame", "content", "options_frame",
-                     "review_win", "review_canvas", "review_content_frame"):
-            w = getattr(self, attr, None)
-            try:
-                if w and w.winfo_exists():
-                    w.unbind("<MouseWheel>")
-            except Exception:
-                pass
+    def shutdown_pools(self):
+        """Na de mainloop: wachtende preloads en launches vervallen; een lopende export wordt afgemaakt."""
+        self._preload_pool.shutdown(wait=False, cancel_futures=True)
+        self._launch_pool.shutdown(wait=False, cancel_futures=True)
+        self._export_pool.shutdown(wait=True)
 
     def close_question_window(self):
-        self._unbind_local_scroll()
+        self.session_active = False
         self._teardown_timer_ui()
         if hasattr(self, 'question_win') and self.question_win:
             self.question_win.destroy()
@@ -1361,9 +2171,17 @@ class QuizApp:
 # ------------------------------------------------------------
 if __name__ == "__main__":
     try:
+        itil_diag.setup_log()
+        memprof = itil_diag.MemoryProfiler() if itil_diag.flag_enabled("--memprofile", "ITIL_MEMPROFILE") else None
         root = tk.Tk()
+        if itil_diag.flag_enabled("--watchdog", "ITIL_WATCHDOG"):
+            itil_diag.install_watchdog(root)
         app = QuizApp(root)
+        if memprof:
+            memprof.attach(root, app)
         root.mainloop()
+        app.journal.flush()
+        app.shutdown_pools()
     except Exception:
         err = traceback.format_exc()
         try:
@@ -1371,7 +2189,7 @@ if __name__ == "__main__":
             messagebox.showerror("Startup error", err)
         finally:
             try:
-                (Path(resource_dir()) / "startup_error.log").write_text(err, encoding="utf-8")
+                (project_dir() / "startup_error.log").write_text(err, encoding="utf-8")
             except Exception:
                 pass
 
@@ -0,0 +1,200 @@
+"""
+Adaptieve readiness-check (CAT) op basis van itemresponstheorie.
+
+Itemparameters (2PL: discriminatie a, moeilijkheid b) worden gekalibreerd uit de
+lopende itemstatistiek van itil_items: b uit de p-waarde, a uit de
+punt-biseriële correlatie (de gebruikelijke omrekening van klassieke naar
+IRT-parameters). Vragen met te weinig pogingen krijgen a=1, b=0.
+
+Na elk antwoord wordt de vaardigheid θ geschat (EAP op een vast rooster met een
+normale prior; deelpunten tellen als fractie). De volgende vraag is de vraag met
+de meeste Fisher-informatie bij de huidige schatting. De test stopt zodra de
+kans dat θ boven de zakgrens ligt (θ waarbij de verwachte score over de hele
+pool PASS_THRESHOLD is) met de gevraagde zekerheid boven of onder de grens zit.
+
+    python itil_adaptive.py            # simulatie: gemiddeld aantal vragen en % juiste verdicts
+"""
+import math
+import random
+import re
+import sys
+
+from itil_items import ItemStats, item_key
+
+CONFIDENCE = 0.95     # stoppen als P(geslaagd) >= dit of <= 1 - dit
+MIN_ITEMS = 8
+MAX_ITEMS = 40
+MIN_CALIBRATION = 5   # pogingen voordat de statistiek van een vraag meetelt
+
+_GRID = [-4.0 + 0.1 * i for i in range(81)]
+_LANG_RE = re.compile(r"[._](ne|en)\.json$", re.IGNORECASE)
+
+
+def bank_language(name: str) -> str:
+    """'ne' of 'en' op basis van de bestandsnaam; hoofdstukbanken zijn Nederlands."""
+    m = _LANG_RE.search(name)
+    return m.group(1).lower() if m else "ne"
+
+
+def _p(a: float, b: float, theta: float) -> float:
+    return 1.0 / (1.0 + math.exp(-a * (theta - b)))
+
+
+def calibrate(stats: ItemStats, key: str) -> tuple:
+    """(a, b) voor één vraag uit de klassieke statistiek, met een zachte prior."""
+    it = stats.items.get(key)
+    if not it or it["s"][0] < MIN_CALIBRATION:
+        return 1.0, 0.0
+    a_stats = stats.analyse(key)
+    n, sx = it["s"][0], it["s"][1]
+    p = (sx + 1.0) / (n + 2.0)          # Laplace: nooit precies 0 of 1
+    r = a_stats["rpb"]
+    if r is None or r <= 0.05:
+        a = 0.3                          # onderscheidt (bijna) niet: weinig informatie
+    else:
+        r = min(r, 0.9)
+        a = max(0.3, min(2.5, 1.7 * r / math.sqrt(1.0 - r * r)))
+    b = -math.log(p / (1.0 - p)) / a
+    return a, max(-4.0, min(4.0, b))
+
+
+def build_pool(corpus, bank_paths: list, stats: ItemStats, lang: str) -> list:
+    """
+    [(corpus-index, itemsleutel, a, b)] van alle vragen in de banken van deze taal.
+    Dezelfde vraagtekst in meerdere banken telt één keer.
+    """
+    pool, seen = [], set()
+    for path in bank_paths:
+        entry = corpus.bank(path)
+        if entry is None or bank_language(entry["name"]) != lang:
+            continue
+        first = entry["first"]
+        for g in range(first, first + entry["count"]):
+            q = corpus[g]
+            text = " ".join(str(q.get("question", "")).split()).lower()
+            if not text or text in seen:
+                continue
+            seen.add(text)
+            key = item_key(entry["name"], q, g - first)
+            a, b = calibrate(stats, key)
+            pool.append((g, key, a, b))
+    return pool
+
+
+class AdaptiveTest:
+    def __init__(self, pool: list, pass_pct: float, confidence: float = CONFIDENCE,
+                 min_items: int = MIN_ITEMS, max_items: int = MAX_ITEMS, rng=random):
+        self.pool = pool
+        self.confidence = confidence
+        self.min_items = min_items
+        self.max_items = min(max_items, len(pool))
+        self.rng = rng
+        self.asked = []                  # pool-indexen in afnamevolgorde
+        self._used = set()
+        self.scores = []
+        # Log-posterior op het rooster, begint als N(0, 1)
+        self._logpost = [-0.5 * t * t for t in _GRID]
+        self.theta_cut = self._solve_cut(pass_pct / 100.0)
+
+    # ---------------- kalibratie van de grens ----------------
+    def expected_fraction(self, theta: float) -> float:
+        """Verwachte score over de hele pool bij vaardigheid theta (testkarakteristiek)."""
+        if not self.pool:
+            return 0.0
+        return sum(_p(a, b, theta) for _g, _k, a, b in self.pool) / len(self.pool)
+
+    def _solve_cut(self, frac: float) -> float:
+        lo, hi = -6.0, 6.0
+        for _ in range(50):
+            mid = (lo + hi) / 2
+            if self.expected_fraction(mid) < frac:
+                lo = mid
+            else:
+                hi = mid
+        return (lo + hi) / 2
+
+    # ---------------- schatting ----------------
+    def _posterior(self) -> list:
+        m = max(self._logpost)
+        w = [math.exp(v - m) for v in self._logpost]
+        s = sum(w)
+        return [x / s for x in w]
+
+    def theta(self) -> float:
+        return sum(t * w for t, w in zip(_GRID, self._posterior()))
+
+    def prob_pass(self) -> float:
+        return sum(w for t, w in zip(_GRID, self._posterior()) if t >= self.theta_cut)
+
+    def expected_pct(self) -> float:
+        """Geschatte score (%) op een volledige toets uit deze pool."""
+        return self.expected_fraction(self.theta()) * 100.0
+
+    # ---------------- afname ----------------
+    def next_item(self):
+        """Pool-index van de meest informatieve nog niet gestelde vraag, of None."""
+        if self.done():
+            return None
+        theta = self.theta()
+        best, best_info = [], -1.0
+        for idx, (_g, _k, a, b) in enumerate(self.pool):
+            if idx in self._used:
+                continue
+            p = _p(a, b, theta)
+            info = a * a * p * (1.0 - p)
+            if info > best_info + 1e-9:
+                best, best_info = [idx], info
+            elif abs(info - best_info) <= 1e-9:
+                best.append(idx)
+        if not best:
+            return None
+        # Gelijke informatie (bijv. ongekalibreerde vragen): willekeurig, anders zien kandidaten steeds dezelfde
+        idx = self.rng.choice(best)
+        self._used.add(idx)
+        self.asked.append(idx)
+        return idx
+
+    def record(self, idx: int, score: float):
+        """Verwerkt een antwoord (score 0..1, deelpunten als fractie)."""
+        _g, _k, a, b = self.pool[idx]
+        self.scores.append(score)
+        for i, t in enumerate(_GRID):
+            p = _p(a, b, t)
+            self._logpost[i] += score * math.log(p) + (1.0 - score) * math.log(1.0 - p)
+
+    def done(self) -> bool:
+        n = len(self.scores)
+        if n >= self.max_items or len(self._used) >= len(self.pool):
+            return True
+        if n < self.min_items:
+            return False
+        pp = self.prob_pass()
+        return pp >= self.confidence or pp <= 1.0 - self.confidence
+
+    def passed(self) -> bool:
+        return self.prob_pass() >= 0.5
+
+
+def simulate(n_candidates: int = 500, pool_size: int = 400, pass_pct: float = 65.0, seed: int = 1) -> dict:
+    """Simulatie met een willekeurige pool: gemiddeld aantal vragen en hoe vaak het verdict klopt."""
+    rng = random.Random(seed)
+    pool = [(i, str(i), rng.uniform(0.6, 2.0), rng.gauss(-0.6, 1.0)) for i in range(pool_size)]
+    lengths, correct = [], 0
+    for _ in range(n_candidates):
+        true_theta = rng.gauss(0.0, 1.0)
+        test = AdaptiveTest(pool, pass_pct, rng=rng)
+        while True:
+            idx = test.next_item()
+            if idx is None:
+                break
+            _g, _k, a, b = pool[idx]
+            test.record(idx, 1.0 if rng.random() < _p(a, b, true_theta) else 0.0)
+        lengths.append(len(test.scores))
+        correct += test.passed() == (true_theta >= test.theta_cut)
+    return {"mean_items": sum(lengths) / len(lengths), "accuracy": correct / n_candidates}
+
+
+if __name__ == "__main__":
+    res = simulate()
+    print(f"gemiddeld {res['mean_items']:.1f} vragen (max {MAX_ITEMS}), verdict juist in {res['accuracy']:.1%}")
+    sys.exit(0)
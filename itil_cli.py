@@ -0,0 +1,267 @@
+"""
+ITIL 4 trainer in de terminal, voor machines zonder display (SSH, jump hosts).
+
+Importeert geen tkinter, PIL of de Windows-DPI-code: alleen itil_core en
+itil_items. Schudden, beoordelen (deelpunten bij meerdere antwoorden), de
+examenklok en PASS_THRESHOLD zijn dezelfde als in de GUI, en de uitslag komt in
+dezelfde scoreopslag (per profiel) terecht.
+
+    python itil_cli.py                    # kies een bank uit de lijst
+    python itil_cli.py mock1_ne           # direct een bank starten
+    python itil_cli.py --list
+    python itil_cli.py toets1_1_ne --no-timer --profile Jan
+
+Tijdens de toets: 1,3 = antwoord(en) indienen, Enter/n = volgende,
+p = vorige, t = resterende tijd, s = stoppen en uitslag tonen.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from itil_core import (resource_dir, load_bank_chapter, shuffle_session, grade_answer,
+                       session_percentage, score_entry, ScoreStore, QuestionTelemetry,
+                       PASS_THRESHOLD, TIMER_START_SECS)
+
+_GROUP_ORDER = (("hoofdstuk", 0), ("toets", 1), ("mock", 2))
+
+
+def banks_dir() -> str:
+    return os.path.join(resource_dir(), "assets", "itil_vragen")
+
+
+def _sort_key(name: str):
+    group = next((order for prefix, order in _GROUP_ORDER if name.lower().startswith(prefix)), 3)
+    return (group, [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", name.lower())])
+
+
+def list_banks() -> list:
+    try:
+        names = [n for n in os.listdir(banks_dir()) if n.lower().endswith(".json")]
+    except OSError:
+        return []
+    return sorted(names, key=_sort_key)
+
+
+def resolve_bank(arg: str, names: list):
+    """Bestandsnaam bij een nummer uit de lijst, een volledige naam of een unieke naam zonder .json."""
+    if arg.isdigit() and 1 <= int(arg) <= len(names):
+        return names[int(arg) - 1]
+    low = arg.lower()
+    for n in names:
+        if n.lower() in (low, low + ".json"):
+            return n
+    hits = [n for n in names if n.lower().startswith(low)]
+    return hits[0] if len(hits) == 1 else None
+
+
+def mmss(secs: float) -> str:
+    secs = max(0, int(round(secs)))
+    return f"{secs // 60:02d}:{secs % 60:02d}"
+
+
+class ExamClock:
+    """Zelfde deadline-klok als de GUI: aftellen vanaf TIMER_START_SECS met time.monotonic()."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.deadline = time.monotonic() + TIMER_START_SECS
+        self.expired_shown = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic()) if self.enabled else float(TIMER_START_SECS)
+
+    def elapsed(self) -> float:
+        return TIMER_START_SECS - self.remaining() if self.enabled else 0.0
+
+
+class TerminalSession:
+    def __init__(self, path: str, store: ScoreStore, timer: bool = True):
+        self.path = path
+        self.store = store
+        chapter, _expl, base_options = load_bank_chapter(path)
+        self.title = chapter.get("chapter") or chapter.get("description") or os.path.basename(path)
+        self.src, self.questions, self.options = shuffle_session(chapter.get("questions", []), base_options)
+        n = len(self.questions)
+        self.user_answers = [None] * n
+        self.correct_answers = []
+        self.question_time_used = [0.0] * n
+        self.telemetry = QuestionTelemetry(n)
+        self.clock = ExamClock(timer)
+        self.index = 0
+
+    # ---------------- afname ----------------
+    def _show(self, i: int):
+        q = self.questions[i]
+        print()
+        head = f"Vraag {i + 1} / {len(self.questions)}"
+        if self.clock.enabled:
+            head += f"   [{mmss(self.clock.remaining())}]"
+        print(head)
+        print(q["question"])
+        if q.get("image"):
+            print(f"  (afbeelding: {q['image']})")
+        saved = self.user_answers[i] or []
+        for j, opt in enumerate(self.options[i], start=1):
+            mark = "x" if (j - 1) in saved else " "
+            print(f"  [{mark}] {j}. {opt}")
+        if isinstance(q.get("answer"), list):
+            print("  (meerdere antwoorden mogelijk, bijv. 1,3)")
+
+    def _submit(self, i: int, selected: list):
+        # Zelfde volgorde als QuizApp.submit_answer
+        self.user_answers[i] = selected
+        self.correct_answers.append(grade_answer(self.questions[i]["answer"], self.options[i], selected))
+
+    def _parse(self, text: str, n_opts: int):
+        try:
+            picks = sorted({int(t) - 1 for t in re.split(r"[,\s]+", text) if t})
+        except ValueError:
+            return None
+        return picks if picks and all(0 <= p < n_opts for p in picks) else None
+
+    def run(self):
+        n = len(self.questions)
+        if not n:
+            print("Deze bank bevat geen vragen.")
+            return
+        print(f"\n{self.title} ({n} vragen)")
+        shown = -1
+        while True:
+            i = self.index
+            if i != shown:
+                # Alleen een echte navigatie is een bezoek (zoals in de GUI), niet 't' of een herhaalde prompt
+                self.telemetry.show(i)
+                shown = i
+            mark = self.clock.elapsed()
+            self._show(i)
+            try:
+                cmd = input("> ").strip().lower()
+            except (EOFError, KeyboardInterrupt):
+                cmd = "s"
+                print()
+            self.question_time_used[i] += max(0.0, self.clock.elapsed() - mark)
+            if self.clock.enabled and self.clock.remaining() <= 0 and not self.clock.expired_shown:
+                print("De tijd is op.")
+                self.clock.expired_shown = True
+
+            if cmd == "s":
+                break
+            if cmd == "t":
+                print(f"Resterende tijd: {mmss(self.clock.remaining())}")
+                continue
+            if cmd == "p":
+                self.index = max(0, i - 1)
+                continue
+            if cmd in ("", "n"):
+                if i == n - 1:
+                    break
+                self.index = i + 1
+                continue
+            picks = self._parse(cmd, len(self.options[i]))
+            if picks is None:
+                print("Onbekende invoer; kies optienummers (bijv. 2 of 1,3), n, p, t of s.")
+                continue
+            if self.user_answers[i] is not None and picks != self.user_answers[i]:
+                self.telemetry.change(i)
+            self._submit(i, picks)
+            if i == n - 1:
+                break
+            self.index = i + 1
+        self.telemetry.stop()
+        self.finish()
+
+    # ---------------- uitslag ----------------
+    def finish(self):
+        total = len(self.questions)
+        # Per vraag het laatste antwoord: correct_answers krijgt bij elk opnieuw beantwoorden
+        # (na 'p') een extra score en telt dan dubbel
+        item_scores = [None if self.user_answers[i] is None else
+                       grade_answer(q.get("answer"), self.options[i], self.user_answers[i])
+                       for i, q in enumerate(self.questions)]
+        answered = [s for s in item_scores if s is not None]
+        pct = session_percentage(answered, total)
+        correct_count = sum(1 for s in answered if s == 1.0)
+        incorrect_count = sum(1 for s in answered if s == 0.0)
+        skipped_count = len(item_scores) - len(answered)
+        passed = pct >= PASS_THRESHOLD
+
+        key = os.path.basename(self.path)
+        q_keys = [str(q.get("number", i + 1)) for i, q in enumerate(self.questions)]
+        self.store.put(key, score_entry(pct, self.question_time_used, q_keys, self.telemetry, item_scores))
+        self._record_item_stats()
+
+        print()
+        print(f"Je scoorde {sum(answered):.2f} van {total}")
+        print(f"Goed: {correct_count}   Fout: {incorrect_count}   Overgeslagen: {skipped_count}")
+        print(f"Gebruikte tijd: {mmss(sum(self.question_time_used))}")
+        print(f"Score: {pct:.2f} %  {'✓ geslaagd' if passed else '✗ niet geslaagd'}")
+
+    def _record_item_stats(self):
+        from itil_items import ItemStats  # pas nodig bij de uitslag; houdt de start snel
+        stats = ItemStats.load()
+        item_scores = [grade_answer(q.get("answer"), self.options[i], self.user_answers[i])
+                       for i, q in enumerate(self.questions)]
+        stats.record_session(os.path.basename(self.path), self.questions, self.src,
+                             self.options, self.user_answers, item_scores)
+        stats.save()
+
+    def review(self):
+        for i, q in enumerate(self.questions):
+            ans = q.get("answer")
+            keys = ans if isinstance(ans, list) else [ans]
+            if grade_answer(ans, self.options[i], self.user_answers[i]) == 1.0:
+                continue
+            chosen = [self.options[i][j] for j in (self.user_answers[i] or [])]
+            print(f"\n{i + 1}. {q['question']}")
+            print(f"   jouw antwoord: {'; '.join(chosen) or '(geen)'}")
+            print(f"   juist:         {'; '.join(keys)}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="ITIL 4 trainer in de terminal (zonder GUI).")
+    ap.add_argument("bank", nargs="?", help="nummer uit --list, bestandsnaam of naam zonder .json")
+    ap.add_argument("--list", action="store_true", help="beschikbare banken tonen")
+    ap.add_argument("--no-timer", action="store_true", help="zonder examenklok")
+    ap.add_argument("--profile", default=None, help="profiel voor de scores (standaard: inlognaam)")
+    args = ap.parse_args(argv)
+
+    names = list_banks()
+    if not names:
+        print(f"Geen banken gevonden in {banks_dir()}", file=sys.stderr)
+        return 1
+    store = ScoreStore(args.profile)
+
+    if args.list or not args.bank:
+        for k, name in enumerate(names, start=1):
+            last = store.get(name)
+            badge = f"  laatste score {float(last['pct']):.1f}%" if last and "pct" in last else ""
+            print(f"{k:>3}. {name}{badge}")
+        if args.list:
+            return 0
+        try:
+            args.bank = input("Bank (nummer of naam): ").strip()
+        except (EOFError, KeyboardInterrupt):
+            return 0
+
+    name = resolve_bank(args.bank, names)
+    if name is None:
+        print(f"Onbekende of dubbelzinnige bank: {args.bank}", file=sys.stderr)
+        return 2
+    try:
+        session = TerminalSession(os.path.join(banks_dir(), name), store, timer=not args.no_timer)
+    except Exception as e:
+        print(f"Fout bij laden {name}: {e}", file=sys.stderr)
+        return 1
+    session.run()
+    try:
+        if input("\nFoute antwoorden bekijken? [j/N] ").strip().lower().startswith("j"):
+            session.review()
+    except (EOFError, KeyboardInterrupt):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
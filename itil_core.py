@@ -0,0 +1,478 @@
+"""
+Gedeelde, Tk-vrije helpers van de ITIL 4 trainer.
+
+Dit module importeert bewust geen tkinter of PIL: de hulpprogramma's (index,
+validatie, belastingstest, ...) gebruiken het ook op machines zonder display.
+Ook de sessielogica die de GUI en die hulpprogramma's delen staat hier:
+laden, schudden, beoordelen, telemetrie en de scoreopslag.
+"""
+import getpass
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+# ---- Slaaggrens voor de score (%) en examentijd; gedeeld door GUI en terminal ----
+PASS_THRESHOLD = 65.0
+TIMER_START_SECS = 60 * 60
+
+# ---- Maten van de GUI die ook itil_images nodig heeft (voorgeschaalde varianten) ----
+WRAP_W = 1000        # tekstbreedte en maximale breedte van banner/vraagafbeeldingen
+IMAGE_MAX_H = 500
+ICON_SIZE = 22       # menu-iconen
+
+# ------------------------------------------------------------
+# Pad helpers
+# ------------------------------------------------------------
+def resource_dir() -> str:
+    """Map met de (read-only) resources. Bij PyInstaller is dit _MEIPASS."""
+    if getattr(sys, "frozen", False):
+        return getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
+    return os.path.dirname(os.path.abspath(__file__))
+
+def portable_path(path: str) -> str:
+    """Pad relatief aan resource_dir (die verschilt per start van de onefile-exe); anders ongewijzigd."""
+    try:
+        rel = os.path.relpath(path, resource_dir())
+    except ValueError:
+        return path
+    return path if rel.startswith("..") else rel.replace(os.sep, "/")
+
+def project_dir() -> Path:
+    """Schrijfbare projectmap naast de .py of .exe (hier bewaren we scores)."""
+    if getattr(sys, "frozen", False):
+        return Path(os.path.dirname(sys.executable))
+    return Path(os.path.dirname(os.path.abspath(__file__)))
+
+def score_file_path() -> Path:
+    """<project>/assets/score/scores.json: het oude, gedeelde scorebestand (zie ScoreStore)."""
+    base = project_dir() / "assets" / "score"
+    base.mkdir(parents=True, exist_ok=True)
+    return base / "scores.json"
+
+def cache_dir() -> Path:
+    """Schrijfbare cachemap <project>/assets/cache (mag altijd weggegooid worden)."""
+    base = project_dir() / "assets" / "cache"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8"):
+    """Schrijf veilig naar bestand (voorkomt 0 kB bij crash)."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding=encoding)
+    os.replace(tmp, path)
+
+def item_stats_path() -> Path:
+    """Itemanalyse (lopende statistieken per vraag), naast de scores."""
+    return score_file_path().with_name("item_stats.json")
+
+# ------------------------------------------------------------
+# Bestandshashes
+# ------------------------------------------------------------
+def file_sha1(path) -> str:
+    """SHA-1 van de inhoud, in blokken gelezen (ook voor grote PDF's)."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class HashMemo:
+    """
+    Onthoudt {pad: [size, mtime_ns, sha1]} in assets/cache/<name>, zodat bestanden
+    die niet veranderd zijn niet bij elke start opnieuw gehasht worden. Bundelbestanden
+    staan erin relatief aan resource_dir, anders mist de onefile-exe elke keer.
+    """
+
+    def __init__(self, name: str):
+        self.path = cache_dir() / name
+        try:
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            self.data = {}
+        self.dirty = False
+
+    def sha1(self, path: str) -> str:
+        st = os.stat(path)
+        key = portable_path(path)
+        hit = self.data.get(key)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        digest = file_sha1(path)
+        self.data[key] = [st.st_size, st.st_mtime_ns, digest]
+        self.dirty = True
+        return digest
+
+    def save(self):
+        if self.dirty:
+            try:
+                atomic_write_text(self.path, json.dumps(self.data, indent=1))
+            except OSError:
+                pass
+            self.dirty = False
+
+# ------------------------------------------------------------
+# Beoordelen
+# ------------------------------------------------------------
+def grade_answer(answer, options: list, selected) -> float:
+    """
+    Score 0..1 voor een gekozen set optie-indexen. Lijst-antwoorden krijgen
+    deelpunten (aandeel goede opties dat is aangevinkt), enkelvoudige antwoorden
+    tellen alleen als precies die ene optie gekozen is.
+    """
+    selected = selected or []
+    if isinstance(answer, list):
+        correct_indices = [options.index(a) for a in answer if a in options]
+        if not correct_indices:
+            return 0.0
+        return len(set(correct_indices).intersection(selected)) / len(correct_indices)
+    try:
+        return 1.0 if list(selected) == [options.index(answer)] else 0.0
+    except ValueError:
+        return 0.0
+
+# ------------------------------------------------------------
+# Banken laden en sessies schudden
+# ------------------------------------------------------------
+def normalized_options(questions: list) -> list:
+    """Opties per vraag, aangevuld met antwoorden die (ten onrechte) niet in options staan."""
+    result = []
+    for q in questions:
+        opts = list(q.get("options", []))
+        ans = q.get("answer")
+        if isinstance(ans, list):
+            for a in ans:
+                if a not in opts:
+                    opts.append(a)
+        else:
+            if ans not in opts:
+                opts.append(ans)
+        result.append(opts)
+    return result
+
+def _interned(q: dict) -> dict:
+    """
+    De vraag met gedeelde strings (sys.intern) voor de sleutels, opties en
+    antwoorden. Opties als "Service desk" of "4" staan in honderden vragen over alle
+    banken; json.loads per corpus-record maakt zelfs elke sleutel opnieuw aan.
+    """
+    q = {sys.intern(k): v for k, v in q.items()}
+    opts = q.get("options")
+    if isinstance(opts, list):
+        q["options"] = [sys.intern(o) if isinstance(o, str) else o for o in opts]
+    ans = q.get("answer")
+    if isinstance(ans, str):
+        q["answer"] = sys.intern(ans)
+    elif isinstance(ans, list):
+        q["answer"] = [sys.intern(a) if isinstance(a, str) else a for a in ans]
+    return q
+
+def load_bank_chapter(filepath: str, corpus=None, intern: bool = True):
+    """
+    (hoofdstuk-dict, uitlegbron, opties per vraag) van een bank, zonder uitleg in
+    de vragen. Uit het corpus (itil_corpus.Corpus) wordt alleen deze bank
+    gedecodeerd, mits de JSON niet nieuwer is; anders uit de JSON. Met intern
+    delen alle geladen banken (preloads, kandidaten in de belastingstest) één
+    kopie van elke optie- en antwoordtekst.
+    """
+    entry = corpus.fresh_bank(filepath) if corpus else None
+    if entry is not None:
+        chapter = {"chapter": entry.get("chapter"), "description": entry.get("description"),
+                   "questions": corpus.bank_questions(entry)}
+        expl_source = ("corpus", entry["first"])
+    else:
+        with open(filepath, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        chapter = data["chapters"][0]
+        for q in chapter.get("questions", []):
+            q.pop("explanation", None)
+        expl_source = ("json", filepath)
+    if intern:
+        chapter["questions"] = [_interned(q) for q in chapter.get("questions", [])]
+    return chapter, expl_source, normalized_options(chapter.get("questions", []))
+
+def shuffle_session(bank_questions: list, base_options: list, rng=random):
+    """
+    (src, vragen, opties) voor een nieuwe sessie: src[i] is de positie in de bank
+    van sessievraag i, opties zijn per vraag opnieuw geschud.
+    """
+    src = list(range(len(bank_questions)))
+    rng.shuffle(src)
+    questions = [bank_questions[pos] for pos in src]
+    options = []
+    for pos in src:
+        opts = list(base_options[pos])
+        rng.shuffle(opts)
+        options.append(opts)
+    return src, questions, options
+
+def option_order(base: list, shuffled: list) -> list:
+    """Indexen in base waarmee shuffled weer op te bouwen is (ook bij dubbele opties)."""
+    used, order = set(), []
+    for opt in shuffled:
+        k = next(k for k, b in enumerate(base) if b == opt and k not in used)
+        used.add(k)
+        order.append(k)
+    return order
+
+def restore_session(bank_questions: list, base_options: list, src: list, orders: list):
+    """Omgekeerde van shuffle_session: (vragen, opties) uit src en optievolgordes; ValueError als ze niet passen."""
+    try:
+        questions = [bank_questions[pos] for pos in src]
+        options = [[base_options[pos][k] for k in order] for pos, order in zip(src, orders)]
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"sessie past niet bij de bank: {e}") from None
+    if len(options) != len(questions):
+        raise ValueError("sessie past niet bij de bank")
+    return questions, options
+
+def session_percentage(correct_answers: list, total: int) -> float:
+    return (sum(correct_answers) / total * 100) if total > 0 else 0
+
+# ------------------------------------------------------------
+# Telemetrie per vraag (kijktijd, bezoeken, antwoordwijzigingen)
+# ------------------------------------------------------------
+class QuestionTelemetry:
+    """
+    Alle tellers zitten in vooraf gealloceerde arrays. Een navigatie kost één
+    time.monotonic() en een paar indexbewerkingen; er wordt niets gealloceerd op het
+    navigatiepad.
+    """
+
+    def __init__(self, n_questions: int):
+        self.dwell   = array("d", [0.0]) * n_questions
+        self.visits  = array("I", [0]) * n_questions
+        self.changes = array("I", [0]) * n_questions
+        self._cur = -1
+        self._since = 0.0
+
+    def show(self, idx: int):
+        now = time.monotonic()
+        cur = self._cur
+        if cur >= 0:
+            self.dwell[cur] += now - self._since
+        self._cur = idx
+        self._since = now
+        if idx >= 0:
+            self.visits[idx] += 1
+
+    def change(self, idx: int):
+        self.changes[idx] += 1
+
+    def stop(self):
+        self.show(-1)
+
+    def slowest(self, k: int = 3):
+        return sorted(range(len(self.dwell)), key=lambda i: self.dwell[i], reverse=True)[:k]
+
+    def summary(self, keys) -> dict:
+        """{sleutel: [kijktijd_s, bezoeken, wijzigingen]} voor opslag bij het sessieresultaat."""
+        return {key: [round(self.dwell[i], 1), self.visits[i], self.changes[i]]
+                for i, key in enumerate(keys) if i < len(self.dwell)}
+
+# ------------------------------------------------------------
+# Scores
+# ------------------------------------------------------------
+def score_entry(pct: float, question_time_used: list, q_keys: list, telemetry: QuestionTelemetry,
+                item_scores: list = None) -> dict:
+    """
+    Het resultaat van één sessie zoals het in scores.json staat. item_scores
+    (0..1 per vraag, None = niet beantwoord) komt erbij als question_score.
+    """
+    per_question = {}
+    for i, q_key in enumerate(q_keys):
+        if i < len(question_time_used):
+            per_question[q_key] = round(question_time_used[i], 1)
+    entry = {
+        "pct": round(pct, 2),
+        "time_used": round(sum(question_time_used), 1),
+        "question_time": per_question,
+        "telemetry": telemetry.summary(q_keys),
+    }
+    if item_scores is not None:
+        entry["question_score"] = {q_key: (None if s is None else round(s, 3))
+                                   for q_key, s in zip(q_keys, item_scores)}
+    return entry
+
+def default_profile() -> str:
+    """Profiel uit --profile NAAM, ITIL_PROFILE of de inlognaam van het OS."""
+    argv = sys.argv[1:]
+    if "--profile" in argv and argv.index("--profile") + 1 < len(argv):
+        name = argv[argv.index("--profile") + 1]
+    else:
+        name = os.environ.get("ITIL_PROFILE")
+        if not name:
+            try:
+                name = getpass.getuser()
+            except Exception:
+                name = "standaard"
+    return name
+
+def profile_filename(profile: str) -> str:
+    """Bestandsnaam-veilige versie van een profielnaam (ook op netwerkshares)."""
+    safe = re.sub(r"[^\w.-]+", "_", profile.strip(), flags=re.UNICODE).strip("._")
+    return (safe or "standaard")[:64].lower()
+
+def profiles_dir() -> Path:
+    """<project>/assets/score/profiles: één scorebestand (shard) per profiel."""
+    base = score_file_path().parent / "profiles"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+def list_profiles(base_dir: Path = None) -> list:
+    base_dir = base_dir or profiles_dir()
+    return sorted(p.stem for p in base_dir.glob("*.json"))
+
+class FileLock:
+    """
+    Lock via een .lock-bestand dat met O_EXCL wordt aangemaakt; werkt ook op
+    netwerkshares waar fcntl/msvcrt-locks onbetrouwbaar zijn. Een lock die ouder is
+    dan STALE_S (gecrashte schrijver) wordt overgenomen; STALE_S ligt onder de
+    timeout, zodat wachten op een dode lock niet in een TimeoutError eindigt. Het
+    bestand bevat een eigen token: een schrijver wiens lock intussen is overgenomen
+    verwijdert bij het vrijgeven niet de lock van de nieuwe houder.
+    """
+    STALE_S = 3.0
+
+    def __init__(self, path: Path, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self.token = f"{os.getpid()}:{os.urandom(8).hex()}"
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, self.token.encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > self.STALE_S:
+                        self.path.unlink()
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"lock bezet: {self.path}")
+                time.sleep(0.02)
+
+    def __exit__(self, *exc):
+        try:
+            if self.path.read_text(encoding="utf-8") == self.token:
+                self.path.unlink()
+        except OSError:
+            pass
+
+class ScoreStore:
+    """
+    Laatste resultaat per bank ({bestandsnaam: entry}) van één profiel, in
+    assets/score/profiles/<profiel>.json. Alleen de eigen shard wordt geladen, dus
+    een opzoeking blijft een dict-lookup, ook met honderden profielen.
+
+    Schrijven gebeurt onder een bestandslock als merge: de shard wordt opnieuw
+    gelezen, alleen de banken die dit proces zelf heeft bijgewerkt worden erin
+    gezet en het geheel wordt atomair weggeschreven. Twee app-instanties met
+    hetzelfde profiel verliezen zo elkaars resultaten niet.
+    """
+
+    def __init__(self, profile: str = None, base_dir: Path = None):
+        self.profile = profile or default_profile()
+        self.base_dir = base_dir or profiles_dir()
+        self.path = self.base_dir / f"{profile_filename(self.profile)}.json"
+        # Alle pogingen, append-only (de shard houdt alleen de laatste per bank); zie itil_export
+        self.history_path = self.base_dir / f"{profile_filename(self.profile)}.history.jsonl"
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._sig = None
+        self.data = {}
+        self._migrate_legacy()
+        self.refresh()
+
+    def _migrate_legacy(self):
+        """Het oude gedeelde scores.json wordt de shard van het eerste profiel dat gebruikt wordt."""
+        legacy = self.base_dir.parent / "scores.json"
+        if self.path.exists() or not legacy.exists() or list_profiles(self.base_dir):
+            return
+        try:
+            with FileLock(self.path.with_suffix(".lock")):
+                if not self.path.exists():
+                    atomic_write_text(self.path, legacy.read_text(encoding="utf-8"))
+        except (OSError, TimeoutError):
+            pass
+
+    def _stat_sig(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _read(self) -> dict:
+        try:
+            if self.path.exists() and self.path.stat().st_size > 0:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+        return {}
+
+    def refresh(self) -> set:
+        """Leest de shard opnieuw als een ander proces hem gewijzigd heeft; geeft de gewijzigde banken."""
+        sig = self._stat_sig()
+        if sig == self._sig:
+            return set()
+        disk = self._read()
+        with self._lock:
+            disk.update(self._pending)
+            changed = {k for k in disk.keys() | self.data.keys() if disk.get(k) != self.data.get(k)}
+            # In place bijwerken: de app houdt een verwijzing naar self.data vast
+            self.data.clear()
+            self.data.update(disk)
+            self._sig = sig
+        return changed
+
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+
+    def put(self, key: str, entry: dict):
+        with self._lock:
+            self.data[key] = entry
+            self._pending[key] = entry
+        self.save()
+        self._append_history(key, entry)
+
+    def _append_history(self, key: str, entry: dict):
+        rec = {"profile": self.profile, "bank": key,
+               "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), **entry}
+        line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            # Eén write op een O_APPEND-bestand: regels van andere instanties lopen niet door elkaar
+            fd = os.open(self.history_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def save(self):
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                with FileLock(self.path.with_suffix(".lock")):
+                    merged = self._read()
+                    merged.update(self._pending)
+                    atomic_write_text(self.path, json.dumps(merged, ensure_ascii=False, indent=2))
+                    self._sig = self._stat_sig()
+                self._pending.clear()
+                self.data.update(merged)  # meteen ook wat andere instanties schreven
+            except Exception:
+                pass  # pending blijft staan; de volgende save probeert het opnieuw
@@ -0,0 +1,305 @@
+"""
+Gecompileerd, read-only vragencorpus dat met mmap geopend wordt.
+
+Layout (little-endian):
+
+    header (64 bytes)   magic "ITILCORP", versie, aantallen en offsets
+    vraag-records       elke vraag (zonder explanation) als compacte UTF-8 JSON
+    uitleg-records      de explanation-mapping per vraag, apart (leeg = geen uitleg)
+    offset-tabel        (n + 1) x u64: begin van vraag-record i; record i = [off[i], off[i+1])
+    uitleg-tabel        (n + 1) x u64: idem voor de uitleg-records
+    bank-tabel          UTF-8 JSON: [{"name", "first", "count", "size", "mtime", "sha1", ...}]
+
+Een vraag wordt pas gedecodeerd als hij nodig is (corpus[i]); van een bank worden
+alleen de eigen records gelezen, en de uitleg pas als de review erom vraagt
+(corpus.explanation(i)). Omdat het bestand read-only gemapt wordt, delen
+meerdere app-instanties op dezelfde machine de page cache.
+
+    python itil_corpus.py build [--out pad.itc] [map of banken ...]
+    python itil_corpus.py info [pad.itc]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+from itil_core import resource_dir, cache_dir, file_sha1
+
+MAGIC = b"ITILCORP"
+VERSION = 2
+CORPUS_NAME = "corpus.itc"
+
+# magic, versie, flags, n_questions, n_banks, offsets_off, expl_offsets_off, banks_off, banks_len
+_HEADER = struct.Struct("<8sHHIIQQQQ")
+HEADER_SIZE = 64
+
+log = logging.getLogger("itil.corpus")
+
+
+class CorpusError(Exception):
+    pass
+
+
+def default_corpus_path() -> Path:
+    """ITIL_CORPUS overschrijft; anders de cache, daarna een met de exe meegebundeld corpus."""
+    env = os.environ.get("ITIL_CORPUS")
+    if env:
+        return Path(env)
+    for cand in (cache_dir() / CORPUS_NAME, Path(resource_dir()) / "assets" / "cache" / CORPUS_NAME):
+        if cand.exists():
+            return cand
+    return cache_dir() / CORPUS_NAME
+
+
+# ------------------------------------------------------------
+# Schrijven
+# ------------------------------------------------------------
+def build_corpus(bank_paths: list, out_path) -> dict:
+    """Compileert banken naar één corpus; banken worden één voor één geladen."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # Per proces een eigen tmp: twee instanties kunnen tegelijk hetzelfde corpus bouwen
+    tmp = out_path.with_suffix(f"{out_path.suffix}.{os.getpid()}.tmp")
+    offsets, expl_offsets, banks = [], [], []
+    with open(tmp, "wb") as out, tempfile.TemporaryFile() as expl_out:
+        out.write(b"\0" * HEADER_SIZE)
+        for path in bank_paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                chapter = data["chapters"][0]
+                questions = chapter.get("questions", [])
+            except Exception as e:
+                log.warning("%s overgeslagen: %s", path, e)
+                continue
+            st = os.stat(path)
+            banks.append({
+                "name": os.path.basename(path),
+                "first": len(offsets),
+                "count": len(questions),
+                "chapter": chapter.get("chapter"),
+                "description": chapter.get("description"),
+                "size": st.st_size,
+                "mtime": st.st_mtime_ns,
+                "sha1": file_sha1(path),
+            })
+            for q in questions:
+                expl = q.pop("explanation", None)
+                offsets.append(out.tell())
+                out.write(json.dumps(q, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                expl_offsets.append(expl_out.tell())
+                if expl:
+                    expl_out.write(json.dumps(expl, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        offsets.append(out.tell())
+        expl_offsets.append(expl_out.tell())
+
+        # Uitleg-records achter de vraag-records plakken en hun offsets verschuiven
+        expl_base = out.tell()
+        expl_out.seek(0)
+        shutil.copyfileobj(expl_out, out)
+
+        offsets_off = out.tell()
+        out.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        expl_offsets_off = out.tell()
+        out.write(struct.pack(f"<{len(expl_offsets)}Q", *(expl_base + o for o in expl_offsets)))
+        banks_off = out.tell()
+        blob = json.dumps(banks, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        out.write(blob)
+
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, VERSION, 0, len(offsets) - 1, len(banks),
+                               offsets_off, expl_offsets_off, banks_off, len(blob)))
+    os.replace(tmp, out_path)
+    return {"questions": len(offsets) - 1, "banks": len(banks), "bytes": out_path.stat().st_size}
+
+
+# ------------------------------------------------------------
+# Lezen
+# ------------------------------------------------------------
+class Corpus:
+    def __init__(self, path):
+        self.path = str(path)
+        self._f = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # leeg bestand
+            self._f.close()
+            raise CorpusError(f"{self.path}: leeg bestand")
+        try:
+            magic, version, _flags, n, n_banks, offsets_off, expl_offsets_off, banks_off, banks_len = \
+                _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self.close()
+            raise CorpusError(f"{self.path}: header te kort")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise CorpusError(f"{self.path}: geen corpus v{VERSION}")
+        self._n = n
+        self._offsets = self._table(offsets_off)
+        self._expl_offsets = self._table(expl_offsets_off)
+        self.banks = json.loads(self._mm[banks_off:banks_off + banks_len].decode("utf-8"))
+        self._by_name = {b["name"].lower(): b for b in self.banks}
+
+    def _table(self, off: int):
+        view = memoryview(self._mm)[off:off + 8 * (self._n + 1)]
+        # Zero-copy offset-tabel; op big-endian machines een (kleine) kopie
+        if sys.byteorder == "little":
+            return view.cast("Q")
+        table = struct.unpack(f"<{self._n + 1}Q", view)
+        view.release()
+        return table
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return json.loads(self._mm[self._offsets[i]:self._offsets[i + 1]])
+
+    def explanation(self, i: int) -> dict:
+        """Uitleg {optie: tekst} van vraag i; wordt pas nu gedecodeerd."""
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        a, b = self._expl_offsets[i], self._expl_offsets[i + 1]
+        return json.loads(self._mm[a:b]) if b > a else {}
+
+    def bank(self, name: str):
+        return self._by_name.get(os.path.basename(name).lower())
+
+    def fresh_bank(self, path: str):
+        """Bank-entry als het JSON-bestand sinds het compileren niet veranderd is, anders None."""
+        entry = self.bank(path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry["size"]:
+            return None
+        if st.st_mtime_ns != entry["mtime"] and file_sha1(path) != entry["sha1"]:
+            return None
+        return entry
+
+    def bank_questions(self, entry: dict) -> list:
+        first = entry["first"]
+        return [self[i] for i in range(first, first + entry["count"])]
+
+    def close(self):
+        for attr in ("_offsets", "_expl_offsets"):
+            off = getattr(self, attr, None)
+            if isinstance(off, memoryview):
+                off.release()
+            setattr(self, attr, ())
+        try:
+            self._mm.close()
+        except (AttributeError, BufferError):
+            pass
+        self._f.close()
+
+
+def open_default():
+    """Opent het standaardcorpus, of None als er (nog) geen geldig corpus is."""
+    path = default_corpus_path()
+    if not path.exists():
+        return None
+    try:
+        return Corpus(path)
+    except (OSError, CorpusError) as e:
+        log.warning("%s", e)  # dan gewoon uit de JSON
+        return None
+
+
+def _banks_signature(bank_paths: list) -> str:
+    h = hashlib.sha1()
+    for path in bank_paths:
+        try:
+            st = os.stat(path)
+            h.update(f"{os.path.basename(path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+        except OSError:
+            h.update(f"{os.path.basename(path)}\0-\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def ensure_fresh(corpus, bank_paths: list):
+    """
+    Corpus waarin al deze banken actueel zijn: het gegeven corpus, of anders een
+    corpus-<hash>.itc in de cache (hash over naam, grootte en mtime van de banken)
+    dat zo nodig eerst gebouwd wordt. Het gegeven corpus wordt niet gesloten en het
+    gedeelde corpus.itc niet overschreven: preloads, de uitleg van een lopende
+    sessie en andere instanties lezen er nog uit (en Windows kan een gemapt bestand
+    niet vervangen). Oudere corpus-<hash>.itc worden opgeruimd voor zover dat kan.
+    """
+    if corpus is not None and all(corpus.fresh_bank(p) for p in bank_paths):
+        return corpus
+    base = cache_dir()
+    out = base / f"corpus-{_banks_signature(bank_paths)}.itc"
+    fresh = None
+    if out.exists():
+        try:
+            fresh = Corpus(out)  # bijv. door een andere instantie al gebouwd
+        except (OSError, CorpusError):
+            fresh = None
+        if fresh is not None and not all(fresh.fresh_bank(p) for p in bank_paths):
+            fresh.close()
+            fresh = None
+    if fresh is None:
+        build_corpus(bank_paths, out)
+        fresh = Corpus(out)
+    for old in base.glob("corpus-*.itc"):
+        if old != out and (corpus is None or str(old) != corpus.path):
+            try:
+                old.unlink()
+            except OSError:
+                pass  # nog gemapt door een andere instantie (Windows): volgende keer
+    return fresh
+
+
+def _bank_paths(args: list) -> list:
+    if not args:
+        args = [os.path.join(resource_dir(), "assets", "itil_vragen")]
+    paths = []
+    for a in args:
+        if os.path.isdir(a):
+            paths.extend(sorted(os.path.join(a, n) for n in os.listdir(a) if n.lower().endswith(".json")))
+        else:
+            paths.append(a)
+    return paths
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compileer of inspecteer een vragencorpus (.itc).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="banken compileren tot één corpus")
+    b.add_argument("sources", nargs="*", help="mappen of banken (standaard: assets/itil_vragen)")
+    b.add_argument("--out", default=None, help=f"uitvoer (standaard: assets/cache/{CORPUS_NAME})")
+    i = sub.add_parser("info", help="inhoud van een corpus tonen")
+    i.add_argument("path", nargs="?", default=None)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        out = args.out or (cache_dir() / CORPUS_NAME)
+        stats = build_corpus(_bank_paths(args.sources), out)
+        print(f"{out}: {stats['banks']} banken, {stats['questions']} vragen, {stats['bytes']} bytes")
+        return 0
+
+    corpus = Corpus(args.path or default_corpus_path())
+    print(f"{corpus.path}: {len(corpus)} vragen in {len(corpus.banks)} banken")
+    for entry in corpus.banks:
+        print(f"  {entry['name']}: {entry['count']} vragen (vanaf #{entry['first']})")
+    corpus.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Diagnose van de GUI (opt-in), voor "de app hangt soms" op trainings-pc's.
+
+Watchdog: meet de vertraging van de Tk-event-loop met een heartbeat en timet elke
+callback die Tk aanroept (command=, bind, after). Callbacks die de loop langer dan
+de drempel blokkeren worden met naam en duur gelogd; blijft de loop helemaal
+hangen, dan logt een aparte thread de stack van de hoofdthread terwijl het
+gebeurt. Log: itil.log (roterend, de app-log) naast de exe of itil.py.
+
+Geheugen: met tracemalloc aan schrijft Ctrl-Shift-M een rapport naar
+memory_report.txt (zelfde map, blijft ook na het afsluiten staan): de grootste
+allocatieplekken, het verschil met het vorige rapport, levende Tk-widgets per
+klasse, Tk-images en de caches van de app (info_images, _icon_cache, geladen
+vragen, ...).
+
+Aanzetten met:
+    python itil.py --watchdog          (of omgevingsvariabele ITIL_WATCHDOG=1)
+    ITIL_WATCHDOG_MS=100               drempel in ms (standaard 200)
+    python itil.py --memprofile        (of ITIL_MEMPROFILE=1)
+"""
+import functools
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import tkinter as tk
+from collections import Counter
+from tkinter import messagebox
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from itil_core import project_dir
+
+APP_LOG = "itil.log"
+MEMORY_REPORT = "memory_report.txt"
+TRACE_FRAMES = 10
+TOP_N = 25
+HEARTBEAT_MS = 100
+DEFAULT_THRESHOLD_MS = 200
+STALL_CHECK_S = 0.25
+
+log = logging.getLogger("itil.watchdog")
+
+
+def diag_dir() -> Path:
+    """Schrijfbare map naast de exe of itil.py; _MEIPASS van de onefile-exe verdwijnt bij het afsluiten."""
+    return project_dir()
+
+
+def flag_enabled(flag: str, env: str) -> bool:
+    return flag in sys.argv[1:] or os.environ.get(env, "").strip() not in ("", "0")
+
+
+def _callback_name(func) -> str:
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None)
+    if name is None:
+        return repr(func)
+    mod = getattr(func, "__module__", None)
+    return f"{mod}.{name}" if mod and mod != "__main__" else name
+
+
+class Watchdog:
+    def __init__(self, root: tk.Misc, threshold_ms: float = DEFAULT_THRESHOLD_MS):
+        self.root = root
+        self.threshold = threshold_ms / 1000.0
+        self.current = None           # naam van de callback die nu loopt
+        self.current_since = 0.0
+        self._beat = time.monotonic()
+        self._stall_reported = False
+        self._main_ident = threading.get_ident()
+        self._orig_register = None
+        self._orig_after = None
+
+    # ---------------- callbacks timen ----------------
+    def _wrap(self, func, name: str = None):
+        name = name or _callback_name(func)
+        wd = self
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            outer, outer_since = wd.current, wd.current_since
+            wd.current, wd.current_since = name, time.monotonic()
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                dt = time.perf_counter() - t0
+                wd.current, wd.current_since = outer, outer_since
+                if dt >= wd.threshold:
+                    log.warning("callback %s blokkeerde de event-loop %.0f ms", name, dt * 1000)
+        timed._itil_timed = True
+        return timed
+
+    def install(self):
+        """Vervangt tk.Misc._register/after zodat alle callbacks (ook van later gemaakte widgets) getimed worden."""
+        wd = self
+        self._orig_register = orig_register = tk.Misc._register
+        self._orig_after = orig_after = tk.Misc.after
+
+        def _register(misc, func, subst=None, needcleanup=1):
+            # after() registreert zijn eigen callit-wrapper; die is al via after getimed
+            is_callit = getattr(func, "__qualname__", "").endswith("after.<locals>.callit")
+            if not is_callit and not getattr(func, "_itil_timed", False):
+                func = wd._wrap(func)
+            return orig_register(misc, func, subst, needcleanup)
+
+        def after(misc, ms, func=None, *args):
+            if func is not None and not getattr(func, "_itil_timed", False):
+                func = wd._wrap(func)
+            return orig_after(misc, ms, func, *args)
+
+        tk.Misc._register = _register
+        tk.Misc.after = after
+        self.root.after(HEARTBEAT_MS, self._heartbeat)
+        threading.Thread(target=self._stall_monitor, name="watchdog", daemon=True).start()
+        log.info("watchdog actief, drempel %.0f ms", self.threshold * 1000)
+
+    # ---------------- heartbeat ----------------
+    def _heartbeat(self):
+        now = time.monotonic()
+        lag = now - self._beat - HEARTBEAT_MS / 1000.0
+        if lag >= self.threshold:
+            log.warning("event-loop vertraging %.0f ms", lag * 1000)
+        self._beat = now
+        self._stall_reported = False
+        self._orig_after(self.root, HEARTBEAT_MS, self._heartbeat)
+
+    def _stall_monitor(self):
+        """Logt een lopende blokkade al tijdens het hangen, met de stack van de hoofdthread."""
+        while True:
+            time.sleep(STALL_CHECK_S)
+            stalled = time.monotonic() - self._beat - HEARTBEAT_MS / 1000.0
+            if stalled < max(self.threshold, 1.0) or self._stall_reported:
+                continue
+            self._stall_reported = True
+            frame = sys._current_frames().get(self._main_ident)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(geen stack)"
+            log.error("event-loop hangt al %.1f s in %s\n%s", stalled, self.current or "(onbekend)", stack)
+
+
+def setup_log(name: str = APP_LOG) -> Path:
+    """
+    Eén log voor de hele app, op de logger "itil": de watchdog en de meldingen van
+    de Tk-vrije modules (itil.corpus, itil.journal, ...). Het bestand ontstaat pas
+    bij de eerste melding. Zonder setup_log (de hulpprogramma's) gaan waarschuwingen
+    gewoon naar stderr.
+    """
+    path = diag_dir() / name
+    app_log = logging.getLogger("itil")
+    if not app_log.handlers:
+        handler = RotatingFileHandler(path, maxBytes=1 << 20, backupCount=3, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        app_log.addHandler(handler)
+        app_log.setLevel(logging.INFO)
+    return path
+
+
+def install_watchdog(root: tk.Misc) -> Watchdog:
+    """Zet de watchdog aan; moet vóór het bouwen van de app, zodat ook de eerste callbacks getimed worden."""
+    setup_log()
+    try:
+        threshold = float(os.environ.get("ITIL_WATCHDOG_MS", DEFAULT_THRESHOLD_MS))
+    except ValueError:
+        threshold = DEFAULT_THRESHOLD_MS
+    wd = Watchdog(root, threshold)
+    wd.install()
+    return wd
+
+
+# ------------------------------------------------------------
+# Geheugenrapport (tracemalloc)
+# ------------------------------------------------------------
+def _walk_widgets(widget):
+    yield widget
+    for child in widget.winfo_children():
+        yield from _walk_widgets(child)
+
+
+class MemoryProfiler:
+    """
+    Start tracemalloc direct (vóór Tk en de app), zodat ook de opstart meetelt. Het
+    rapport komt in diag_dir(), naast de exe: niet in _MEIPASS van de onefile-build.
+    """
+
+    def __init__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self.root = None
+        self.app = None
+        self.previous = None
+        self.count = 0
+        self.path = diag_dir() / MEMORY_REPORT
+
+    def attach(self, root: tk.Tk, app):
+        self.root, self.app = root, app
+        root.bind_all("<Control-M>", lambda e: self.dump_and_tell())
+
+    def dump_and_tell(self):
+        try:
+            self.dump()
+            messagebox.showinfo("Geheugen", f"Rapport #{self.count} geschreven naar:\n{self.path}")
+        except Exception as e:
+            messagebox.showerror("Geheugen", f"Rapport mislukt: {e}")
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def _tk_section(self) -> list:
+        lines = []
+        widgets = Counter(type(w).__name__ for w in _walk_widgets(self.root))
+        lines.append(f"Levende widgets: {sum(widgets.values())}")
+        lines += [f"  {n:>6}  {cls}" for cls, n in widgets.most_common()]
+
+        names = self.root.tk.splitlist(self.root.tk.call("image", "names"))
+        kinds = Counter(self.root.tk.call("image", "type", n) for n in names)
+        lines.append(f"Tk-images: {len(names)} ({', '.join(f'{k} {v}' for k, v in kinds.items()) or '-'})")
+
+        # Python-objecten die Tk-dingen vasthouden terwijl Tk ze al kwijt is
+        dead_tops = photo = pil_photo = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, tk.Toplevel):
+                try:
+                    if not obj.winfo_exists():
+                        dead_tops += 1
+                except tk.TclError:
+                    dead_tops += 1
+            elif isinstance(obj, tk.PhotoImage):
+                photo += 1
+            elif type(obj).__name__ == "PhotoImage" and type(obj).__module__ == "PIL.ImageTk":
+                pil_photo += 1
+        lines.append(f"PhotoImage-objecten: tk {photo}, PIL {pil_photo}; "
+                     f"vernietigde maar nog gerefereerde Toplevels: {dead_tops}")
+        return lines
+
+    def _app_section(self) -> list:
+        app = self.app
+        if app is None:
+            return []
+        label = getattr(app, "image_label", None)
+
+        def size(name):
+            v = getattr(app, name, None)
+            return len(v) if v is not None and hasattr(v, "__len__") else "-"
+        return [
+            "App:",
+            f"  info_images          {size('info_images')}",
+            f"  _icon_cache          {size('_icon_cache')}",
+            f"  image_label.image    {'ja' if label is not None and getattr(label, 'image', None) else 'nee'}",
+            f"  _dropdown_cache      {size('_dropdown_cache')}",
+            f"  _preloads            {size('_preloads')}",
+            f"  _bank_counts         {size('_bank_counts')}",
+            f"  questions            {size('questions')}",
+            f"  corpus               {'open' if getattr(app, 'corpus', None) else '-'}",
+        ]
+
+    def dump(self) -> str:
+        gc.collect()
+        snap = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        self.count += 1
+        lines = [
+            "=" * 78,
+            f"Geheugenrapport #{self.count}  {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"tracemalloc: {current / 1024:.0f} KiB nu, piek {peak / 1024:.0f} KiB",
+        ]
+        if self.root is not None:
+            lines += self._tk_section()
+        lines += self._app_section()
+
+        lines.append(f"Top {TOP_N} allocatieplekken:")
+        for stat in snap.statistics("lineno")[:TOP_N]:
+            lines.append(f"  {stat.size / 1024:>9.1f} KiB {stat.count:>8}x  {stat.traceback[0]}")
+        if self.previous is not None:
+            lines.append(f"Verschil met rapport #{self.count - 1} (top {TOP_N}):")
+            for stat in snap.compare_to(self.previous, "lineno")[:TOP_N]:
+                lines.append(f"  {stat.size_diff / 1024:>+9.1f} KiB {stat.count_diff:>+8}x  {stat.traceback[0]}")
+        self.previous = snap
+
+        text = "\n".join(lines) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+        return text
@@ -0,0 +1,219 @@
+"""
+Export van alle opgeslagen resultaten naar CSV, JSONL of Parquet.
+
+Bron per profiel in assets/score/profiles: de pogingengeschiedenis
+(<profiel>.history.jsonl, één regel per afgeronde sessie) en voor banken die daar
+nog niet in staan het laatste resultaat uit de shard (<profiel>.json, bron
+"laatste"). Alles wordt regel voor regel gelezen en in blokken van CHUNK_ROWS
+rijen geschreven; het geheugengebruik hangt niet af van het aantal pogingen.
+
+Per sessie (standaard) of per vraag (--per-question: score, tijd, kijktijd,
+bezoeken en wijzigingen per vraag, voor zover opgeslagen).
+
+    python itil_export.py resultaten.csv
+    python itil_export.py resultaten.jsonl --per-question
+    python itil_export.py resultaten.parquet --profile jan --profile piet   # vereist pyarrow
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+
+from itil_core import profiles_dir, profile_filename, PASS_THRESHOLD
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optioneel; zonder pyarrow alleen CSV en JSONL
+    pa = pq = None
+
+CHUNK_ROWS = 5000
+FORMATS = ("csv", "jsonl", "parquet")
+
+SESSION_FIELDS = ("profile", "bank", "at", "source", "pct", "passed", "time_used", "questions", "answered")
+QUESTION_FIELDS = ("profile", "bank", "at", "source", "question", "score", "time_s", "dwell_s", "visits", "changes")
+
+_ARROW_TYPES = {"pct": "float64", "passed": "bool", "time_used": "float64", "questions": "int64",
+                "answered": "int64", "score": "float64", "time_s": "float64", "dwell_s": "float64",
+                "visits": "int64", "changes": "int64"}
+
+HISTORY_SUFFIX = ".history.jsonl"
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def format_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    return {"ndjson": "jsonl", "json": "jsonl", "pq": "parquet"}.get(ext, ext)
+
+
+# ------------------------------------------------------------
+# Lezen
+# ------------------------------------------------------------
+def list_result_profiles(base_dir: Path) -> list:
+    """Bestandsnamen (zonder extensie) van profielen met een shard of een geschiedenis."""
+    names = {p.stem for p in base_dir.glob("*.json")}
+    names |= {p.name[:-len(HISTORY_SUFFIX)] for p in base_dir.glob("*" + HISTORY_SUFFIX)}
+    return sorted(names)
+
+
+def iter_results(base_dir: Path = None, profiles: list = None):
+    """(profiel, bank, tijdstip, bron, entry) per opgeslagen resultaat, profiel voor profiel."""
+    base_dir = Path(base_dir) if base_dir else profiles_dir()
+    wanted = {p.lower() for p in profiles} if profiles else None
+    for name in list_result_profiles(base_dir):
+        if wanted is not None and name not in wanted:
+            continue
+        seen = set()
+        hist = base_dir / (name + HISTORY_SUFFIX)
+        if hist.exists():
+            with open(hist, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # half geschreven regel
+                    bank = rec.pop("bank", None)
+                    seen.add(bank)
+                    yield rec.pop("profile", name), bank, rec.pop("at", None), "geschiedenis", rec
+        try:
+            with open(base_dir / f"{name}.json", "r", encoding="utf-8") as fh:
+                shard = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for bank, entry in shard.items():
+            if bank not in seen and isinstance(entry, dict):
+                yield name, bank, None, "laatste", entry
+
+
+def session_row(profile, bank, at, source, entry: dict) -> dict:
+    scores = entry.get("question_score") or {}
+    keys = entry.get("question_time") or scores
+    pct = entry.get("pct")
+    return {"profile": profile, "bank": bank, "at": at, "source": source,
+            "pct": pct, "passed": None if pct is None else float(pct) >= PASS_THRESHOLD,
+            "time_used": entry.get("time_used"),
+            "questions": len(keys) if keys else entry.get("items"),
+            "answered": sum(1 for s in scores.values() if s is not None) if scores else None}
+
+
+def question_rows(profile, bank, at, source, entry: dict):
+    times = entry.get("question_time") or {}
+    tele = entry.get("telemetry") or {}
+    scores = entry.get("question_score") or {}
+    keys = list(dict.fromkeys([*times, *scores, *tele]))
+    for key in keys:
+        dwell, visits, changes = (tele.get(key) or [None, None, None])[:3]
+        yield {"profile": profile, "bank": bank, "at": at, "source": source, "question": key,
+               "score": scores.get(key), "time_s": times.get(key),
+               "dwell_s": dwell, "visits": visits, "changes": changes}
+
+
+def iter_rows(per_question: bool = False, base_dir: Path = None, profiles: list = None):
+    for rec in iter_results(base_dir, profiles):
+        if per_question:
+            yield from question_rows(*rec)
+        else:
+            yield session_row(*rec)
+
+
+# ------------------------------------------------------------
+# Schrijven
+# ------------------------------------------------------------
+class _CsvSink:
+    def __init__(self, path, fields):
+        self.fh = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.fh, fieldnames=fields)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.fh.close()
+
+
+class _JsonlSink:
+    def __init__(self, path, fields):
+        self.fh = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        self.fh.write("".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in rows))
+
+    def close(self):
+        self.fh.close()
+
+
+class _ParquetSink:
+    def __init__(self, path, fields):
+        self.schema = pa.schema([(f, getattr(pa, _ARROW_TYPES.get(f, "string"))()) for f in fields])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+_SINKS = {"csv": _CsvSink, "jsonl": _JsonlSink, "parquet": _ParquetSink}
+
+
+def export(out_path: str, fmt: str = None, per_question: bool = False, base_dir: Path = None,
+           profiles: list = None, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Schrijft alle resultaten naar out_path (atomair via een .tmp); geeft het aantal rijen."""
+    fmt = fmt or format_for(out_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"onbekend formaat: {fmt} (csv, jsonl, parquet)")
+    if fmt == "parquet" and pq is None:
+        raise RuntimeError("Parquet vereist pyarrow (pip install pyarrow)")
+    fields = QUESTION_FIELDS if per_question else SESSION_FIELDS
+    tmp = f"{out_path}.tmp"
+    sink = _SINKS[fmt](tmp, fields)
+    count, chunk = 0, []
+    try:
+        for row in iter_rows(per_question, base_dir, profiles):
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                sink.write(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            sink.write(chunk)
+            count += len(chunk)
+    except BaseException:
+        sink.close()
+        os.remove(tmp)
+        raise
+    sink.close()
+    os.replace(tmp, out_path)
+    return count
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Exporteer alle opgeslagen resultaten (CSV, JSONL, Parquet).")
+    ap.add_argument("out", help="uitvoerbestand; het formaat volgt uit de extensie")
+    ap.add_argument("--format", choices=FORMATS, default=None)
+    ap.add_argument("--per-question", action="store_true", help="één rij per vraag i.p.v. per sessie")
+    ap.add_argument("--profile", action="append", default=None, help="alleen dit profiel (herhaalbaar)")
+    ap.add_argument("--dir", default=None, help="map met profielen (standaard: assets/score/profiles)")
+    args = ap.parse_args(argv)
+
+    profiles = None
+    if args.profile:
+        profiles = [profile_filename(p) for p in args.profile]
+    try:
+        n = export(args.out, args.format, args.per_question, args.dir, profiles)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"{args.out}: {e}", file=sys.stderr)
+        return 1
+    print(f"{n} rij(en) geschreven naar {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
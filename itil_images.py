@@ -0,0 +1,134 @@
+"""
+Voorgeschaalde afbeeldingen voor de GUI.
+
+De banner, de menu-iconen en de vraagafbeeldingen worden één keer naar de maten
+van de interface geschaald en als PNG in assets/cache/images bewaard. De
+bestandsnaam bevat de SHA-1 van de bron plus maat en modus, dus een gewijzigde
+afbeelding krijgt vanzelf een nieuwe variant. De app laadt daarna alleen nog
+kant-en-klare bitmaps (tk.PhotoImage leest PNG zelf, zonder PIL-resize).
+
+Vooraf bouwen (build_itil.bat doet dit; de varianten gaan dan mee in de exe):
+    python itil_images.py
+Ontbreekt een variant, dan maakt de app hem bij het eerste gebruik aan.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from itil_core import resource_dir, cache_dir, HashMemo, WRAP_W, IMAGE_MAX_H, ICON_SIZE
+
+# De maten waarin itil.py de afbeeldingen toont (banner/vragen resp. menu-iconen)
+FIT_BOX = (WRAP_W, IMAGE_MAX_H)
+ICON_BOX = (ICON_SIZE, ICON_SIZE)
+
+FIT, ICON = "fit", "icon"
+HASHES_FILE = "image_hashes.json"
+
+log = logging.getLogger("itil.images")
+
+
+def images_cache_dir() -> Path:
+    base = cache_dir() / "images"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+
+_memo = None
+
+
+def _hashes() -> HashMemo:
+    global _memo
+    if _memo is None:
+        _memo = HashMemo(HASHES_FILE)
+    return _memo
+
+
+def _variant_name(sha1: str, box: tuple, mode: str) -> str:
+    return f"{sha1[:20]}_{box[0]}x{box[1]}_{mode}.png"
+
+
+def render(src: str, box: tuple, mode: str) -> Image.Image:
+    """De geschaalde afbeelding zelf (zoals de app het vroeger bij elke start deed)."""
+    img = Image.open(src)
+    if mode == ICON:
+        img = img.convert("RGBA")
+        bbox = img.getchannel("A").getbbox()
+        if bbox:
+            img = img.crop(bbox)
+    elif img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        img = img.convert("RGBA")
+    img.thumbnail(box, Image.LANCZOS)
+    return img
+
+
+def variant(src: str, box: tuple, mode: str = FIT, build: bool = True):
+    """
+    Pad naar de voorgeschaalde PNG van src, of None. Zoekt eerst in de schrijfbare
+    cache en in een met de exe meegebundelde cache; maakt hem anders aan (build=True).
+    """
+    try:
+        sha1 = _hashes().sha1(src)
+    except OSError:
+        return None
+    name = _variant_name(sha1, box, mode)
+    for cand in (images_cache_dir() / name, Path(resource_dir()) / "assets" / "cache" / "images" / name):
+        if cand.exists():
+            return cand
+    if not build:
+        return None
+    out = images_cache_dir() / name
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        render(src, box, mode).save(tmp, format="PNG", optimize=False)
+        os.replace(tmp, out)
+    except Exception as e:
+        log.warning("%s: %s", src, e)
+        return None
+    finally:
+        _hashes().save()
+    return out
+
+
+def _question_images(banks_dir: str) -> set:
+    found = set()
+    try:
+        names = [n for n in os.listdir(banks_dir) if n.lower().endswith(".json")]
+    except OSError:
+        return found
+    for n in names:
+        try:
+            with open(os.path.join(banks_dir, n), "r", encoding="utf-8") as f:
+                questions = json.load(f)["chapters"][0].get("questions", [])
+        except Exception:
+            continue
+        for q in questions:
+            img = q.get("image") if isinstance(q, dict) else None
+            if isinstance(img, str) and img.strip():
+                found.add(img if os.path.isabs(img) else os.path.join(resource_dir(), os.path.normpath(img)))
+    return found
+
+
+def build_all() -> int:
+    """Alle varianten die de GUI gebruikt: banner en vraagafbeeldingen (FIT), PNG-iconen (ICON)."""
+    base = resource_dir()
+    img_dir = os.path.join(base, "assets", "afbeeldingen")
+    jobs = [(os.path.join(img_dir, "itil_4_foundation.jpg"), FIT_BOX, FIT)]
+    try:
+        jobs += [(os.path.join(img_dir, n), ICON_BOX, ICON)
+                 for n in sorted(os.listdir(img_dir)) if n.lower().endswith(".png")]
+    except OSError:
+        pass
+    jobs += [(p, FIT_BOX, FIT) for p in sorted(_question_images(os.path.join(base, "assets", "itil_vragen")))]
+    made = 0
+    for src, box, mode in jobs:
+        if os.path.exists(src) and variant(src, box, mode):
+            made += 1
+    return made
+
+
+if __name__ == "__main__":
+    n = build_all()
+    print(f"{n} afbeelding(en) voorgeschaald in {images_cache_dir()}")
@@ -0,0 +1,411 @@
+"""
+Importeert vragen uit CSV, Moodle GIFT en IMS QTI (1.2 en 2.1, los of in een .zip)
+naar het bankformaat {"chapters": [{"questions": [...]}]}.
+
+Alles werkt per vraag: de lezers zijn generators (csv-rijen, GIFT-blokken,
+QTI via iterparse met clear()), de schrijver zet elke vraag direct in het
+uitvoerbestand. Het geheugengebruik hangt dus niet af van de grootte van de
+export. Elke vraag gaat langs dezelfde regels als itil_validate, zodat fouten
+nu gemeld worden in plaats van pas tijdens een sessie.
+
+CSV: kopregel met question, option1..optionN (of A, B, C, ...), answer (letter(s),
+nummer(s) of de optietekst; meerdere gescheiden door ; of |), optioneel number,
+image en explanation1..N. Scheidingsteken (, of ;) wordt herkend.
+
+    python itil_import.py export.gift -o assets/itil_vragen/toets6_1_ne.json --chapter "Toets 6.1"
+    python itil_import.py vragen.csv -o nieuw.json --strict      # niets schrijven bij fouten
+    python itil_import.py qti_export.zip -o nieuw.json --compile  # daarna ook het corpus bijwerken
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+
+from itil_core import resource_dir
+from itil_validate import ERROR, WARNING, validate_question, question_where, DuplicateTracker, list_banks
+
+
+class ImportIssue(Exception):
+    """Een vraag die niet te converteren is (onbekend vraagtype e.d.); wordt overgeslagen."""
+
+
+# ------------------------------------------------------------
+# CSV
+# ------------------------------------------------------------
+def _split_multi(value: str) -> list:
+    return [v.strip() for v in re.split(r"[;|]", value) if v.strip()]
+
+
+def _resolve_answers(raw: str, options: list) -> list:
+    """answer-kolom naar optieteksten: eerst letterlijke tekst, dan letters, dan nummers."""
+    raw = (raw or "").strip()
+    if raw in options:
+        return [raw]
+    parts = _split_multi(raw) or ([raw] if raw else [])
+    if len(parts) > 1 and all(p in options for p in parts):
+        return parts
+    out = []
+    for p in parts:
+        if len(p) == 1 and p.isalpha() and ord(p.upper()) - 65 < len(options):
+            out.append(options[ord(p.upper()) - 65])
+        elif p.isdigit() and 1 <= int(p) <= len(options):
+            out.append(options[int(p) - 1])
+        else:
+            out.append(p)  # laat de validator melden dat dit geen optie is
+    return out
+
+
+def read_csv(fh) -> iter:
+    sample = fh.read(4096)
+    fh.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(fh, dialect=dialect)
+    fields = [f.strip() for f in (reader.fieldnames or [])]
+    reader.fieldnames = fields
+    lower = {f.lower(): f for f in fields}
+    opt_cols = [f for f in fields if re.fullmatch(r"option\s*\d+", f, re.IGNORECASE)]
+    opt_cols.sort(key=lambda f: int(re.sub(r"\D", "", f)))
+    if not opt_cols:
+        opt_cols = [f for f in fields if re.fullmatch(r"[A-Za-z]", f)]
+        opt_cols.sort(key=str.upper)
+    if "question" not in lower or "answer" not in lower or not opt_cols:
+        raise ImportIssue("CSV mist de kolommen question, answer en option1.. (of A, B, ...)")
+
+    for row in reader:
+        opts_with_col = [(c, (row.get(c) or "").strip()) for c in opt_cols]
+        opts_with_col = [(c, o) for c, o in opts_with_col if o]
+        options = [o for _c, o in opts_with_col]
+        q = {"question": (row.get(lower["question"]) or "").strip(), "options": options}
+        answers = _resolve_answers(row.get(lower["answer"]) or "", options)
+        q["answer"] = answers if len(answers) > 1 else (answers[0] if answers else "")
+        if "number" in lower and (row.get(lower["number"]) or "").strip().isdigit():
+            q["number"] = int(row[lower["number"]])
+        if "image" in lower and (row.get(lower["image"]) or "").strip():
+            q["image"] = row[lower["image"]].strip()
+        expl = {}
+        for k, (col, opt) in enumerate(opts_with_col):
+            suffix = re.sub(r"^option\s*", "", col, flags=re.IGNORECASE)
+            text = (row.get(lower.get(f"explanation{suffix}".lower(), ""), "") or "").strip()
+            if text:
+                expl[opt] = text
+        if expl:
+            q["explanation"] = expl
+        yield q
+
+
+# ------------------------------------------------------------
+# Moodle GIFT
+# ------------------------------------------------------------
+_GIFT_ESC = re.compile(r"\\([~=#{}:\\n])")
+
+
+def _gift_unescape(s: str) -> str:
+    return _GIFT_ESC.sub(lambda m: "\n" if m.group(1) == "n" else m.group(1), s).strip()
+
+
+def _gift_split(s: str, chars: str) -> list:
+    """Splitst op niet-geëscapete tekens; elk deel begint met het scheidingsteken."""
+    parts, cur, i = [], "", 0
+    while i < len(s):
+        c = s[i]
+        if c == "\\" and i + 1 < len(s):
+            cur += s[i:i + 2]
+            i += 2
+            continue
+        if c in chars:
+            parts.append(cur)
+            cur = c
+        else:
+            cur += c
+        i += 1
+    parts.append(cur)
+    return parts
+
+
+def _gift_blocks(fh) -> iter:
+    """Eén vraag per keer: blokken gescheiden door een lege regel (buiten {...})."""
+    buf, depth = [], 0
+    for line in fh:
+        stripped = line.strip()
+        if stripped.startswith("//") and depth == 0:
+            continue
+        if not stripped and depth == 0:
+            if buf:
+                yield "\n".join(buf)
+                buf = []
+            continue
+        if stripped.startswith("$CATEGORY:") and depth == 0:
+            continue
+        buf.append(line.rstrip("\n"))
+        depth += len(re.findall(r"(?<!\\)\{", line)) - len(re.findall(r"(?<!\\)\}", line))
+    if buf:
+        yield "\n".join(buf)
+
+
+def parse_gift(block: str) -> dict:
+    m = re.match(r"\s*::(.*?)::(.*)", block, re.DOTALL)
+    body = m.group(2) if m else block
+    body = re.sub(r"^\s*\[(html|moodle|plain|markdown)\]", "", body)
+    start = re.search(r"(?<!\\)\{", body)
+    end = re.search(r"(?<!\\)\}[^}]*$", body)
+    if not start or not end or end.start() < start.start():
+        raise ImportIssue("geen antwoordblok {...}")
+    before, inner, after = body[:start.start()], body[start.end():end.start()], body[end.start() + 1:]
+    text = _gift_unescape(before + (" _____ " + after if after.strip() else ""))
+
+    tf = inner.strip().split("#")[0].strip().upper()
+    if tf in ("T", "TRUE", "F", "FALSE"):
+        return {"question": text, "options": ["True", "False"],
+                "answer": "True" if tf.startswith("T") else "False"}
+    if "->" in inner:
+        raise ImportIssue("matching-vragen worden niet ondersteund")
+
+    options, correct, expl = [], [], {}
+    has_wrong = False
+    for part in _gift_split(inner, "=~"):
+        if not part.strip() or part[0] not in "=~":
+            continue
+        kind, rest = part[0], part[1:]
+        weight = None
+        wm = re.match(r"\s*%(-?\d+(?:\.\d+)?)%", rest)
+        if wm:
+            weight = float(wm.group(1))
+            rest = rest[wm.end():]
+        pieces = _gift_split(rest, "#")
+        opt = _gift_unescape(pieces[0])
+        feedback = _gift_unescape(pieces[1][1:]) if len(pieces) > 1 else ""
+        if not opt:
+            continue
+        options.append(opt)
+        if feedback:
+            expl[opt] = feedback
+        if kind == "=" or (weight is not None and weight > 0):
+            correct.append(opt)
+        else:
+            has_wrong = True
+    if not has_wrong:
+        raise ImportIssue("open/korte-antwoordvraag (geen ~-opties) wordt niet ondersteund")
+    q = {"question": text, "options": options,
+         "answer": correct if len(correct) > 1 else (correct[0] if correct else "")}
+    if expl:
+        q["explanation"] = expl
+    return q
+
+
+def read_gift(fh) -> iter:
+    for block in _gift_blocks(fh):
+        try:
+            yield parse_gift(block)
+        except ImportIssue as e:
+            yield e
+
+
+# ------------------------------------------------------------
+# IMS QTI 1.2 / 2.1
+# ------------------------------------------------------------
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(el) -> str:
+    return " ".join(" ".join(el.itertext()).split()) if el is not None else ""
+
+
+def _find_all(el, name: str):
+    return [e for e in el.iter() if _local(e.tag) == name]
+
+
+def _positive_varequals(el):
+    """varequal-elementen die niet onder een <not> staan: <not><varequal> telt niet als juist."""
+    for child in el:
+        tag = _local(child.tag)
+        if tag == "varequal":
+            yield child
+        elif tag != "not":
+            yield from _positive_varequals(child)
+
+
+def _qti12_item(item) -> dict:
+    pres = next(iter(_find_all(item, "presentation")), None)
+    if pres is None:
+        raise ImportIssue("QTI-item zonder presentation")
+    lid = next(iter(_find_all(pres, "response_lid")), None)
+    if lid is None:
+        raise ImportIssue("alleen meerkeuze (response_lid) wordt ondersteund")
+    question = " ".join(_text(m) for m in pres if _local(m.tag) == "material") or \
+        _text(next(iter(_find_all(pres, "mattext")), None))
+    labels = [(lab.get("ident"), _text(lab)) for lab in _find_all(lid, "response_label")]
+    ids = {i: t for i, t in labels}
+    correct = []
+    for cond in _find_all(item, "respcondition"):
+        setvar = next(iter(_find_all(cond, "setvar")), None)
+        try:
+            gain = float((setvar.text or "0").strip()) if setvar is not None else 0.0
+        except ValueError:
+            gain = 0.0
+        if gain <= 0:
+            continue
+        for ve in _positive_varequals(cond):
+            if (ve.text or "").strip() in ids and ids[ve.text.strip()] not in correct:
+                correct.append(ids[ve.text.strip()])
+    options = [t for _i, t in labels]
+    return {"question": question, "options": options,
+            "answer": correct if len(correct) > 1 or lid.get("rcardinality") == "Multiple" else
+            (correct[0] if correct else "")}
+
+
+def _qti21_item(item) -> dict:
+    choice = next(iter(_find_all(item, "choiceInteraction")), None)
+    if choice is None:
+        raise ImportIssue("alleen choiceInteraction wordt ondersteund")
+    prompt = next(iter(_find_all(choice, "prompt")), None)
+    body = next(iter(_find_all(item, "itemBody")), None)
+    if prompt is not None and _text(prompt):
+        question = _text(prompt)
+    else:
+        question = " ".join(_text(c) for c in body if _local(c.tag) != "choiceInteraction") if body is not None else ""
+    labels = [(c.get("identifier"), _text(c)) for c in _find_all(choice, "simpleChoice")]
+    ids = dict(labels)
+    correct = [ids[v.text.strip()] for resp in _find_all(item, "correctResponse")
+               for v in _find_all(resp, "value") if v.text and v.text.strip() in ids]
+    multi = choice.get("maxChoices", "1") != "1"
+    return {"question": question, "options": [t for _i, t in labels],
+            "answer": correct if multi or len(correct) > 1 else (correct[0] if correct else "")}
+
+
+def _iter_qti_xml(fh) -> iter:
+    for _event, el in ET.iterparse(fh, events=("end",)):
+        tag = _local(el.tag)
+        if tag == "item":
+            try:
+                yield _qti12_item(el)
+            except ImportIssue as e:
+                yield e
+            el.clear()
+        elif tag == "assessmentItem":
+            try:
+                yield _qti21_item(el)
+            except ImportIssue as e:
+                yield e
+            el.clear()
+
+
+def read_qti(path: str) -> iter:
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for name in sorted(n for n in zf.namelist() if n.lower().endswith(".xml")):
+                if os.path.basename(name).lower() == "imsmanifest.xml":
+                    continue
+                with zf.open(name) as fh:
+                    yield from _iter_qti_xml(fh)
+    else:
+        with open(path, "rb") as fh:
+            yield from _iter_qti_xml(fh)
+
+
+# ------------------------------------------------------------
+# Schrijven + valideren
+# ------------------------------------------------------------
+def read_any(path: str, fmt: str = None) -> iter:
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+            yield from read_csv(fh)
+    elif fmt in ("gift", "txt"):
+        with open(path, "r", encoding="utf-8-sig") as fh:
+            yield from read_gift(fh)
+    elif fmt in ("xml", "qti", "zip"):
+        yield from read_qti(path)
+    else:
+        raise ImportIssue(f"onbekend formaat: {fmt} (csv, gift, xml/qti, zip)")
+
+
+def convert(src: str, out_path: str, chapter: str = None, description: str = None,
+            fmt: str = None, strict: bool = False) -> tuple:
+    """
+    Zet src om naar een bank in out_path; geeft (aantal vragen, issues). Met
+    strict=True blijft out_path ongemoeid als er fouten zijn.
+    """
+    issues, count, pos = [], 0, 0
+    dups = DuplicateTracker()
+    tmp = out_path + ".tmp"
+    head = {"chapter": chapter or os.path.splitext(os.path.basename(out_path))[0]}
+    if description:
+        head["description"] = description
+    out = open(tmp, "w", encoding="utf-8")
+    try:
+        out.write('{"chapters": [' + json.dumps(head, ensure_ascii=False)[:-1] + ', "questions": [\n')
+        for q in read_any(src, fmt):
+            pos += 1
+            if isinstance(q, ImportIssue):
+                issues.append((WARNING, f"bron-item {pos}", f"overgeslagen: {q}"))
+                continue
+            count += 1
+            q.setdefault("number", count)
+            where = question_where(q, count)
+            issues.extend(validate_question(q, where, image_base=resource_dir()))
+            issues.extend(dups.check(q, where))
+            out.write((",\n" if count > 1 else "") + json.dumps(q, ensure_ascii=False))
+        out.write("\n]}]}\n")
+    except BaseException:
+        out.close()
+        os.remove(tmp)  # geen half bestand naast de banken laten staan
+        raise
+    out.close()
+    if strict and any(level == ERROR for level, _w, _m in issues):
+        os.remove(tmp)
+    else:
+        os.replace(tmp, out_path)
+    return count, issues
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Importeer CSV, Moodle GIFT of IMS QTI als vraagbank.")
+    ap.add_argument("source", help="bronbestand (.csv, .gift/.txt, .xml of .zip)")
+    ap.add_argument("-o", "--out", required=True, help="uitvoer, bijv. assets/itil_vragen/toets6_1_ne.json")
+    ap.add_argument("--format", choices=("csv", "gift", "qti"), default=None, help="formaat (standaard: extensie)")
+    ap.add_argument("--chapter", default=None, help="titel van de bank in het menu")
+    ap.add_argument("--description", default=None)
+    ap.add_argument("--strict", action="store_true", help="niets schrijven als er fouten zijn")
+    ap.add_argument("--compile", action="store_true", help="daarna het vragencorpus opnieuw compileren")
+    ap.add_argument("-q", "--quiet", action="store_true", help="alleen fouten tonen, geen waarschuwingen")
+    args = ap.parse_args(argv)
+
+    try:
+        count, issues = convert(args.source, args.out, args.chapter, args.description,
+                                args.format, args.strict)
+    except (ImportIssue, OSError, ET.ParseError, csv.Error, UnicodeDecodeError) as e:
+        print(f"{args.source}: {e}", file=sys.stderr)
+        return 1
+
+    n_err = sum(1 for level, _w, _m in issues if level == ERROR)
+    for level, where, msg in issues:
+        if level == WARNING and args.quiet:
+            continue
+        print(f"{os.path.basename(args.source)}: {where}: {level}: {msg}")
+    written = not (args.strict and n_err)
+    print(f"{count} vra(a)g(en) geconverteerd, {n_err} fout(en), {len(issues) - n_err} waarschuwing(en)"
+          + ("" if written else f"; {args.out} niet geschreven (--strict)"))
+
+    if args.compile and written:
+        import itil_corpus
+        paths = list_banks()
+        out_abs = os.path.abspath(args.out)
+        if out_abs not in paths:
+            paths.append(out_abs)
+        # Niet het gedeelde corpus.itc overschrijven: een draaiende app heeft het gemapt
+        corpus = itil_corpus.ensure_fresh(None, paths)
+        print(f"corpus: {len(corpus)} vragen uit {len(corpus.banks)} banken ({corpus.path})")
+        corpus.close()
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
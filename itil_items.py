@@ -0,0 +1,233 @@
+"""
+Klassieke itemanalyse van de vraagbanken.
+
+Na elke afgeronde sessie krijgt elke vraag één "poging" erbij. Per vraag worden
+alleen lopende sommen bijgehouden, zodat een poging O(1) kost (O(opties) voor de
+afleiders) en er geen ruwe geschiedenis herberekend hoeft te worden:
+
+  n, Σx, Σx², Σy, Σy², Σxy    x = itemscore 0..1, y = restscore (sessie zonder dit item)
+  per optie: [aantal keer gekozen, Σy van wie hem koos]
+
+Daaruit volgen de p-waarde (moeilijkheid = gemiddelde x), de punt-biseriële
+correlatie (Pearson tussen x en y) en de keuzepercentages per afleider. Opslag:
+<project>/assets/score/item_stats.json; elke save telt alleen de eigen nieuwe
+pogingen op bij wat er op schijf staat (onder een lock, zoals ScoreStore), zodat
+meerdere instanties elkaars pogingen niet overschrijven.
+
+    python itil_items.py                   # zwakke en dubbelzinnige vragen, alle banken
+    python itil_items.py mock1_ne.json     # één bank
+    python itil_items.py --min-n 10 --top 30
+"""
+import argparse
+import json
+import math
+import sys
+
+from itil_core import item_stats_path, atomic_write_text, FileLock
+
+STATS_VERSION = 1
+
+# Grenzen voor het rapport
+MIN_ATTEMPTS = 5
+HARD_P = 0.30        # bijna niemand heeft hem goed
+EASY_P = 0.95        # iedereen heeft hem goed: onderscheidt niet
+LOW_RPB = 0.15       # goede kandidaten scoren niet beter op deze vraag
+
+SKIPPED = ""         # optiesleutel voor "niets ingevuld"
+
+
+def item_key(bank: str, q: dict, pos: int) -> str:
+    """Stabiele sleutel 'bank.json#nummer'; zonder number de positie in de bank (1-based)."""
+    num = q.get("number") if isinstance(q, dict) else None
+    return f"{bank}#{num if num is not None else pos + 1}"
+
+
+def _new_item() -> dict:
+    return {"s": [0, 0.0, 0.0, 0.0, 0.0, 0.0], "opt": {}}
+
+
+def _merge_item(items: dict, key: str, delta: dict):
+    """Telt de sommen en optietellingen van delta op bij items[key]."""
+    it = items.get(key)
+    if it is None:
+        it = items[key] = _new_item()
+    it["s"] = [a + b for a, b in zip(it["s"], delta["s"])]
+    opt = it["opt"]
+    for text, (count, sum_rest) in delta["opt"].items():
+        c = opt.get(text)
+        if c is None:
+            opt[text] = [count, sum_rest]
+        else:
+            c[0] += count
+            c[1] += sum_rest
+    if "key" in delta:
+        it["key"] = delta["key"]
+
+
+def _pearson(n, sx, sxx, sy, syy, sxy):
+    vx = n * sxx - sx * sx
+    vy = n * syy - sy * sy
+    if n < 2 or vx <= 1e-12 or vy <= 1e-12:
+        return None
+    return (n * sxy - sx * sy) / math.sqrt(vx * vy)
+
+
+class ItemStats:
+    """Lopende aggregaten per vraag: {sleutel: {"s": [n, Σx, Σx², Σy, Σy², Σxy], "opt": {...}, "key": [...]}}."""
+
+    def __init__(self, items: dict = None):
+        self.items = items or {}
+        self._delta = {}     # pogingen sinds de vorige save, zelfde vorm als items
+        self.dirty = False
+
+    # ---------------- opslag ----------------
+    @staticmethod
+    def _read(path) -> dict:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == STATS_VERSION:
+                return data.get("items", {})
+        except Exception:
+            pass
+        return {}
+
+    @classmethod
+    def load(cls, path=None) -> "ItemStats":
+        return cls(cls._read(path or item_stats_path()))
+
+    def save(self, path=None):
+        """
+        Merge onder een bestandslock: het bestand opnieuw lezen, de eigen pogingen sinds
+        de vorige save erbij optellen en atomair wegschrijven. Lukt dat niet, dan blijven
+        ze staan voor de volgende save.
+        """
+        if not self.dirty:
+            return
+        path = path or item_stats_path()
+        try:
+            with FileLock(path.with_suffix(".lock")):
+                merged = self._read(path)
+                for key, delta in self._delta.items():
+                    _merge_item(merged, key, delta)
+                atomic_write_text(path, json.dumps({"version": STATS_VERSION, "items": merged},
+                                                   ensure_ascii=False, separators=(",", ":")))
+        except (OSError, TimeoutError):
+            return
+        self._delta.clear()
+        self.dirty = False
+        # Meteen ook de pogingen van andere instanties; in place, de adaptieve toets houdt items vast
+        self.items.clear()
+        self.items.update(merged)
+
+    # ---------------- bijwerken ----------------
+    def add_attempt(self, key: str, answer, chosen: list, x: float, rest: float):
+        """Eén poging: chosen = gekozen optieteksten (leeg = overgeslagen), x = score, rest = restscore."""
+        attempt = {"s": [1, x, x * x, rest, rest * rest, x * rest], "opt": {},
+                   "key": answer if isinstance(answer, list) else [answer]}
+        for text in (chosen or [SKIPPED]):
+            c = attempt["opt"].setdefault(text, [0, 0.0])
+            c[0] += 1
+            c[1] += rest
+        _merge_item(self.items, key, attempt)
+        _merge_item(self._delta, key, attempt)
+        self.dirty = True
+
+    def record_session(self, bank: str, questions: list, src: list, options: list,
+                       answers: list, scores: list):
+        """
+        Voegt een afgeronde sessie toe. questions/options/answers/scores zijn per
+        sessievraag; src[i] is de positie van sessievraag i in de bank.
+        """
+        total = sum(scores)
+        for i, q in enumerate(questions):
+            sel = answers[i] if i < len(answers) and answers[i] is not None else []
+            chosen = [options[i][j] for j in sel if j < len(options[i])]
+            x = scores[i] if i < len(scores) else 0.0
+            pos = src[i] if i < len(src) else i
+            self.add_attempt(item_key(bank, q, pos), q.get("answer"), chosen, x, total - x)
+
+    # ---------------- uitlezen ----------------
+    def analyse(self, key: str) -> dict:
+        it = self.items[key]
+        n, sx, sxx, sy, syy, sxy = it["s"]
+        keys = set(it.get("key") or [])
+        mean_rest = sy / n if n else 0.0
+        distractors = []
+        for text, (count, sum_rest) in it["opt"].items():
+            if text == SKIPPED or text in keys:
+                continue
+            distractors.append({
+                "option": text,
+                "rate": count / n,
+                # gemiddelde restscore van wie deze afleider koos, t.o.v. iedereen
+                "rest_delta": sum_rest / count - mean_rest,
+            })
+        distractors.sort(key=lambda d: d["rate"], reverse=True)
+        key_rate = sum(it["opt"].get(k, (0, 0.0))[0] for k in keys) / n / max(len(keys), 1) if n else 0.0
+        skipped = it["opt"].get(SKIPPED, (0, 0.0))[0]
+        return {
+            "key": key,
+            "n": n,
+            "p": sx / n if n else 0.0,
+            "rpb": _pearson(n, sx, sxx, sy, syy, sxy),
+            "key_rate": key_rate,
+            "skip_rate": skipped / n if n else 0.0,
+            "distractors": distractors,
+        }
+
+    def flags(self, a: dict) -> list:
+        """Redenen waarom een vraag aandacht nodig heeft (leeg = in orde)."""
+        out = []
+        if a["p"] < HARD_P:
+            out.append("moeilijk")
+        elif a["p"] > EASY_P:
+            out.append("te makkelijk")
+        if a["rpb"] is not None and a["rpb"] < LOW_RPB:
+            out.append("negatieve discriminatie" if a["rpb"] < 0 else "lage discriminatie")
+        for d in a["distractors"]:
+            if d["rate"] >= a["key_rate"] > 0:
+                out.append(f"afleider even vaak gekozen als sleutel: {d['option'][:40]!r}")
+            elif d["rest_delta"] > 0 and d["rate"] >= 0.1:
+                out.append(f"sterke kandidaten kiezen afleider: {d['option'][:40]!r}")
+        return out
+
+    def report(self, bank: str = None, min_n: int = MIN_ATTEMPTS) -> list:
+        """[(analyse, redenen)] van vragen met genoeg pogingen en minstens één reden, slechtste eerst."""
+        rows = []
+        for key in self.items:
+            if bank and not key.startswith(bank + "#"):
+                continue
+            a = self.analyse(key)
+            if a["n"] < min_n:
+                continue
+            reasons = self.flags(a)
+            if reasons:
+                rows.append((a, reasons))
+        # Eerst lage/negatieve discriminatie, daarna het aantal redenen
+        rows.sort(key=lambda r: (r[0]["rpb"] if r[0]["rpb"] is not None else 1.0, -len(r[1])))
+        return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Itemanalyse: zwakke en dubbelzinnige vragen.")
+    ap.add_argument("bank", nargs="?", help="alleen deze bank (bestandsnaam)")
+    ap.add_argument("--min-n", type=int, default=MIN_ATTEMPTS, help="minimum aantal pogingen per vraag")
+    ap.add_argument("--top", type=int, default=20, help="aantal vragen in het rapport")
+    args = ap.parse_args(argv)
+
+    stats = ItemStats.load()
+    rows = stats.report(args.bank, args.min_n)
+    if not rows:
+        print(f"Geen opvallende vragen ({len(stats.items)} vragen in de statistiek, min. {args.min_n} pogingen).")
+        return 0
+    for a, reasons in rows[:args.top]:
+        rpb = f"{a['rpb']:+.2f}" if a["rpb"] is not None else "  -  "
+        print(f"{a['key']:<28} n={a['n']:<4} p={a['p']:.2f} rpb={rpb} overgeslagen={a['skip_rate']:.0%}")
+        for r in reasons:
+            print(f"    - {r}")
+    print(f"{len(rows)} van {len(stats.items)} vragen gemarkeerd")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
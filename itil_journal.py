@@ -0,0 +1,176 @@
+"""
+Sessiejournaal: een lopende toets overleeft een crash of een laptop die in slaap valt.
+
+Per profiel één bestand (assets/score/profiles/<profiel>.session) met JSON-regels.
+De eerste regel legt de sessie vast: bank (+ SHA-1), volgorde van de vragen
+(question_src), optievolgorde per vraag als indexen in de bankopties en de klok.
+Daarna volgt per submit en per navigatie alleen een kleine deltaregel:
+
+    {"a": [3, [0, 2], 1.0], "i": 4, "ms": 2893120, "run": true}
+    {"u": [3, 41.2, 52.8, 2, 1], "i": 4, "ms": 2893120, "run": true}
+
+Schrijven (append + fsync) gebeurt op een eigen thread, de Tk-thread zet alleen
+een record in de wachtrij. Een half geschreven laatste regel wordt bij het lezen
+genegeerd; alles daarvoor is bruikbaar.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from itil_core import resource_dir, profiles_dir, profile_filename, portable_path, file_sha1
+
+VERSION = 1
+HEARTBEAT_S = 15.0   # ook zonder klikken af en toe de resterende tijd vastleggen
+
+log = logging.getLogger("itil.journal")
+
+
+def journal_path(profile: str, base_dir: Path = None) -> Path:
+    return (base_dir or profiles_dir()) / f"{profile_filename(profile)}.session"
+
+
+def resolve_bank(ref: str) -> str:
+    return ref if os.path.isabs(ref) else os.path.join(resource_dir(), os.path.normpath(ref))
+
+
+class SessionJournal:
+    """Schrijft het journaal van één profiel op de achtergrond."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._queue = queue.Queue()
+        self._thread = None
+        self.last_write = 0.0   # time.monotonic() van het laatst ingeplande record
+        self.error = None       # laatste schrijffout (tekst), op te halen met take_error
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+            self._thread.start()
+
+    def _put(self, item):
+        self.last_write = time.monotonic()
+        self._ensure_thread()
+        self._queue.put(item)
+
+    def start(self, bank_path: str, title: str, src: list, orders: list, ms: int, running: bool):
+        self._put(("start", {"v": VERSION, "bank": portable_path(bank_path), "abs": bank_path,
+                             "title": title, "src": list(src), "ord": orders,
+                             "ms": int(ms), "run": bool(running), "t": time.time()}))
+
+    def resume(self, size: int):
+        """Verder schrijven achter de eerste size bytes (het geldige deel, zie load)."""
+        self._put(("resume", size))
+
+    def note(self, **rec):
+        self._put(("rec", rec))
+
+    def discard(self):
+        self._put(("discard", None))
+
+    def take_error(self):
+        """Schrijffout van de achtergrondthread sinds de vorige aanroep, of None."""
+        err, self.error = self.error, None
+        return err
+
+    def flush(self, timeout: float = 2.0):
+        """Wacht (begrensd) tot de wachtrij leeg is, bijv. bij het afsluiten."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(("sync", done))
+        done.wait(timeout)
+
+    def _run(self):
+        fh = None
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == "start":
+                    if fh:
+                        fh.close()
+                    # Hashen op deze thread: de klik op een bank wacht er niet op
+                    try:
+                        payload["sha1"] = file_sha1(payload.pop("abs"))
+                    except OSError:
+                        payload["sha1"] = None
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    fh = open(self.path, "w", encoding="utf-8")
+                    self._write(fh, payload)
+                elif kind == "resume":
+                    if fh:
+                        fh.close()
+                    os.truncate(self.path, payload)
+                    fh = open(self.path, "a", encoding="utf-8")
+                elif kind == "rec":
+                    if fh:
+                        self._write(fh, payload)
+                elif kind == "discard":
+                    if fh:
+                        fh.close()
+                        fh = None
+                    try:
+                        self.path.unlink()
+                    except FileNotFoundError:
+                        pass
+                elif kind == "sync":
+                    payload.set()
+            except OSError as e:
+                log.error("%s: %s", self.path, e)
+                self.error = f"{self.path}: {e}"
+
+    @staticmethod
+    def _write(fh, rec: dict):
+        fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def load(path: Path):
+    """
+    Toestand van een onderbroken sessie, of None. Geeft de kopregel terug met
+    daarop toegepast alle deltas: answers, scores (in submit-volgorde, zoals
+    QuizApp.correct_answers), used, tele, i, ms en run, plus size: het aantal
+    bytes tot en met de laatste complete regel.
+    """
+    try:
+        with open(path, "rb") as fh:
+            raw = fh.read()
+    except OSError:
+        return None
+    lines = raw.split(b"\n")[:-1]   # alleen regels die met een newline afgesloten zijn
+    if not lines:
+        return None
+    try:
+        state = json.loads(lines[0])
+    except ValueError:
+        return None
+    if state.get("v") != VERSION or not state.get("src"):
+        return None
+    n = len(state["src"])
+    state.update(answers=[None] * n, scores=[], used=[0.0] * n, tele=[[0.0, 0, 0] for _ in range(n)], i=0)
+    size = len(lines[0]) + 1
+    for line in lines[1:]:
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            break  # beschadigde regel: wat ervoor staat is geldig
+        size += len(line) + 1
+        if "a" in rec:
+            idx, sel, score = rec["a"]
+            state["answers"][idx] = sel
+            state["scores"].append(score)
+        if "u" in rec:
+            idx, used, dwell, visits, changes = rec["u"]
+            state["used"][idx] = used
+            state["tele"][idx] = [dwell, visits, changes]
+        for k in ("i", "ms", "run"):
+            if k in rec:
+                state[k] = rec[k]
+    state["i"] = max(0, min(n - 1, state["i"]))
+    state["size"] = size
+    return state
@@ -0,0 +1,259 @@
+"""
+Belastingstest met virtuele examenkandidaten.
+
+Elke kandidaat is een thread die sessies doorloopt op de echte banken, via
+dezelfde Tk-vrije code als de app: itil_core.load_bank_chapter / shuffle_session
+bij het starten, QuestionTelemetry bij elke navigatie, grade_answer bij elke
+submit (zoals QuizApp.submit_answer) en score_entry + ScoreStore + ItemStats bij
+het afronden (zoals QuizApp._store_last_score), elk in een eigen profiel. Kandidaten bladeren
+ook terug en wijzigen antwoorden. Scores gaan naar een tijdelijke map, tenzij
+--store is opgegeven.
+
+Alles draait offline. Uitvoer: sessies/s, p50/p95/p99 per bewerking en de
+geheugengroei.
+
+    python itil_loadtest.py                     # 8 kandidaten, 5 sessies elk
+    python itil_loadtest.py -n 64 -s 20 --think 0.02
+    python itil_loadtest.py --json --trace-memory
+    python itil_loadtest.py --bank-memory       # alle banken tegelijk: zonder/met interning
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from itil_core import (grade_answer, load_bank_chapter, shuffle_session, session_percentage,
+                       score_entry, ScoreStore, QuestionTelemetry)
+from itil_items import ItemStats
+from itil_validate import list_banks
+import itil_corpus
+
+try:
+    import resource  # alleen Unix; op Windows geen RSS-meting
+except ImportError:
+    resource = None
+
+OPS = ("load", "start", "navigate", "submit", "store")
+
+BACK_PROB = 0.10     # kans dat een kandidaat eerst terugbladert
+CHANGE_PROB = 0.05   # kans dat een eerder antwoord opnieuw ingediend wordt
+
+
+class Shared:
+    """Wat alle kandidaten delen: corpus, de map met profielen en de itemstatistiek."""
+
+    def __init__(self, banks: list, corpus, store_dir: Path):
+        self.banks = banks
+        self.corpus = corpus
+        self.profiles_dir = store_dir / "profiles"
+        self.profiles_dir.mkdir(exist_ok=True)
+        self.items = ItemStats()
+        self.items_path = store_dir / "item_stats.json"
+        self.lock = threading.Lock()
+
+
+class VirtualExaminee:
+    def __init__(self, shared: Shared, seed: int, think: float, profile: str):
+        self.shared = shared
+        self.store = ScoreStore(profile, shared.profiles_dir)
+        self.rng = random.Random(seed)
+        self.ability = self.rng.uniform(0.3, 0.95)
+        self.think = think
+        self.lat = {op: [] for op in OPS}
+        self.sessions = 0
+
+    def _timed(self, op: str, fn, *args):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        self.lat[op].append(time.perf_counter() - t0)
+        return result
+
+    def _pause(self):
+        if self.think:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+
+    def _pick(self, q: dict, options: list) -> list:
+        ans = q.get("answer")
+        keys = ans if isinstance(ans, list) else [ans]
+        if self.rng.random() < self.ability:
+            return sorted(options.index(a) for a in keys if a in options)
+        return [self.rng.randrange(len(options))] if options else []
+
+    def run_session(self):
+        path = self.rng.choice(self.shared.banks)
+        chapter, _expl, base_options = self._timed("load", load_bank_chapter, path, self.shared.corpus)
+
+        def start():
+            src, questions, options = shuffle_session(chapter.get("questions", []), base_options, self.rng)
+            return src, questions, options, QuestionTelemetry(len(questions))
+        src, questions, options, telemetry = self._timed("start", start)
+        n = len(questions)
+        user_answers = [None] * n
+        correct_answers = []
+        question_time_used = [0.0] * n
+
+        def show(i):
+            telemetry.show(i)
+            return options[i]
+
+        def submit(i, selected):
+            # Zelfde volgorde als QuizApp.submit_answer
+            user_answers[i] = selected
+            correct_answers.append(grade_answer(questions[i]["answer"], options[i], selected))
+
+        for i in range(n):
+            if i and self.rng.random() < BACK_PROB:
+                back = self.rng.randrange(i)
+                self._timed("navigate", show, back)
+                if self.rng.random() < CHANGE_PROB * 4:
+                    telemetry.change(back)
+                    self._timed("submit", submit, back, self._pick(questions[back], options[back]))
+            t_shown = time.perf_counter()
+            self._timed("navigate", show, i)
+            self._pause()
+            if self.rng.random() < CHANGE_PROB:
+                telemetry.change(i)
+            self._timed("submit", submit, i, self._pick(questions[i], options[i]))
+            question_time_used[i] += time.perf_counter() - t_shown
+        telemetry.stop()
+
+        def store():
+            # Zelfde gegevens als QuizApp._store_last_score + _record_item_stats
+            key = os.path.basename(path)
+            q_keys = [str(q.get("number", i + 1)) for i, q in enumerate(questions)]
+            item_scores = [grade_answer(q.get("answer"), options[i], user_answers[i])
+                           for i, q in enumerate(questions)]
+            # Uit de laatste antwoorden per vraag: correct_answers telt opnieuw ingediende vragen dubbel
+            pct = session_percentage(item_scores, n)
+            entry = score_entry(pct, question_time_used, q_keys, telemetry, item_scores)
+            self.store.put(key, entry)
+            with self.shared.lock:
+                self.shared.items.record_session(key, questions, src, options, user_answers, item_scores)
+                self.shared.items.save(self.shared.items_path)
+        self._timed("store", store)
+        self.sessions += 1
+
+    def run(self, n_sessions: int):
+        for _ in range(n_sessions):
+            self.run_session()
+
+
+def percentile(sorted_vals: list, pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, int(round(pct / 100 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[k]
+
+
+def _rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS: bytes, Linux: KiB
+
+
+def bank_memory(banks: list, corpus, intern: bool) -> tuple:
+    """(KiB, ms) om alle banken tegelijk geladen te houden, zoals bij veel kandidaten of preloads."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    held = [load_bank_chapter(path, corpus, intern=intern) for path in banks]
+    ms = (time.perf_counter() - t0) * 1000
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size / 1024, ms
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Belastingstest met virtuele examenkandidaten (offline).")
+    ap.add_argument("-n", "--examinees", type=int, default=8, help="aantal gelijktijdige kandidaten")
+    ap.add_argument("-s", "--sessions", type=int, default=5, help="sessies per kandidaat")
+    ap.add_argument("--think", type=float, default=0.0, help="gemiddelde denktijd per vraag in seconden")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--profiles", type=int, default=0,
+                    help="aantal profielen (standaard: één per kandidaat; kleiner = gedeelde shards)")
+    ap.add_argument("--json", action="store_true", help="banken uit JSON lezen, ook als er een corpus is")
+    ap.add_argument("--store", default=None, help="map voor profiles/ en item_stats.json (standaard: tijdelijk)")
+    ap.add_argument("--trace-memory", action="store_true", help="geheugengroei met tracemalloc meten (trager)")
+    ap.add_argument("--bank-memory", action="store_true",
+                    help="alleen het geheugen van alle banken tegelijk meten, zonder en met interning")
+    args = ap.parse_args(argv)
+
+    banks = list_banks()
+    if not banks:
+        print("Geen banken gevonden in assets/itil_vragen", file=sys.stderr)
+        return 1
+    corpus = None if args.json else itil_corpus.open_default()
+
+    if args.bank_memory:
+        try:
+            print(f"{len(banks)} banken, bron: {'corpus' if corpus is not None else 'JSON'} (tijden incl. tracemalloc)")
+            for intern in (False, True):
+                kib, ms = bank_memory(banks, corpus, intern)
+                print(f"{'met' if intern else 'zonder':<7} interning: {kib:>7.0f} KiB  {ms:>6.0f} ms")
+        finally:
+            if corpus is not None:
+                corpus.close()
+        return 0
+
+    tmp = None
+    if args.store:
+        store_dir = Path(args.store)
+        store_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="itil_loadtest_")
+        store_dir = Path(tmp.name)
+
+    try:
+        shared = Shared(banks, corpus, store_dir)
+        n_profiles = args.profiles or args.examinees
+        examinees = [VirtualExaminee(shared, args.seed * 100003 + i, args.think, f"kandidaat{i % n_profiles}")
+                     for i in range(args.examinees)]
+        if args.trace_memory:
+            tracemalloc.start()
+        mem0 = tracemalloc.get_traced_memory()[0] if args.trace_memory else 0
+        rss0 = _rss_kib()
+
+        threads = [threading.Thread(target=e.run, args=(args.sessions,), daemon=True) for e in examinees]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+
+        if args.trace_memory:
+            mem1, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        rss1 = _rss_kib()
+    finally:
+        if corpus is not None:
+            corpus.close()
+        if tmp is not None:
+            tmp.cleanup()
+
+    sessions = sum(e.sessions for e in examinees)
+    print(f"{args.examinees} kandidaten x {args.sessions} sessies, {len(banks)} banken, "
+          f"bron: {'corpus' if corpus is not None else 'JSON'}")
+    print(f"{sessions} sessies in {wall:.2f} s = {sessions / wall:.1f} sessies/s")
+    print(f"{'bewerking':<10} {'aantal':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for op in OPS:
+        vals = sorted(v for e in examinees for v in e.lat[op])
+        if not vals:
+            continue
+        print(f"{op:<10} {len(vals):>8} {percentile(vals, 50) * 1000:>9.3f} {percentile(vals, 95) * 1000:>9.3f} "
+              f"{percentile(vals, 99) * 1000:>9.3f} {vals[-1] * 1000:>9.3f}")
+    if args.trace_memory:
+        print(f"geheugen (tracemalloc): {(mem1 - mem0) / 1024:+.0f} KiB na afloop, piek {peak / 1024:.0f} KiB")
+    if rss0 is not None:
+        print(f"piek-RSS: {rss0} -> {rss1} KiB ({rss1 - rss0:+d} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Pagina-index van de PDF's in assets/lesmateriaal.
+
+Per PDF wordt de tekst per pagina geëxtraheerd (met pypdf, optioneel) en omgezet
+in een compacte inverted index {term: [pagina, tf, pagina, tf, ...]}. Die index
+wordt in assets/cache bewaard met de SHA-1 van de PDF als sleutel, dus een
+gewijzigde PDF krijgt vanzelf een nieuwe index. Zoeken gebeurt daarna volledig
+in het geheugen.
+
+Eenmalig bouwen (bijvoorbeeld vóór build_itil.bat, dan gaat de index mee in de exe):
+    pip install pypdf
+    python itil_pdfindex.py
+"""
+import importlib.util
+import json
+import logging
+import math
+import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from itil_core import resource_dir, cache_dir, atomic_write_text, file_sha1, HashMemo
+
+INDEX_VERSION = 1
+HASHES_FILE = "pdfindex_hashes.json"
+
+log = logging.getLogger("itil.pdfindex")
+
+# BM25-parameters
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+_STOPWORDS = frozenset("""
+    aan als bij dat de den der des deze die dit door een eens en er geen had heb hebben heeft het
+    hier hij hoe hun ik in is je kan kunnen maar meer met mij naar niet nog nu of om omdat ons ook
+    op over te tot uit van veel voor want was wat wel welke werd wie wij word worden wordt zal ze
+    zelf zich zij zijn zo zoals
+    about also and are but can does for from has have how its not of one only that the their them
+    then there these they this was what when which who why will with would you your
+    itil
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def lesmateriaal_pdfs() -> list:
+    lm_dir = os.path.join(resource_dir(), "assets", "lesmateriaal")
+    try:
+        return sorted(os.path.join(lm_dir, n) for n in os.listdir(lm_dir) if n.lower().endswith(".pdf"))
+    except OSError:
+        return []
+
+
+# ------------------------------------------------------------
+# Opslag
+# ------------------------------------------------------------
+def _index_candidates(sha1: str) -> list:
+    name = f"pdfindex_{sha1[:20]}.json"
+    # Eerst de schrijfbare cache, daarna een index die met de exe is meegebundeld
+    return [cache_dir() / name, Path(resource_dir()) / "assets" / "cache" / name]
+
+
+def pypdf_available() -> bool:
+    """pypdf is optioneel; zonder pypdf alleen bestaande indexen gebruiken."""
+    return importlib.util.find_spec("pypdf") is not None
+
+
+def build_pdf_index(pdf_path: str, sha1: str = None) -> dict:
+    # pypdf pas hier importeren: de app start zonder, alleen het bouwen heeft het nodig
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("pypdf is niet geïnstalleerd (pip install pypdf)") from None
+    reader = PdfReader(pdf_path)
+    postings = {}
+    lengths = []
+    for pno, page in enumerate(reader.pages, start=1):
+        try:
+            text = page.extract_text() or ""
+        except Exception:
+            text = ""
+        counts = Counter(tokenize(text))
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).extend((pno, tf))
+    return {
+        "version": INDEX_VERSION,
+        "file": os.path.basename(pdf_path),
+        "sha1": sha1 or file_sha1(pdf_path),
+        "pages": len(lengths),
+        "lengths": lengths,
+        "postings": postings,
+    }
+
+
+def load_or_build(pdf_path: str, memo: HashMemo, build: bool) -> dict:
+    """Geeft de index voor deze PDF uit de cache; bouwt hem alleen als build=True."""
+    sha1 = memo.sha1(pdf_path)
+    for cand in _index_candidates(sha1):
+        try:
+            data = json.loads(cand.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION and data.get("sha1") == sha1:
+                return data
+        except (OSError, ValueError):
+            continue
+    if not build:
+        return None
+    data = build_pdf_index(pdf_path, sha1)
+    atomic_write_text(_index_candidates(sha1)[0], json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return data
+
+
+# ------------------------------------------------------------
+# Zoeken
+# ------------------------------------------------------------
+class PdfPageIndex:
+    def __init__(self, docs: list):
+        self.docs = []
+        for path, data in docs:
+            lengths = data.get("lengths") or [0]
+            avg = (sum(lengths) / len(lengths)) or 1.0
+            self.docs.append((path, data, avg))
+
+    @classmethod
+    def load(cls, pdf_paths=None, build_missing: bool = False) -> "PdfPageIndex":
+        memo = HashMemo(HASHES_FILE)
+        docs = []
+        for path in (pdf_paths if pdf_paths is not None else lesmateriaal_pdfs()):
+            try:
+                data = load_or_build(path, memo, build_missing)
+            except Exception as e:
+                log.warning("%s: %s", path, e)
+                data = None
+            if data:
+                docs.append((path, data))
+        memo.save()
+        return cls(docs)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def search(self, text: str, k: int = 3) -> list:
+        """Beste pagina per PDF voor deze tekst (BM25), als [(pad, pagina, score)], hoogste eerst."""
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+        hits = []
+        for path, data, avg in self.docs:
+            n_pages = data["pages"] or 1
+            lengths = data["lengths"]
+            postings = data["postings"]
+            scores = {}
+            for term in terms:
+                plist = postings.get(term)
+                if not plist:
+                    continue
+                df = len(plist) // 2
+                idf = math.log(1 + (n_pages - df + 0.5) / (df + 0.5))
+                for i in range(0, len(plist), 2):
+                    page, tf = plist[i], plist[i + 1]
+                    norm = tf + _K1 * (1 - _B + _B * lengths[page - 1] / avg)
+                    scores[page] = scores.get(page, 0.0) + idf * tf * (_K1 + 1) / norm
+            if scores:
+                page = max(scores, key=scores.get)
+                hits.append((path, page, scores[page]))
+        hits.sort(key=lambda h: h[2], reverse=True)
+        return hits[:k]
+
+
+if __name__ == "__main__":
+    if not pypdf_available():
+        sys.exit("pypdf is niet geïnstalleerd: pip install pypdf")
+    pdfs = sys.argv[1:] or lesmateriaal_pdfs()
+    memo = HashMemo(HASHES_FILE)
+    for p in pdfs:
+        data = load_or_build(p, memo, build=True)
+        print(f"{os.path.basename(p)}: {data['pages']} pagina's, {len(data['postings'])} termen")
+    memo.save()
@@ -0,0 +1,188 @@
+"""
+Tekenlaag van de GUI: gedeelde named fonts en een optionele Canvas-renderer.
+
+Named fonts: itil.py registreert zijn fonts met named_font(); install_fonts()
+maakt daarvan bij de start één tkfont.Font per naam. Widgets krijgen alleen de
+naam mee, dus Tk hoeft een font niet per widget opnieuw op te lossen, en één
+configure (bijv. ITIL_FONT_SCALE op een 4K-scherm) past alle widgets tegelijk aan.
+
+CanvasPage (python itil.py --canvas-render, of ITIL_CANVAS_RENDER=1): de vraag,
+de opties, de afbeelding en in de review de uitleg worden als items op één
+Canvas getekend, in plaats van een Label/Checkbutton per regel in geneste Frames
+die bij elke <Configure> opnieuw geometrie onderhandelen. De hoogte van elk
+tekstblok komt uit een gedeelde LayoutCache (font, wrapbreedte, tekst); bij een
+resize worden alleen coords en width aangepast, één keer per frame en alleen als
+de wrapbreedte een stap van WIDTH_STEP px verschuift.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
+
+LAYOUT_CACHE_SIZE = 2048
+WIDTH_STEP = 20      # wrapbreedte in stappen: minder herberekeningen tijdens het slepen
+PAGE_MARGIN = 24
+CHECK_OFF, CHECK_ON = "☐", "☑"
+
+_specs = {}          # {naam: (familie, grootte, stijlen)}
+_installed = {}      # {naam: tkfont.Font}; referentie vasthouden, anders ruimt Tk het font op
+
+
+def named_font(name: str, family: str, size: int, *style) -> str:
+    """Registreert een font en geeft de naam terug (voor font=... in widgets en canvas-items)."""
+    _specs[name] = (family, size, style)
+    return name
+
+
+def install_fonts(root: tk.Misc, scale: float = 1.0) -> dict:
+    """Maakt (of herconfigureert) alle geregistreerde fonts; aanroepen vóór het eerste widget."""
+    existing = set(tkfont.names(root))
+    for name, (family, size, style) in _specs.items():
+        opts = {"family": family, "size": max(1, round(size * scale)),
+                "weight": "bold" if "bold" in style else "normal",
+                "slant": "italic" if "italic" in style else "roman",
+                "underline": "underline" in style}
+        if name in existing:
+            font = _installed.get(name) or tkfont.Font(root=root, name=name, exists=True)
+            font.configure(**opts)
+        else:
+            font = tkfont.Font(root=root, name=name, **opts)
+        _installed[name] = font
+    LAYOUT.clear()
+    return dict(_installed)
+
+
+class LayoutCache:
+    """(font, wrapbreedte, tekst) -> hoogte in px, gemeten door Tk zelf (zelfde wrap als het echte item)."""
+
+    def __init__(self, size: int = LAYOUT_CACHE_SIZE):
+        self.size = size
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self._data.clear()
+
+    def height(self, canvas: tk.Canvas, text: str, font: str, width: int) -> int:
+        key = (font, width, text)
+        h = self._data.get(key)
+        if h is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return h
+        self.misses += 1
+        probe = canvas.create_text(-10000, -10000, text=text, font=font, width=width, anchor="nw")
+        x1, y1, x2, y2 = canvas.bbox(probe)
+        canvas.delete(probe)
+        h = y2 - y1
+        self._data[key] = h
+        if len(self._data) > self.size:
+            self._data.popitem(last=False)
+        return h
+
+
+LAYOUT = LayoutCache()
+
+
+class Block:
+    """Eén tekstblok of afbeelding op een CanvasPage."""
+    __slots__ = ("text", "font", "fill", "align", "indent", "pad", "image", "on_click", "item")
+
+    def __init__(self, text: str = "", font: str = None, fill: str = "black", align: str = "center",
+                 indent: int = 0, pad: tuple = (0, 0), image=None, on_click=None):
+        self.text, self.font, self.fill = text, font, fill
+        self.align, self.indent, self.pad = align, indent, pad
+        self.image, self.on_click = image, on_click
+        self.item = None
+
+
+class CanvasPage:
+    """Blokken onder elkaar op een Canvas, gecentreerd in een kolom van hooguit max_width px."""
+
+    def __init__(self, canvas: tk.Canvas, max_width: int, top: int = 10, margin: int = PAGE_MARGIN,
+                 cache: LayoutCache = None):
+        self.canvas = canvas
+        self.max_width = max_width
+        self.top = top
+        self.margin = margin
+        self.cache = cache or LAYOUT
+        self.blocks = []
+        self.height = 0
+        self._geom = None
+        self._job = None
+        canvas.bind("<Configure>", self._on_configure, add="+")
+
+    def _canvas_width(self) -> int:
+        w = self.canvas.winfo_width()
+        return w if w > 1 else int(self.canvas["width"])
+
+    def render(self, blocks: list):
+        c = self.canvas
+        c.delete("page")
+        self.blocks = blocks
+        for b in blocks:
+            if b.image is not None:
+                b.item = c.create_image(0, 0, image=b.image, anchor="n", tags=("page",))
+            else:
+                b.item = c.create_text(0, 0, text=b.text, font=b.font, fill=b.fill, tags=("page",),
+                                       anchor="n" if b.align == "center" else "nw",
+                                       justify="center" if b.align == "center" else "left")
+            if b.on_click is not None:
+                c.tag_bind(b.item, "<Button-1>", lambda e, f=b.on_click: f())
+                c.tag_bind(b.item, "<Enter>", lambda e: c.configure(cursor="hand2"))
+                c.tag_bind(b.item, "<Leave>", lambda e: c.configure(cursor=""))
+        self._geom = None
+        self.layout()
+
+    def set_text(self, block: Block, text: str, fill: str = None):
+        """Tekst van één blok wijzigen (bijv. het vinkje); herschikt alleen als de hoogte verandert."""
+        old = self.cache.height(self.canvas, block.text, block.font, self._text_width(block))
+        block.text = text
+        if fill is not None:
+            block.fill = fill
+        self.canvas.itemconfigure(block.item, text=text, fill=block.fill)
+        if self.cache.height(self.canvas, text, block.font, self._text_width(block)) != old:
+            self._geom = None
+            self.layout()
+
+    def _wrap(self) -> int:
+        w = max(200, min(self.max_width, self._canvas_width() - 2 * self.margin))
+        return w - w % WIDTH_STEP
+
+    def _text_width(self, block: Block) -> int:
+        return max(50, self._wrap() - block.indent)
+
+    def layout(self):
+        cw, wrap = self._canvas_width(), self._wrap()
+        if (cw, wrap) == self._geom:
+            return
+        self._geom = (cw, wrap)
+        c = self.canvas
+        center = max(cw, wrap + 2 * self.margin) // 2
+        left = center - wrap // 2
+        y = self.top
+        for b in self.blocks:
+            y += b.pad[0]
+            if b.image is not None:
+                c.coords(b.item, center, y)
+                h = b.image.height()
+            else:
+                tw = max(50, wrap - b.indent)
+                c.itemconfigure(b.item, width=tw)
+                c.coords(b.item, *((center, y) if b.align == "center" else (left + b.indent, y)))
+                h = self.cache.height(c, b.text, b.font, tw)
+            y += h + b.pad[1]
+        self.height = y
+        c.configure(scrollregion=(0, 0, max(cw, wrap + 2 * self.margin), y))
+
+    def _on_configure(self, event):
+        # Tijdens het slepen komen tientallen <Configure>-events per frame: één layout per idle
+        if self._job is None:
+            # Op de root plannen: na het sluiten van het venster geen 'invalid command name'
+            self._job = self.canvas._root().after_idle(self._relayout)
+
+    def _relayout(self):
+        self._job = None
+        try:
+            self.layout()
+        except tk.TclError:
+            pass  # canvas is intussen vernietigd
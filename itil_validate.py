@@ -0,0 +1,272 @@
+"""
+Validator voor de vraagbanken in assets/itil_vragen.
+
+Controleert elke bank op het schema ({"chapters": [{"questions": [...]}]}) en op
+de inhoudelijke fouten die anders pas tijdens een sessie opvallen: een answer dat
+niet in options staat (de app plakt het er dan stilletjes bij), explanation-keys
+die bij geen enkele optie horen, dubbele numbers, enz.
+
+Bestanden worden parallel in een process pool gecontroleerd. Alleen banken waarvan
+de inhoud (SHA-1) sinds de vorige run veranderd is worden opnieuw gecontroleerd;
+de rest komt uit assets/cache/validate_cache.json.
+
+    python itil_validate.py              # alle banken, alleen gewijzigde opnieuw
+    python itil_validate.py --all        # alles opnieuw controleren
+    python itil_validate.py pad/naar/bank.json ...
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from itil_core import resource_dir, cache_dir, atomic_write_text, file_sha1
+
+# Ophogen als de regels veranderen: oude cache-resultaten tellen dan niet meer
+RULES_VERSION = 1
+CACHE_FILE = "validate_cache.json"
+
+ERROR = "error"
+WARNING = "warning"
+
+
+def banks_dir() -> str:
+    return os.path.join(resource_dir(), "assets", "itil_vragen")
+
+
+def list_banks(dirp: str = None) -> list:
+    dirp = dirp or banks_dir()
+    try:
+        return sorted(os.path.join(dirp, n) for n in os.listdir(dirp) if n.lower().endswith(".json"))
+    except OSError:
+        return []
+
+
+# ------------------------------------------------------------
+# Regels
+# ------------------------------------------------------------
+def _is_text(v) -> bool:
+    return isinstance(v, str) and v.strip() != ""
+
+
+def validate_question(q, where: str, image_base: str = None) -> list:
+    """Issues [(niveau, plaats, melding)] voor één vraag-dict."""
+    issues = []
+    if not isinstance(q, dict):
+        return [(ERROR, where, "vraag is geen object")]
+
+    if not _is_text(q.get("question")):
+        issues.append((ERROR, where, "'question' ontbreekt of is leeg"))
+
+    if "number" in q and (not isinstance(q["number"], int) or isinstance(q["number"], bool)):
+        issues.append((ERROR, where, f"'number' is geen geheel getal: {q['number']!r}"))
+
+    opts = q.get("options")
+    if not isinstance(opts, list) or len(opts) < 2:
+        issues.append((ERROR, where, "'options' moet een lijst met minstens 2 opties zijn"))
+        opts = opts if isinstance(opts, list) else []
+    bad_opts = [o for o in opts if not _is_text(o)]
+    if bad_opts:
+        issues.append((ERROR, where, f"lege of niet-tekst optie(s): {bad_opts!r}"))
+    seen = set()
+    for o in opts:
+        if isinstance(o, str):
+            if o in seen:
+                issues.append((ERROR, where, f"dubbele optie: {o!r}"))
+            seen.add(o)
+
+    ans = q.get("answer")
+    answers = ans if isinstance(ans, list) else [ans]
+    if ans is None or (isinstance(ans, list) and not ans):
+        issues.append((ERROR, where, "'answer' ontbreekt"))
+    elif not all(_is_text(a) for a in answers):
+        issues.append((ERROR, where, f"'answer' moet tekst of een lijst met tekst zijn: {ans!r}"))
+    else:
+        missing = [a for a in answers if a not in seen]
+        if missing:
+            issues.append((ERROR, where, f"answer staat niet in options: {missing!r}"))
+        if isinstance(ans, list) and len(set(ans)) != len(ans):
+            issues.append((WARNING, where, "dubbele waarden in 'answer'"))
+
+    expl = q.get("explanation")
+    if expl is not None:
+        if not isinstance(expl, dict):
+            issues.append((ERROR, where, "'explanation' moet een object {optie: uitleg} zijn"))
+        else:
+            stray = [k for k in expl if k not in seen]
+            if stray:
+                issues.append((ERROR, where, f"explanation-key(s) horen bij geen optie: {stray!r}"))
+            bad = [k for k, v in expl.items() if not isinstance(v, str)]
+            if bad:
+                issues.append((ERROR, where, f"explanation-waarde is geen tekst voor: {bad!r}"))
+
+    img = q.get("image")
+    if img is not None:
+        if not _is_text(img):
+            issues.append((ERROR, where, "'image' moet een pad zijn"))
+        elif image_base is not None:
+            full = img if os.path.isabs(img) else os.path.join(image_base, os.path.normpath(img))
+            if not os.path.exists(full):
+                issues.append((WARNING, where, f"afbeelding niet gevonden: {img}"))
+    return issues
+
+
+def question_where(q, pos: int) -> str:
+    num = q.get("number") if isinstance(q, dict) else None
+    return f"vraag {pos}" + (f" (#{num})" if num is not None else "")
+
+
+class DuplicateTracker:
+    """Houdt dubbele numbers en vraagteksten bij, ook als vragen één voor één binnenkomen."""
+
+    def __init__(self):
+        self.numbers = {}
+        self.texts = {}
+
+    def check(self, q, where: str) -> list:
+        issues = []
+        if not isinstance(q, dict):
+            return issues
+        num = q.get("number")
+        if isinstance(num, int):
+            if num in self.numbers:
+                issues.append((ERROR, where, f"dubbel number {num} (ook bij {self.numbers[num]})"))
+            else:
+                self.numbers[num] = where
+        text = q.get("question")
+        if isinstance(text, str) and text.strip():
+            key = " ".join(text.split()).lower()
+            if key in self.texts:
+                issues.append((WARNING, where, f"zelfde vraagtekst als {self.texts[key]}"))
+            else:
+                self.texts[key] = where
+        return issues
+
+
+def validate_bank(data, image_base: str = None) -> list:
+    if not isinstance(data, dict) or not isinstance(data.get("chapters"), list) or not data["chapters"]:
+        return [(ERROR, "bank", "verwacht {\"chapters\": [{...}]} met minstens één hoofdstuk")]
+    issues = []
+    if len(data["chapters"]) > 1:
+        issues.append((WARNING, "bank", "alleen het eerste hoofdstuk wordt door de app gebruikt"))
+    chapter = data["chapters"][0]
+    if not isinstance(chapter, dict):
+        return issues + [(ERROR, "chapters[0]", "hoofdstuk is geen object")]
+    questions = chapter.get("questions")
+    if not isinstance(questions, list):
+        return issues + [(ERROR, "chapters[0]", "'questions' ontbreekt of is geen lijst")]
+    if not questions:
+        issues.append((WARNING, "chapters[0]", "bank bevat geen vragen"))
+    if not (_is_text(chapter.get("chapter")) or _is_text(chapter.get("description"))):
+        issues.append((WARNING, "chapters[0]", "geen 'chapter' of 'description' (titel)"))
+
+    dups = DuplicateTracker()
+    for pos, q in enumerate(questions, start=1):
+        where = question_where(q, pos)
+        issues.extend(validate_question(q, where, image_base))
+        issues.extend(dups.check(q, where))
+    return issues
+
+
+def validate_file(path: str) -> list:
+    """Worker voor de process pool: leest en controleert één bank."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except UnicodeDecodeError as e:
+        return [(ERROR, "bestand", f"geen geldige UTF-8: {e}")]
+    except json.JSONDecodeError as e:
+        return [(ERROR, f"regel {e.lineno}", f"ongeldige JSON: {e.msg}")]
+    except OSError as e:
+        return [(ERROR, "bestand", str(e))]
+    return validate_bank(data, image_base=resource_dir())
+
+
+# ------------------------------------------------------------
+# Hash-cache + parallel uitvoeren
+# ------------------------------------------------------------
+def _load_cache() -> dict:
+    try:
+        data = json.loads((cache_dir() / CACHE_FILE).read_text(encoding="utf-8"))
+        if data.get("rules") == RULES_VERSION:
+            return data.get("files", {})
+    except Exception:
+        pass
+    return {}
+
+
+def _save_cache(files: dict):
+    try:
+        atomic_write_text(cache_dir() / CACHE_FILE,
+                          json.dumps({"rules": RULES_VERSION, "files": files}, ensure_ascii=False))
+    except OSError:
+        pass
+
+
+def validate_paths(paths: list, use_cache: bool = True, jobs: int = None) -> dict:
+    """
+    {pad: issues}; alleen banken met een gewijzigde SHA-1 worden echt gecontroleerd.
+    De nieuwe resultaten worden in de bestaande cache gezet: een run over een paar
+    banken (of met use_cache=False) laat de cache van de andere banken staan.
+    """
+    cache = _load_cache()
+    results, todo, hashes = {}, [], {}
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError as e:
+            results[p] = [(ERROR, "bestand", str(e))]
+            continue
+        hit = cache.get(p) if use_cache else None
+        # (size, mtime) gelijk => hash niet eens opnieuw berekenen
+        if hit and hit["size"] == st.st_size and hit["mtime"] == st.st_mtime_ns:
+            results[p] = [tuple(i) for i in hit["issues"]]
+            continue
+        digest = file_sha1(p)
+        hashes[p] = (st.st_size, st.st_mtime_ns, digest)
+        if hit and hit["sha1"] == digest:
+            results[p] = [tuple(i) for i in hit["issues"]]
+        else:
+            todo.append(p)
+
+    if len(todo) > 2:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for p, issues in zip(todo, pool.map(validate_file, todo, chunksize=4)):
+                results[p] = issues
+    else:
+        for p in todo:
+            results[p] = validate_file(p)
+
+    for p, (size, mtime, digest) in hashes.items():
+        cache[p] = {"size": size, "mtime": mtime, "sha1": digest, "issues": results[p]}
+    _save_cache({p: v for p, v in cache.items() if os.path.exists(p)})
+    return results
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Controleer vraagbanken op schema- en inhoudsfouten.")
+    ap.add_argument("paths", nargs="*", help="banken (standaard: alles in assets/itil_vragen)")
+    ap.add_argument("--all", action="store_true", help="cache negeren en alles opnieuw controleren")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="aantal processen (standaard: alle cores)")
+    ap.add_argument("-q", "--quiet", action="store_true", help="alleen fouten tonen, geen waarschuwingen")
+    args = ap.parse_args(argv)
+
+    paths = [os.path.abspath(p) for p in args.paths] or list_banks()
+    results = validate_paths(paths, use_cache=not args.all, jobs=args.jobs)
+
+    n_err = n_warn = 0
+    for p in paths:
+        for level, where, msg in results.get(p, []):
+            if level == ERROR:
+                n_err += 1
+            else:
+                n_warn += 1
+                if args.quiet:
+                    continue
+            print(f"{os.path.basename(p)}: {where}: {level}: {msg}")
+    print(f"{len(paths)} bank(en) gecontroleerd: {n_err} fout(en), {n_warn} waarschuwing(en)")
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Importeren: CSV, GIFT en QTI 1.2 (alleen positieve varequal-voorwaarden maken een optie juist)."""
+import io
+
+import pytest
+
+import itil_import
+
+QTI12 = """<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop>
+  <item ident="q1">
+    <presentation>
+      <material><mattext>Welke optie is juist?</mattext></material>
+      <response_lid ident="r1" rcardinality="Single">
+        <render_choice>
+          <response_label ident="a"><material><mattext>Alpha</mattext></material></response_label>
+          <response_label ident="b"><material><mattext>Beta</mattext></material></response_label>
+        </render_choice>
+      </response_lid>
+    </presentation>
+    <resprocessing>
+      <respcondition>
+        <conditionvar>{cond}</conditionvar>
+        <setvar action="Set">1</setvar>
+      </respcondition>
+    </resprocessing>
+  </item>
+</questestinterop>
+"""
+
+
+def _read(tmp_path, cond: str) -> dict:
+    path = tmp_path / "item.xml"
+    path.write_text(QTI12.format(cond=cond), encoding="utf-8")
+    (q,) = list(itil_import.read_qti(str(path)))
+    return q
+
+
+def test_qti12_varequal_is_correct(tmp_path):
+    q = _read(tmp_path, '<varequal respident="r1">b</varequal>')
+    assert q["options"] == ["Alpha", "Beta"]
+    assert q["answer"] == "Beta"
+
+
+def test_qti12_not_varequal_is_not_correct(tmp_path):
+    q = _read(tmp_path, '<not><varequal respident="r1">a</varequal></not>')
+    assert q["answer"] == ""
+
+
+def test_qti12_and_with_not_keeps_only_positive(tmp_path):
+    q = _read(tmp_path, '<and><varequal respident="r1">b</varequal>'
+                        '<not><varequal respident="r1">a</varequal></not></and>')
+    assert q["answer"] == "Beta"
+
+
+def test_csv_letters_and_explanations():
+    fh = io.StringIO("question;option1;option2;option3;answer;explanation2\n"
+                     "Wat is juist?;Alpha;Beta;Gamma;B;Omdat Beta\n"
+                     "Welke twee?;Alpha;Beta;Gamma;1|3;\n")
+    q1, q2 = itil_import.read_csv(fh)
+    assert q1 == {"question": "Wat is juist?", "options": ["Alpha", "Beta", "Gamma"],
+                  "answer": "Beta", "explanation": {"Beta": "Omdat Beta"}}
+    assert q2["answer"] == ["Alpha", "Gamma"]
+
+
+def test_csv_without_option_columns_is_rejected():
+    with pytest.raises(itil_import.ImportIssue):
+        list(itil_import.read_csv(io.StringIO("question,answer\nWat?,A\n")))
+
+
+def test_gift_choices_feedback_and_skipped_types():
+    fh = io.StringIO("// commentaar\n"
+                     "::Q1:: Welke optie is juist? {=Beta#Goed ~Alpha#Fout}\n"
+                     "\n"
+                     "Kan dit? {T}\n"
+                     "\n"
+                     "Open vraag {=antwoord}\n")
+    q1, q2, issue = itil_import.read_gift(fh)
+    assert q1["options"] == ["Beta", "Alpha"]
+    assert q1["answer"] == "Beta"
+    assert q1["explanation"] == {"Beta": "Goed", "Alpha": "Fout"}
+    assert q2 == {"question": "Kan dit?", "options": ["True", "False"], "answer": "True"}
+    assert isinstance(issue, itil_import.ImportIssue)
+
+
+def test_convert_removes_tmp_when_reader_fails(tmp_path, monkeypatch):
+    def broken(_path, _fmt=None):
+        yield {"question": "Wat?", "options": ["A", "B"], "answer": "A"}
+        raise OSError("bron onleesbaar")
+    monkeypatch.setattr(itil_import, "read_any", broken)
+    out = tmp_path / "bank.json"
+    with pytest.raises(OSError):
+        itil_import.convert("bron.csv", str(out))
+    assert list(tmp_path.iterdir()) == []